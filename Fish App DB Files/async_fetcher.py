@@ -0,0 +1,67 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
+
+class AsyncFetchEngine:
+    """Fetch species pages concurrently with a bounded number of in-flight requests per host"""
+
+    def __init__(self, fetch_func, max_per_host=4, request_delay=0.5, target_rate=None):
+        # fetch_func is a blocking callable taking a URL and returning the page text;
+        # it runs in worker threads so the scraper's requests session can be reused
+        self.fetch_func = fetch_func
+        self.max_per_host = max_per_host
+        self.request_delay = request_delay
+        self.target_rate = target_rate
+        self.stats = {}
+
+    async def _fetch_one(self, species, handler, semaphores):
+        host = urlparse(species['url']).netloc
+        semaphore = semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+
+        html = None
+        error = None
+        async with semaphore:
+            try:
+                html = await asyncio.to_thread(self.fetch_func, species['url'])
+            except Exception as e:
+                error = e
+
+            # Keep each connection slot polite to the server
+            if self.request_delay:
+                await asyncio.sleep(self.request_delay)
+
+        # Handlers run on the event loop thread, so they never race each other
+        handler(species, html, error)
+
+    async def _run(self, species_list, handler):
+        semaphores = {}
+        tasks = [self._fetch_one(species, handler, semaphores) for species in species_list]
+        await asyncio.gather(*tasks)
+
+    def run(self, species_list, handler):
+        """Fetch every species page and pass (species, html, error) to handler as each one completes"""
+        start_time = time.perf_counter()
+        asyncio.run(self._run(species_list, handler))
+        elapsed = time.perf_counter() - start_time
+
+        species_per_sec = len(species_list) / elapsed if elapsed > 0 else 0.0
+        self.stats = {
+            'species': len(species_list),
+            'elapsed_seconds': elapsed,
+            'species_per_sec': species_per_sec,
+            'max_per_host': self.max_per_host,
+            'target_species_per_sec': self.target_rate,
+            'target_met': None if self.target_rate is None else species_per_sec >= self.target_rate
+        }
+        return self.stats
+
+    def print_report(self):
+        """Print the throughput achieved by the last run"""
+        if not self.stats:
+            return
+        print(f"Fetched {self.stats['species']} species in {self.stats['elapsed_seconds']:.1f}s "
+              f"({self.stats['species_per_sec']:.2f} species/sec, {self.max_per_host} concurrent per host)")
+        if self.target_rate is not None:
+            status = "met" if self.stats['target_met'] else "missed"
+            print(f"Throughput target of {self.target_rate:.2f} species/sec {status}")
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+
+
+def _group_codes(group_keys):
+    """Integer group codes, group keys and each group's first row position
+
+    The combined CSV is written one species at a time, so groups are normally already
+    contiguous and can be found from adjacent-key changes without hashing every row.
+    Returns codes that are sorted in that case, and None otherwise.
+    """
+    run_starts = np.r_[0, np.flatnonzero(group_keys[1:] != group_keys[:-1]) + 1]
+    run_keys = group_keys[run_starts]
+    if not pd.isna(run_keys).any() and len(pd.unique(run_keys)) == len(run_keys):
+        codes = np.repeat(np.arange(len(run_starts)), np.diff(np.r_[run_starts, len(group_keys)]))
+        return codes, run_keys, run_starts, True
+    codes, uniques = pd.factorize(group_keys)
+    _, first_rows = np.unique(codes, return_index=True)
+    if len(codes) and codes.min() < 0:
+        first_rows = first_rows[1:]
+    return codes, uniques, first_rows, False
+
+
+def _grouped_median(values, codes, starts, counts):
+    """Median of values within each contiguous group, from one sort of group-offset keys"""
+    # Shifting each group by more than the values' range keeps groups apart after sorting
+    offset = float(np.max(values)) + 1.0
+    ordered = np.sort(values + codes * offset)
+    lower = ordered[starts + (counts - 1) // 2]
+    upper = ordered[starts + counts // 2]
+    return (lower + upper) / 2 - codes[starts] * offset
+
+
+def _weight_decimals(weights, max_decimals=6):
+    """Fewest decimals that represent each weight, or max_decimals + 1 if none do"""
+    decimals = np.full(len(weights), max_decimals + 1)
+    for places in range(max_decimals, -1, -1):
+        scaled = weights * 10 ** places
+        decimals[np.abs(scaled - np.round(scaled)) <= 1e-6] = places
+    return decimals
+
+
+def _weight_resolution(weights, max_decimals=6):
+    """Step the weights were rounded to: the fewest decimals that represent them all"""
+    decimals = _weight_decimals(np.asarray(weights, dtype=float), max_decimals).max(initial=0)
+    return 10.0 ** -decimals if decimals <= max_decimals else 0.0
+
+
+def _grouped_weight_resolution(weights, starts, max_decimals=6):
+    """_weight_resolution of each contiguous group, so one species' precision does not set another's"""
+    decimals = np.maximum.reduceat(_weight_decimals(weights, max_decimals), starts)
+    return np.where(decimals <= max_decimals, 10.0 ** -decimals.astype(float), 0.0)
+
+
+def _huber_refine(x, y, codes, starts, counts, b, intercept, max_iter, huber_k, tol, rounding):
+    """Iteratively reweighted least squares with Huber weights, all groups at once
+
+    Each pass scales the log residuals by the group's MAD, down-weights points beyond
+    huber_k scales and refits every group's weighted line from reduceat sums. Runtime is
+    bounded by max_iter passes over the data; groups stop changing well before that.
+    rounding is each point's log-space rounding error bound, which the scale never
+    drops below.
+    """
+    w = np.ones_like(x)
+    for _ in range(max_iter):
+        residuals = np.abs(y - np.repeat(intercept, counts) - np.repeat(b, counts) * x)
+        # A perfect fit has no spread, and rounded weights are only known to within
+        # their rounding step, so keep each point's scale off zero and above that step
+        scale = np.maximum(1.4826 * _grouped_median(residuals, codes, starts, counts), 1e-6)
+        point_scale = np.maximum(np.repeat(scale, counts), rounding)
+        limit = huber_k * point_scale
+        with np.errstate(divide='ignore'):
+            w = np.where(residuals > limit, limit / residuals, 1.0)
+
+        total = np.add.reduceat(w, starts)
+        mean_x = np.add.reduceat(w * x, starts) / total
+        mean_y = np.add.reduceat(w * y, starts) / total
+        dx = x - np.repeat(mean_x, counts)
+        dy = y - np.repeat(mean_y, counts)
+        sxx = np.add.reduceat(w * dx * dx, starts)
+        sxy = np.add.reduceat(w * dx * dy, starts)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            new_b = np.where(sxx > 0, sxy / sxx, b)
+        intercept = mean_y - new_b * mean_x
+        converged = np.nanmax(np.abs(new_b - b)) < tol if len(b) else True
+        b = new_b
+        if converged:
+            break
+
+    outliers = np.add.reduceat((residuals > 3 * point_scale).astype(np.int64), starts)
+    return b, intercept, sxx, outliers
+
+
+def _log_groups(group_keys, lengths, weights):
+    """Log lengths and weights sorted into contiguous groups, or None if no row is usable
+
+    Rows with a non-positive or missing length/weight are dropped. Returns codes, group
+    keys, first input rows, x = ln(L), y = ln(W), and each group's start and row count.
+    """
+    group_keys = np.asarray(group_keys, dtype=object)
+    lengths = np.asarray(lengths, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if not len(group_keys):
+        return None
+
+    codes, uniques, first_rows, contiguous = _group_codes(group_keys)
+    # NaN compares False, so missing values are dropped along with zeros
+    keep = (codes >= 0) & (lengths > 0) & (weights > 0)
+    codes = codes[keep]
+    x = np.log(lengths[keep])
+    y = np.log(weights[keep])
+    if not contiguous:
+        order = np.argsort(codes, kind='stable')
+        codes, x, y = codes[order], x[order], y[order]
+    if not len(codes):
+        return None
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    return codes, uniques, first_rows, x, y, starts, counts
+
+
+def fit_grouped_power_law(group_keys, lengths, weights, min_points=3, robust=False,
+                          max_iter=10, huber_k=1.345, tol=1e-6, weight_resolution=None):
+    """Fit W = a * L^b for every group of a long-format table in one vectorized pass
+
+    Rows are grouped and the log-log regression's sufficient statistics (counts, means
+    and centred sums of squares/cross-products) are summed per group with
+    np.add.reduceat, so there is no Python loop over species. Like the per-species fit,
+    rows with a non-positive or missing length/weight are dropped and groups with fewer
+    than min_points rows are skipped.
+
+    With robust=True the least-squares lines are refined by Huber IRLS in log space, so
+    a mistyped catch (30 kg for a 30 cm fish) barely moves its species' formula. Their
+    r_squared is the ordinary unweighted log-space R^2 of the robust line over all
+    points, so it stays comparable with least-squares rows. Residuals within a weight's
+    rounding error are never treated as outliers; weight_resolution is the rounding step
+    (e.g. 0.1 kg), either one for every group or an array with one per group in order of
+    first appearance. When None it is inferred from each group's own weights.
+
+    Returns a DataFrame indexed by group key with a, b, r_squared, data_points and
+    first_row, the position of the group's first input row; robust fits add outliers,
+    the number of points more than three robust scales off the fitted line.
+    """
+    columns = ['a', 'b', 'r_squared', 'data_points', 'first_row'] + (['outliers'] if robust else [])
+    groups = _log_groups(group_keys, lengths, weights)
+    if groups is None:
+        return pd.DataFrame(columns=columns)
+    codes, uniques, first_rows, x, y, starts, counts = groups
+
+    mean_x = np.add.reduceat(x, starts) / counts
+    mean_y = np.add.reduceat(y, starts) / counts
+
+    # Centre within each group before squaring to avoid cancellation in the sums
+    dx = x - np.repeat(mean_x, counts)
+    dy = y - np.repeat(mean_y, counts)
+    sxx = np.add.reduceat(dx * dx, starts)
+    sxy = np.add.reduceat(dx * dy, starts)
+    syy = np.add.reduceat(dy * dy, starts)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        b = sxy / sxx
+        intercept = mean_y - b * mean_x
+        # Residual sum of squares of a least-squares line is syy - b * sxy
+        r_squared = 1 - (syy - b * sxy) / syy
+
+    valid = (counts >= min_points) & (sxx > 0)
+    result = {}
+    if robust:
+        # Start from the least-squares lines; groups without one are dropped anyway
+        start_b = np.where(valid, b, 0.0)
+        start_intercept = np.where(valid, intercept, 0.0)
+        if weight_resolution is None:
+            weight_resolution = _grouped_weight_resolution(np.exp(y), starts)
+        weight_resolution = np.broadcast_to(np.asarray(weight_resolution, dtype=float), counts.shape)
+        rounding = np.log1p(np.repeat(weight_resolution, counts) / 2 * np.exp(-y))
+        b, intercept, weighted_sxx, outliers = _huber_refine(
+            x, y, codes, starts, counts, start_b, start_intercept, max_iter, huber_k, tol, rounding)
+        residuals = y - np.repeat(intercept, counts) - np.repeat(b, counts) * x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r_squared = 1 - np.add.reduceat(residuals * residuals, starts) / syy
+        valid &= weighted_sxx > 0
+        result['outliers'] = outliers[valid]
+
+    group_codes = codes[starts][valid]
+    result.update({
+        'a': np.exp(intercept[valid]),
+        'b': b[valid],
+        'r_squared': r_squared[valid],
+        'data_points': counts[valid],
+        'first_row': first_rows[group_codes]
+    })
+    return pd.DataFrame(result, index=pd.Index(uniques[group_codes], name='group'), columns=columns)
+
+
+def _coalesce_columns(df, keyword):
+    """First non-empty value among the columns whose name contains keyword, and the first such column"""
+    matching = [col for col in df.columns if keyword in col]
+    if not matching:
+        return None, None
+    values = pd.to_numeric(df[matching[0]], errors='coerce')
+    for col in matching[1:]:
+        # Species tables with differently named columns leave the others empty in the combined data
+        values = values.fillna(pd.to_numeric(df[col], errors='coerce'))
+    return values, matching[0]
+
+
+def batch_algorithms(df, species_column='Species_ID', min_points=3, robust=False):
+    """Fit every species in a combined length/weight table at once
+
+    Returns the algorithms dict written to fish_algorithms.json, keyed by species ID.
+    Robust fits are marked with fit_method 'huber' and their outlier count.
+    """
+    lengths, length_col = _coalesce_columns(df, 'Length')
+    weights, weight_col = _coalesce_columns(df, 'Weight')
+    if lengths is None or weights is None:
+        return {}
+
+    fits = fit_grouped_power_law(df[species_column].to_numpy(), lengths.to_numpy(),
+                                 weights.to_numpy(), min_points=min_points, robust=robust)
+    if fits.empty:
+        return {}
+
+    # Name, edibility and measure type come from each species' first row, as per-species fits do
+    first_rows = df.iloc[fits['first_row'].to_numpy()]
+    names = first_rows['Species'] if 'Species' in first_rows.columns else fits.index.astype(str)
+    edible = first_rows['Edible'].isin([True, 'True']) if 'Edible' in first_rows.columns \
+        else [None] * len(fits)
+    measure_types = first_rows['Measure_Type'] if 'Measure_Type' in first_rows.columns \
+        else ["Unknown"] * len(fits)
+
+    algorithms = {}
+    for species_id, name, is_edible, measure_type, a, b, r_squared in zip(
+            fits.index, names, edible, measure_types, fits['a'], fits['b'], fits['r_squared']):
+        algorithms[str(species_id)] = {
+            'species_name': name,
+            'edible': is_edible,
+            'algorithm': {
+                'formula': 'W = a * L^b',
+                'a': float(a),
+                'b': float(b),
+                'r_squared': float(r_squared),
+                'length_column': length_col,
+                'weight_column': weight_col,
+                'measure_type': measure_type
+            }
+        }
+    if robust:
+        for species_id, outliers in zip(fits.index, fits['outliers']):
+            algorithms[str(species_id)]['algorithm'].update({'fit_method': 'huber', 'outliers': int(outliers)})
+    return algorithms
@@ -0,0 +1,80 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_fit import batch_algorithms
+from improved_scraper import FishSpeciesScraper
+
+
+def synthetic_species_table(species_count, rows_per_species, seed=0):
+    """A combined table shaped like all_fish_species_data.csv with noisy W = a * L^b species"""
+    rng = np.random.default_rng(seed)
+    species_ids = np.repeat(np.arange(species_count), rows_per_species)
+    lengths = np.tile(np.arange(15, 15 + rows_per_species), species_count).astype(float)
+    a = np.repeat(rng.uniform(2e-6, 2e-5, species_count), rows_per_species)
+    b = np.repeat(rng.uniform(2.8, 3.3, species_count), rows_per_species)
+    weights = np.round(a * lengths ** b * rng.lognormal(0, 0.05, len(lengths)), 1)
+    return pd.DataFrame({
+        'Measure_Type': 'Fork length',
+        'Length': lengths,
+        'Weight': weights,
+        'Species': [f"Species {i}" for i in species_ids],
+        'Species_ID': species_ids.astype(str),
+        'Edible': True
+    })
+
+
+def per_species_algorithms(df, scraper):
+    """The existing path: one calculate_length_weight_algorithm call per species"""
+    algorithms = {}
+    for species_id, species_df in df.groupby('Species_ID', sort=False):
+        algorithm = scraper.calculate_length_weight_algorithm(species_df)
+        if algorithm:
+            algorithms[species_id] = algorithm
+    return algorithms
+
+
+def best_time(func, repeat):
+    """Best wall time over repeat calls, and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-species and batched length-weight fitting")
+    parser.add_argument('data', nargs='?', default=None,
+                        help="combined CSV to fit (default: a synthetic table)")
+    parser.add_argument('--species', type=int, default=5000, help="synthetic species count")
+    parser.add_argument('--rows', type=int, default=100, help="synthetic rows per species")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per fitter; the best is reported")
+    args = parser.parse_args()
+
+    if args.data:
+        df = pd.read_csv(args.data, dtype={'Species': str, 'Species_ID': str})
+    else:
+        df = synthetic_species_table(args.species, args.rows)
+
+    scraper = FishSpeciesScraper(cache_dir=None, archive_path=None, hash_registry_path=None, metrics_dir=None)
+    loop_time, loop_algorithms = best_time(lambda: per_species_algorithms(df, scraper), args.repeat)
+    batch_time, batch_algorithms_ = best_time(lambda: batch_algorithms(df), args.repeat)
+
+    max_error = {'a': 0.0, 'b': 0.0, 'r_squared': 0.0}
+    for species_id, algorithm in loop_algorithms.items():
+        batch_algorithm = batch_algorithms_[str(species_id)]['algorithm']
+        for key in max_error:
+            error = abs(batch_algorithm[key] - algorithm[key]) / max(abs(algorithm[key]), 1e-300)
+            max_error[key] = max(max_error[key], error)
+
+    print(f"Rows: {len(df)}, species fitted: {len(batch_algorithms_)} batched, {len(loop_algorithms)} per species")
+    print(f"Per-species polyfit loop: {loop_time * 1000:.1f} ms")
+    print(f"Batched reduceat fit:     {batch_time * 1000:.1f} ms")
+    if batch_time > 0:
+        print(f"Speedup: {loop_time / batch_time:.1f}x")
+    print("Max relative difference: " + ", ".join(f"{key} {error:.1e}" for key, error in max_error.items()))
@@ -0,0 +1,77 @@
+import argparse
+import contextlib
+import glob
+import io
+import os
+import time
+
+from improved_scraper import FishSpeciesScraper
+from lxml_extractor import extract_length_weight_rows_lxml
+from page_archive import PageArchive
+from strategy_cache import LayoutStrategyCache
+
+
+def load_debug_pages(debug_dir):
+    """Load the full species pages saved by the scrapers, skipping table-only dumps"""
+    pages = []
+    if os.path.isfile(debug_dir):
+        archive = PageArchive(debug_dir)
+        for species_id in archive.species_ids():
+            header, html = archive.read(species_id)
+            pages.append((header['species_name'], html))
+        return pages
+
+    for path in sorted(glob.glob(os.path.join(debug_dir, '*.html'))):
+        if path.endswith('_table.html'):
+            continue
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def time_parser(parse_func, pages, repeat):
+    """Parse every page repeat times and return (pages/sec, results of the last pass)"""
+    results = []
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        results = []
+        # The extractors report failures with print; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            for name, html in pages:
+                try:
+                    results.append(parse_func(html, name))
+                except Exception:
+                    results.append(None)
+    elapsed = time.perf_counter() - start_time
+    pages_per_sec = (len(pages) * repeat) / elapsed if elapsed > 0 else 0.0
+    return pages_per_sec, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the BeautifulSoup and lxml table extractors")
+    parser.add_argument('debug_dir', nargs='?', default='debug/species_pages.warc.gz',
+                        help="page archive or directory of saved species pages")
+    parser.add_argument('--repeat', type=int, default=3, help="passes over the page set per parser")
+    args = parser.parse_args()
+
+    pages = load_debug_pages(args.debug_dir)
+    if not pages:
+        print(f"No saved pages found in {args.debug_dir}")
+        raise SystemExit(1)
+
+    scraper = FishSpeciesScraper(cache_dir=None, archive_path=None, hash_registry_path=None)
+    bs4_rate, bs4_results = time_parser(scraper._extract_length_weight_rows, pages, args.repeat)
+    # Each extractor keeps its own layout cache, so both try strategies in the same order
+    lxml_cache = LayoutStrategyCache(scraper.strategy_cache.strategy_names)
+    lxml_rate, lxml_results = time_parser(
+        lambda html, name: extract_length_weight_rows_lxml(html, name, lxml_cache), pages, args.repeat)
+
+    matching = sum(1 for old, new in zip(bs4_results, lxml_results) if old == new)
+    extracted = sum(1 for result in lxml_results if result is not None)
+
+    print(f"Pages: {len(pages)} ({extracted} with a length-weight table), {args.repeat} passes each")
+    print(f"BeautifulSoup html.parser: {bs4_rate:.1f} pages/sec")
+    print(f"lxml XPath:                {lxml_rate:.1f} pages/sec")
+    if bs4_rate > 0:
+        print(f"Speedup: {lxml_rate / bs4_rate:.2f}x")
+    print(f"Identical extractions: {matching}/{len(pages)}")
@@ -0,0 +1,112 @@
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_server import MockSpecialistAnglerServer
+
+
+# Scraper configurations benchmarked by default: name -> (FishSpeciesScraper kwargs, scrape_all_species kwargs)
+MODES = {
+    'async': ({}, {}),
+    'async-lxml': ({'parser': 'lxml'}, {}),
+    'pipeline': ({}, {'parse_workers': 2}),
+    'pipeline-lxml': ({'parser': 'lxml'}, {'parse_workers': 2})
+}
+
+
+def run_mode(mode, base_url, concurrency, max_rate):
+    """Scrape the mock server once in this process and return throughput, CPU and memory figures"""
+    from improved_scraper import FishSpeciesScraper
+    from rate_limiter import AdaptiveRateLimiter
+
+    scraper_kwargs, scrape_kwargs = MODES[mode]
+    # Start at the ceiling so the benchmark measures the scraper rather than the limiter's ramp-up
+    rate_limiter = AdaptiveRateLimiter(initial_rate=max_rate, max_rate=max_rate, burst=concurrency)
+    scraper = FishSpeciesScraper(cache_dir=None, base_url=base_url, rate_limiter=rate_limiter,
+                                 metrics_dir=None, **scraper_kwargs)
+
+    start_time = time.perf_counter()
+    start_cpu = time.process_time()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        _, algorithms = scraper.scrape_all_species(max_concurrency=concurrency, **scrape_kwargs)
+    elapsed = time.perf_counter() - start_time
+    # Pipeline parse workers are reaped when their pool shuts down, so their CPU shows up here
+    cpu = (time.process_time() - start_cpu) + resource.getrusage(resource.RUSAGE_CHILDREN).ru_utime \
+        + resource.getrusage(resource.RUSAGE_CHILDREN).ru_stime
+    scraper.close()
+
+    pages = scraper.metrics.requests
+    # Throughput counts every species scraped; how many could be fitted is reported apart
+    species = scraper.species_succeeded + scraper.species_failed
+    return {
+        'mode': mode,
+        'species': species,
+        'species_fitted': len(algorithms or {}),
+        'pages': pages,
+        'rows': scraper.rows_written,
+        'elapsed_seconds': elapsed,
+        'species_per_sec': species / elapsed if elapsed > 0 else 0.0,
+        'cpu_ms_per_page': 1000 * cpu / pages if pages else None,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def run_mode_in_subprocess(mode, base_url, concurrency, max_rate):
+    """Run one mode in a fresh interpreter and working directory so peak memory is per mode"""
+    script = os.path.abspath(__file__)
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = subprocess.run(
+            [sys.executable, script, '--child', mode, '--base-url', base_url,
+             '--concurrency', str(concurrency), '--max-rate', str(max_rate)],
+            cwd=work_dir, capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': os.path.dirname(script)}
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark mode {mode} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scraper modes end to end against a local mock server")
+    parser.add_argument('source', nargs='?', default='debug/species_pages.warc.gz',
+                        help="page archive or directory of debug HTML pages to serve")
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=list(MODES))
+    parser.add_argument('--latency', type=float, default=0.05, help="mock server latency per response")
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=4, help="concurrent fetches per host")
+    parser.add_argument('--max-rate', type=float, default=50.0, help="rate limiter ceiling in requests/sec")
+    parser.add_argument('--output', default=None, help="also write the results as JSON to this file")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_mode(args.child, args.base_url, args.concurrency, args.max_rate)))
+        raise SystemExit(0)
+
+    results = []
+    with MockSpecialistAnglerServer(args.source, species_lists_dir=os.path.join(os.getcwd(), 'raw_data'),
+                                    latency=args.latency, jitter=args.jitter,
+                                    error_rate=args.error_rate, seed=0) as server:
+        print(f"Serving {len(server.pages)} recorded pages at {server.base_url} "
+              f"({args.latency * 1000:.0f}+/-{args.jitter * 1000:.0f} ms latency, {args.error_rate:.0%} errors)")
+        for mode in args.modes:
+            results.append(run_mode_in_subprocess(mode, server.base_url, args.concurrency, args.max_rate))
+
+    print(f"{'mode':<14} {'species':>7} {'fitted':>7} {'species/sec':>11} {'CPU ms/page':>11} {'peak RSS MB':>11}")
+    for result in results:
+        cpu = f"{result['cpu_ms_per_page']:.1f}" if result['cpu_ms_per_page'] is not None else 'n/a'
+        print(f"{result['mode']:<14} {result['species']:>7} {result['species_fitted']:>7} {result['species_per_sec']:>11.2f} "
+              f"{cpu:>11} {result['peak_rss_mb']:>11.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
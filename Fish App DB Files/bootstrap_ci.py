@@ -0,0 +1,201 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch_fit import _coalesce_columns, _grouped_weight_resolution, _huber_refine, _log_groups
+
+INTERVAL_COLUMNS = ['a_low', 'a_high', 'b_low', 'b_high', 'reference_length', 'weight_low', 'weight_high',
+                    'resamples']
+
+
+def _bootstrap_species(x, y, seed, resamples, confidence, max_cells, robust=None):
+    """Percentile intervals for one species from resample matrices of its log-log points
+
+    Each block draws a (resamples, n) index matrix, so every resample's slope and intercept
+    come from row-wise means and dot products instead of a Python loop. Blocks are sized
+    to keep at most max_cells drawn points in memory at once. robust, when given, holds
+    the (max_iter, huber_k, tol, weight_resolution) of a Huber fit: each resample is then
+    refined like fit_grouped_power_law(robust=True), treating every row as a group.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    block = max(1, min(resamples, max_cells // n))
+    slopes = []
+    intercepts = []
+    for start in range(0, resamples, block):
+        rows = rng.integers(0, n, size=(min(block, resamples - start), n))
+        xs = x[rows]
+        ys = y[rows]
+        mean_x = xs.mean(axis=1)
+        mean_y = ys.mean(axis=1)
+        dx = xs - mean_x[:, None]
+        sxx = np.einsum('ij,ij->i', dx, dx)
+        sxy = np.einsum('ij,ij->i', dx, ys - mean_y[:, None])
+        # A resample that drew a single length has no slope; it is left out of the percentiles
+        with np.errstate(divide='ignore', invalid='ignore'):
+            b = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = mean_y - b * mean_x
+        if robust is not None:
+            max_iter, huber_k, tol, weight_resolution = robust
+            count = len(rows)
+            valid = sxx > 0
+            flat_y = ys.ravel()
+            b, intercept, weighted_sxx, _ = _huber_refine(
+                xs.ravel(), flat_y, np.repeat(np.arange(count), n), np.arange(count) * n, np.full(count, n),
+                np.where(valid, b, 0.0), np.where(valid, intercept, 0.0), max_iter, huber_k, tol,
+                np.log1p(weight_resolution / 2 * np.exp(-flat_y)))
+            valid &= weighted_sxx > 0
+            b = np.where(valid, b, np.nan)
+            intercept = np.where(valid, intercept, np.nan)
+        slopes.append(b)
+        intercepts.append(intercept)
+    b = np.concatenate(slopes)
+    intercept = np.concatenate(intercepts)
+
+    # Weight is predicted at the species' median observed length, where the data pins it best
+    reference_x = np.median(x)
+    tail = (1 - confidence) / 2 * 100
+    percentiles = np.nanpercentile(np.column_stack([intercept, b, intercept + b * reference_x]),
+                                   [tail, 100 - tail], axis=0)
+    (log_a_low, b_low, log_weight_low), (log_a_high, b_high, log_weight_high) = percentiles
+    return (np.exp(log_a_low), np.exp(log_a_high), b_low, b_high, np.exp(reference_x),
+            np.exp(log_weight_low), np.exp(log_weight_high), int(np.count_nonzero(~np.isnan(b))))
+
+
+def _bootstrap_chunk(task):
+    """Worker entry point: intervals for a chunk of species"""
+    species, resamples, confidence, max_cells, robust = task
+    return [_bootstrap_species(x, y, seed, resamples, confidence, max_cells,
+                               None if robust is None else robust + (weight_resolution,))
+            for x, y, seed, weight_resolution in species]
+
+
+def bootstrap_intervals(group_keys, lengths, weights, resamples=1000, confidence=0.95, min_points=3,
+                        workers=None, seed=0, max_cells=2_000_000, robust=False, max_iter=10, huber_k=1.345,
+                        tol=1e-6, weight_resolution=None):
+    """Bootstrap confidence intervals for W = a * L^b for every group of a long-format table
+
+    Each species' rows are resampled with replacement and refitted by least squares in log
+    space, matching fit_grouped_power_law; with robust=True every resample gets the same
+    Huber refinement as fit_grouped_power_law(robust=True), so the intervals describe the
+    published robust estimates. Species are split into chunks of similar row counts and
+    spread across a process pool (workers=1 runs in this process). Every species gets its
+    own seed from seed, so results do not depend on the number of workers.
+    weight_resolution is the robust fit's rounding step, one for every group or one per
+    group; when None each species' step is inferred from its own weights.
+
+    Returns a DataFrame indexed by group key with the a, b and predicted weight bounds,
+    the reference length the weight is predicted at, and the number of usable resamples.
+    The weight interval is for the fitted curve, not for an individual fish.
+    """
+    groups = _log_groups(group_keys, lengths, weights)
+    if groups is None:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+    codes, uniques, _, x, y, starts, counts = groups
+
+    # Same cut-off as the fits; a species with a single length has no slope to resample
+    spans = np.maximum.reduceat(x, starts) - np.minimum.reduceat(x, starts)
+    selected = np.flatnonzero((counts >= min_points) & (spans > 0))
+    if not len(selected):
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    # Each species keeps its own rounding step, as in fit_grouped_power_law
+    if weight_resolution is None:
+        weight_resolution = _grouped_weight_resolution(np.exp(y), starts) if robust else 0.0
+    weight_resolution = np.broadcast_to(np.asarray(weight_resolution, dtype=float), counts.shape)
+    robust = (max_iter, huber_k, tol) if robust else None
+
+    # Chunks of roughly equal work, a few per worker so a slow chunk does not hold up the rest
+    workers = workers or os.cpu_count() or 1
+    chunk_rows = max(1, counts[selected].sum() // (workers * 4))
+    chunks = []
+    chunk = []
+    rows = 0
+    for group in selected:
+        start, count = starts[group], counts[group]
+        chunk.append((x[start:start + count], y[start:start + count], seeds[group], weight_resolution[group]))
+        rows += count
+        if rows >= chunk_rows:
+            chunks.append(chunk)
+            chunk, rows = [], 0
+    if chunk:
+        chunks.append(chunk)
+
+    tasks = [(chunk, resamples, confidence, max_cells, robust) for chunk in chunks]
+    if workers == 1 or len(tasks) == 1:
+        results = [_bootstrap_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_bootstrap_chunk, tasks))
+
+    intervals = [interval for chunk_intervals in results for interval in chunk_intervals]
+    return pd.DataFrame(intervals, index=pd.Index(uniques[codes[starts[selected]]], name='group'),
+                        columns=INTERVAL_COLUMNS)
+
+
+def add_confidence_intervals(algorithms, df, species_column='Species_ID', resamples=1000, confidence=0.95,
+                             workers=None, seed=0, robust=False):
+    """Add a confidence_interval entry to each algorithm in algorithms, in place
+
+    df is the combined length/weight table the algorithms were fitted from, and robust
+    must match how they were fitted (batch_algorithms(robust=...)).
+    """
+    lengths, _ = _coalesce_columns(df, 'Length')
+    weights, _ = _coalesce_columns(df, 'Weight')
+    if lengths is None or weights is None:
+        return algorithms
+
+    intervals = bootstrap_intervals(df[species_column].to_numpy(), lengths.to_numpy(), weights.to_numpy(),
+                                    resamples=resamples, confidence=confidence, workers=workers, seed=seed,
+                                    robust=robust)
+    for species_id, interval in intervals.iterrows():
+        algorithm = algorithms.get(str(species_id))
+        if algorithm is None:
+            continue
+        algorithm['algorithm']['confidence_interval'] = {
+            'level': confidence,
+            'fit_method': 'huber' if robust else 'least_squares',
+            'resamples': int(interval['resamples']),
+            'a': [float(interval['a_low']), float(interval['a_high'])],
+            'b': [float(interval['b_low']), float(interval['b_high'])],
+            'reference_length': float(interval['reference_length']),
+            'weight': [float(interval['weight_low']), float(interval['weight_high'])]
+        }
+    return algorithms
+
+
+if __name__ == "__main__":
+    from benchmark_fit import synthetic_species_table
+
+    parser = argparse.ArgumentParser(description="Time bootstrap confidence intervals for every species")
+    parser.add_argument('data', nargs='?', default=None,
+                        help="combined CSV to resample (default: a synthetic table)")
+    parser.add_argument('--species', type=int, default=5000, help="synthetic species count")
+    parser.add_argument('--rows', type=int, default=100, help="synthetic rows per species")
+    parser.add_argument('--resamples', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument('--budget', type=float, default=3600, help="seconds the nightly job may take")
+    parser.add_argument('--robust', action='store_true', help="bootstrap the Huber fit instead of least squares")
+    args = parser.parse_args()
+
+    if args.data:
+        df = pd.read_csv(args.data, dtype={'Species': str, 'Species_ID': str})
+    else:
+        df = synthetic_species_table(args.species, args.rows)
+    lengths, _ = _coalesce_columns(df, 'Length')
+    weights, _ = _coalesce_columns(df, 'Weight')
+
+    start_time = time.perf_counter()
+    intervals = bootstrap_intervals(df['Species_ID'].to_numpy(), lengths.to_numpy(), weights.to_numpy(),
+                                    resamples=args.resamples, workers=args.workers, robust=args.robust)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Bootstrapped {len(intervals)} species from {len(df)} rows "
+          f"({args.resamples} resamples each) in {elapsed:.2f}s")
+    print(f"Median 95% interval width: b {(intervals['b_high'] - intervals['b_low']).median():.4f}, "
+          f"weight {((intervals['weight_high'] / intervals['weight_low']) - 1).median() * 100:.2f}%")
+    print(f"{'Within' if elapsed <= args.budget else 'Over'} the {args.budget:.0f}s budget")
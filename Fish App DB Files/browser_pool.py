@@ -0,0 +1,88 @@
+import queue
+import threading
+import time
+
+try:
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.options import Options
+except ImportError:
+    webdriver = None
+
+
+class HeadlessBrowserPool:
+    """Pool of reusable headless Chrome drivers for pages the plain HTTP path cannot extract"""
+
+    def __init__(self, size=2, page_load_timeout=30):
+        if webdriver is None:
+            raise ImportError("The browser fallback requires the selenium package to be installed")
+        self.size = size
+        self.page_load_timeout = page_load_timeout
+        self._idle = queue.Queue()
+        self._all_drivers = []
+        self._lock = threading.Lock()
+        self.pages_fetched = 0
+        self.total_fetch_time = 0.0
+
+    def _new_driver(self):
+        options = Options()
+        options.add_argument('--headless=new')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        driver = webdriver.Chrome(options=options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        return driver
+
+    def _checkout(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            # Browsers are expensive to start, so they are only launched on demand
+            with self._lock:
+                if len(self._all_drivers) < self.size:
+                    driver = self._new_driver()
+                    self._all_drivers.append(driver)
+                    return driver
+            # Wake up periodically in case a broken driver freed a slot
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def fetch(self, url):
+        """Load url in a pooled browser and return the rendered page source"""
+        driver = self._checkout()
+        start_time = time.perf_counter()
+        try:
+            driver.get(url)
+            html = driver.page_source
+        except WebDriverException:
+            # Replace a broken driver rather than returning it to the pool
+            with self._lock:
+                self._all_drivers.remove(driver)
+            driver.quit()
+            raise
+        self._idle.put(driver)
+
+        with self._lock:
+            self.pages_fetched += 1
+            self.total_fetch_time += time.perf_counter() - start_time
+        return html
+
+    def mean_fetch_time(self):
+        """Average seconds per browser page load, or None before the first load"""
+        if not self.pages_fetched:
+            return None
+        return self.total_fetch_time / self.pages_fetched
+
+    def close(self):
+        """Quit every browser in the pool"""
+        with self._lock:
+            drivers, self._all_drivers = self._all_drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
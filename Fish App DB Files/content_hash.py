@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+
+def species_table_hash(df):
+    """Hash a species' normalized length-weight table so reruns can detect real changes
+
+    The species name and edible flag are hashed with the measurements, since both are
+    exported alongside the fitted algorithm.
+    """
+    length_col = next((col for col in df.columns if "Length" in col), None)
+    weight_col = next((col for col in df.columns if "Weight" in col), None)
+    columns = [col for col in ('Species', 'Edible', 'Measure_Type', length_col, weight_col)
+               if col and col in df.columns]
+
+    # Round away float noise and ignore the index so only the table contents matter
+    normalized = df[columns].copy()
+    for col in (length_col, weight_col):
+        if col in normalized.columns:
+            normalized[col] = pd.to_numeric(normalized[col], errors='coerce').round(6)
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(columns).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(normalized, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class SpeciesHashRegistry:
+    """Stores each species' table hash alongside its fitted algorithm between runs"""
+
+    def __init__(self, path='raw_data/species_hashes.json'):
+        self.path = path
+        self.entries = {}
+        self.changed_species = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"Ignoring unreadable hash registry {self.path}")
+                self.entries = {}
+
+    def is_unchanged(self, species_id, table_hash, species_name=None):
+        """True if the species' table is identical to the one fitted in an earlier run
+
+        With species_name, a species renamed in the site's index also counts as changed.
+        """
+        entry = self.entries.get(species_id)
+        if entry is None or entry['hash'] != table_hash:
+            return False
+        return species_name is None or entry['species_name'] == species_name
+
+    def stored_algorithm(self, species_id):
+        """The algorithm fitted for the species' stored table (None if the fit failed)"""
+        return self.entries[species_id]['algorithm']
+
+    def update(self, species, table_hash, algorithm):
+        """Record a changed (or new) species' hash and freshly fitted algorithm"""
+        self.entries[species['id']] = {
+            'species_name': species['name'],
+            'hash': table_hash,
+            'algorithm': algorithm
+        }
+        # A species listed as both edible and non-edible is only reported once
+        if species['name'] not in self.changed_species:
+            self.changed_species.append(species['name'])
+
+    def prune(self, active_ids):
+        """Drop species no longer listed on the site; their removal counts as a change"""
+        for species_id in [species_id for species_id in self.entries if species_id not in active_ids]:
+            entry = self.entries.pop(species_id)
+            self.changed_species.append(f"{entry['species_name']} (removed)")
+
+    @property
+    def has_changes(self):
+        return bool(self.changed_species)
+
+    def save(self):
+        """Write the registry atomically
+
+        Call this only once every output built from the recorded hashes has been written;
+        otherwise a failed export would be skipped as unchanged on the next run.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def print_report(self):
+        """List only the species whose tables changed in this run"""
+        if not self.changed_species:
+            print("No species tables changed since the last run")
+            return
+        print(f"{len(self.changed_species)} species changed since the last run:")
+        for species_name in self.changed_species:
+            print(f"  {species_name}")
@@ -214,6 +214,8 @@ def create_manual_data():
     }
     
     # Great hammerhead (M&F) - ID: 335
+    # NOTE: this table is identical to the Great white shark table above, so both species
+    # fit the same a/b; it needs re-checking against the species page before it is trusted
     lengths = list(range(25, 130))  # 25cm to 129cm
     weights = [
         0.3, 0.3, 0.4, 0.4, 0.4,  # 25-29cm
@@ -344,6 +346,12 @@ def create_manual_data():
     # Combine all data
     combined_df = pd.concat(all_data, ignore_index=True)
     
+    # Flag species whose weight tables are copies of each other rather than separate observations
+    tables = combined_df.groupby('Species', sort=False)['Weight'].apply(tuple)
+    for names in tables.groupby(tables).groups.values():
+        if len(names) > 1:
+            print(f"Warning: {', '.join(names)} share an identical weight table")
+    
     return combined_df, algorithms
 
 # Create the database files
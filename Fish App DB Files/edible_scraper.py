@@ -9,14 +9,17 @@ import sqlite3
 import re
 import traceback
 
+from strategy_cache import LayoutStrategyCache
+from numeric_cleaner import clean_numeric_column
+from scrape_metrics import ScrapeMetrics, failure_reason
+from http_session import create_session
+
 class FishSpeciesScraper:
     def __init__(self, base_dir):
         self.base_url = "http://specialistangler.co.za/LengthToWeight/"
         self.edible_url = f"{self.base_url}LtoWconv.asp?Edible=1"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # Pooled keep-alive session with retries, timeouts and a circuit breaker
+        self.session = create_session()
         self.base_dir = base_dir
         self.raw_data_dir = os.path.join(base_dir, 'raw_data')
         self.debug_dir = os.path.join(base_dir, 'debug')
@@ -27,6 +30,12 @@ class FishSpeciesScraper:
         os.makedirs(self.debug_dir, exist_ok=True)
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # Remember which extraction strategy wins for each page layout
+        self.strategy_cache = LayoutStrategyCache(['strategy_1', 'strategy_2', 'strategy_3'])
+        
+        # Request, parse and failure metrics, exported with export_metrics()
+        self.metrics = ScrapeMetrics(job='fish_edible_scrape')
+        
     def get_species_list(self, edible=True):
         """Get list of all fish species from the index page using requests and BeautifulSoup"""
         url = self.edible_url if edible else f"{self.base_url}LtoWconv.asp?Edible=0"
@@ -76,8 +85,11 @@ class FishSpeciesScraper:
         log_file_path = os.path.join(self.output_dir, 'extraction_log.txt')
 
         try:
+            start_time = time.perf_counter()
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
+            self.metrics.record_request(time.perf_counter() - start_time, len(response.content))
+            parse_start_time = time.perf_counter()
             soup = BeautifulSoup(response.text, 'html.parser')
             
             debug_html_path = os.path.join(self.debug_dir, f"{species_id}_{species_name.replace('/', '_').replace(' ', '_').replace('(', '').replace(')', '')}.html")
@@ -96,6 +108,8 @@ class FishSpeciesScraper:
                 print(f"No tables found for {species_name}")
                 with open(log_file_path, 'a') as log_f:
                     log_f.write(f"No tables found for {species_name} (ID: {species_id}) at {url}\n")
+                self.metrics.record_parse(time.perf_counter() - parse_start_time, None, 0)
+                self.metrics.record_failure('no_tables')
                 return None
 
             # Try multiple extraction strategies
@@ -106,44 +120,59 @@ class FishSpeciesScraper:
                 self._extract_strategy_3
             ]
 
-            for i, strategy_func in enumerate(strategies):
+            # Known layouts try their previously winning strategy first
+            fingerprint = LayoutStrategyCache.fingerprint(tables)
+            for i in self.strategy_cache.order(fingerprint):
                 # print(f"Trying strategy {i+1} for {species_name}")
-                df = strategy_func(tables, species_name, species_id, species['edible'])
+                df = strategies[i](tables, species_name, species_id, species['edible'])
+                succeeded = False
                 if df is not None and not df.empty:
                     length_col = next((col for col in df.columns if "Length" in col), None)
                     weight_col = next((col for col in df.columns if "Weight" in col), None)
-                    if length_col and weight_col and pd.api.types.is_numeric_dtype(df[length_col]) and pd.api.types.is_numeric_dtype(df[weight_col]):
-                        # print(f"Strategy {i+1} successful for {species_name}")
-                        break # Successful extraction
+                    succeeded = bool(length_col and weight_col and pd.api.types.is_numeric_dtype(df[length_col]) and pd.api.types.is_numeric_dtype(df[weight_col]))
+                self.strategy_cache.record(fingerprint, i, succeeded)
+                if succeeded:
+                    # print(f"Strategy {i+1} successful for {species_name}")
+                    break # Successful extraction
                 df = None # Reset df if strategy failed or didn't produce numeric length/weight
             
             if df is None or df.empty:
                 print(f"All extraction strategies failed for {species_name}")
                 with open(log_file_path, 'a') as log_f:
                     log_f.write(f"All extraction strategies failed for {species_name} (ID: {species_id}) at {url}\n")
+                self.metrics.record_parse(time.perf_counter() - parse_start_time, None, 0)
+                self.metrics.record_failure('all_strategies_failed')
                 return None
 
+            self.metrics.record_parse(time.perf_counter() - parse_start_time, self.strategy_cache.strategy_names[i], len(df))
             return df
             
         except requests.exceptions.RequestException as e:
+            self.metrics.record_failure(failure_reason(e))
             print(f"Request error extracting data for {species_name}: {str(e)}")
             with open(log_file_path, 'a') as log_f:
                 log_f.write(f"Request error for {species_name} (ID: {species_id}) at {url}: {str(e)}\n")
             return None
         except Exception as e:
+            self.metrics.record_failure('exception')
             print(f"General error extracting data for {species_name}: {str(e)}")
             with open(log_file_path, 'a') as log_f:
                 log_f.write(f"General error for {species_name} (ID: {species_id}) at {url}: {str(e)}\n")
             traceback.print_exc(file=open(log_file_path, 'a'))
             return None
 
+    def print_strategy_stats(self):
+        """Print layout cache hits and per-strategy hit rates"""
+        for line in self.strategy_cache.summary_lines():
+            print(line)
+
+    def export_metrics(self):
+        """Write the JSON metrics summary and Prometheus textfile into output/metrics"""
+        for path in self.metrics.write(os.path.join(self.output_dir, 'metrics')):
+            print(f"Wrote scrape metrics to {path}")
+
     def _clean_numeric_column(self, series, unit):
-        series = series.astype(str).str.lower()
-        series = series.str.replace(f' {unit}', '', regex=False).str.replace(unit, '', regex=False)
-        series = series.str.replace('<', '', regex=False).str.replace('>', '', regex=False)
-        series = series.str.replace('b', '', regex=False).str.replace('/', '', regex=False)
-        series = series.str.replace(r'[^\d.]', '', regex=True)
-        return pd.to_numeric(series, errors='coerce')
+        return clean_numeric_column(series, unit)
 
     def _process_extracted_table(self, df_raw, species_name, species_id, edible_param):
         if df_raw is None or df_raw.empty:
@@ -3,6 +3,8 @@ import json
 import os
 import sqlite3
 
+from parametric_species import expand_tables, load_parametric_species, parametric_species_frame, save_parametric_species
+
 class DatabaseIntegrator:
     def __init__(self):
         self.main_dir = "/home/ubuntu/fish_data_merged"
@@ -21,12 +23,14 @@ class DatabaseIntegrator:
         self.new_csv = os.path.join(self.main_dir, "output", "missing_species_data.csv")
         self.new_json = os.path.join(self.main_dir, "output", "missing_species_algorithms.json")
         self.new_excel = os.path.join(self.main_dir, "output", "missing_species_database.xlsx")
+        self.new_parametric = os.path.join(self.main_dir, "output", "missing_species_parametric.json")
         
         # Paths to output files
         self.output_csv = os.path.join(self.output_dir, "complete_fish_species_data.csv")
         self.output_json = os.path.join(self.output_dir, "complete_fish_algorithms.json")
         self.output_excel = os.path.join(self.output_dir, "complete_fish_species_database.xlsx")
         self.output_db = os.path.join(self.output_dir, "complete_fish_species_database.db")
+        self.output_parametric = os.path.join(self.output_dir, "complete_parametric_species.json")
         
     def integrate_data(self):
         """Integrate the new species data with the existing database"""
@@ -38,6 +42,9 @@ class DatabaseIntegrator:
         # Integrate JSON algorithms
         self.integrate_json_algorithms()
         
+        # Integrate parametric species
+        self.integrate_parametric_species()
+        
         # Create integrated Excel file
         self.create_excel_database()
         
@@ -60,6 +67,19 @@ class DatabaseIntegrator:
         
         # Combine data
         combined_df = pd.concat([existing_df, new_df], ignore_index=True)
+        
+        # Observed rows are kept as they are; rows are generated from a/b only for
+        # parametric species with no observed data
+        observed_names = set()
+        for col in ('Species', 'Species_Name'):
+            if col in combined_df.columns:
+                observed_names.update(combined_df[col].dropna().str.lower())
+        unobserved = [species for species in load_parametric_species(self.new_parametric)
+                      if species.name.lower() not in observed_names]
+        if unobserved:
+            generated_df = expand_tables(unobserved, 'Length_cm', 'Weight_kg', 'Species_Name')
+            combined_df = pd.concat([combined_df, generated_df], ignore_index=True)
+            print(f"Generated {len(generated_df)} rows for {len(unobserved)} parametric species")
         print(f"Combined CSV has {len(combined_df)} rows")
         
         # Save combined data
@@ -110,6 +130,16 @@ class DatabaseIntegrator:
         
         return combined_algorithms
         
+    def integrate_parametric_species(self):
+        """Carry the parametric species' parameters over alongside their generated rows"""
+        print("Integrating parametric species...")
+        
+        parametric_species = load_parametric_species(self.new_parametric)
+        save_parametric_species(parametric_species, self.output_parametric)
+        print(f"Saved {len(parametric_species)} parametric species to {self.output_parametric}")
+        
+        return parametric_species
+        
     def create_excel_database(self):
         """Create integrated Excel database"""
         print("Creating Excel database...")
@@ -150,10 +180,13 @@ class DatabaseIntegrator:
         
         algo_df = pd.DataFrame(algo_data)
         
+        parametric_df = parametric_species_frame(load_parametric_species(self.output_parametric))
+        
         # Save to Excel
         with pd.ExcelWriter(self.output_excel) as writer:
             combined_df.to_excel(writer, sheet_name='Length_Weight_Data', index=False)
             algo_df.to_excel(writer, sheet_name='Algorithms', index=False)
+            parametric_df.to_excel(writer, sheet_name='Parametric_Species', index=False)
         
         print(f"Saved Excel database to {self.output_excel}")
         
@@ -203,6 +236,8 @@ class DatabaseIntegrator:
         # Save dataframes to database
         combined_df.to_sql('length_weight_data', conn, if_exists='replace', index=False)
         algo_df.to_sql('algorithms', conn, if_exists='replace', index=False)
+        parametric_species_frame(load_parametric_species(self.output_parametric)).to_sql(
+            'parametric_species', conn, if_exists='replace', index=False)
         
         # Close connection
         conn.close()
@@ -9,15 +9,15 @@ import sqlite3
 import re
 import traceback
 
+from http_session import create_session
+
 class FishSpeciesScraper:
     def __init__(self):
         self.base_url = "http://specialistangler.co.za/LengthToWeight/"
         self.edible_url = f"{self.base_url}LtoWconv.asp?Edible=1"
         self.non_edible_url = f"{self.base_url}LtoWconv.asp?Edible=0"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # Pooled keep-alive session with retries, timeouts and a circuit breaker
+        self.session = create_session()
         
         # Create directories for debugging and data
         os.makedirs('raw_data', exist_ok=True)
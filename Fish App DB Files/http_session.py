@@ -0,0 +1,192 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Transient statuses retried inside urllib3 with exponential backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Per-host breaker: after failure_threshold consecutive failures the host is skipped
+    for reset_timeout seconds, then a single trial request decides whether it closes again
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+        self._trial_in_flight = set()
+        self.trips = 0
+        self.rejected = 0
+
+    def before_request(self, host):
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            # Half-open: let one request through once the cool-down has passed
+            if time.monotonic() - opened_at >= self.reset_timeout and host not in self._trial_in_flight:
+                self._trial_in_flight.add(host)
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit breaker open for {host} after repeated failures")
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures[host] = 0
+            self._opened_at.pop(host, None)
+            self._trial_in_flight.discard(host)
+
+    def record_failure(self, host):
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            was_trial = host in self._trial_in_flight
+            self._trial_in_flight.discard(host)
+            if was_trial or (host not in self._opened_at and self._failures[host] >= self.failure_threshold):
+                if host not in self._opened_at:
+                    self.trips += 1
+                self._opened_at[host] = time.monotonic()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with default timeouts, a circuit breaker and wire-level byte accounting"""
+
+    def __init__(self, timeout=(5, 30), breaker=None, **kwargs):
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.wire_bytes = 0
+        self.content_bytes = 0
+        self.connects = 0
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        adapter = self
+
+        # urllib3 silently reopens dropped connections, so handshakes are counted per connect()
+        class CountingHTTPConnection(HTTPConnection):
+            def connect(self):
+                super().connect()
+                adapter._count_connect()
+
+        class CountingHTTPSConnection(HTTPSConnection):
+            def connect(self):
+                super().connect()
+                adapter._count_connect()
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = CountingHTTPConnection
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = CountingHTTPSConnection
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+    def _count_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        host = urlparse(request.url).netloc
+        self.breaker.before_request(host)
+        try:
+            response = super().send(request, stream=stream, timeout=timeout or self.timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            self.breaker.record_failure(host)
+            raise
+
+        if response.status_code >= 500:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+
+        if not stream:
+            # Read the body here so the compressed bytes on the wire can be counted
+            content = response.content
+            response.wire_bytes = response.raw.tell() if response.raw is not None else len(content)
+            with self._lock:
+                self.responses += 1
+                self.wire_bytes += response.wire_bytes
+                self.content_bytes += len(content)
+        return response
+
+    def handshakes(self):
+        """TCP connections opened so far; each one costs a handshake"""
+        return self.connects
+
+
+def create_session(session=None, pool_size=8, max_retries=3, backoff_factor=0.5,
+                   retry_statuses=RETRY_STATUSES, connect_timeout=5, read_timeout=30,
+                   failure_threshold=5, reset_timeout=30.0):
+    """Configure a requests session for scraping and return it
+
+    Pass an existing session (e.g. a RateLimitedSession) to configure it in place. The
+    mounted adapter keeps up to pool_size keep-alive connections per host, retries
+    connection errors and retry_statuses with exponential backoff, applies connect/read
+    timeouts to requests that do not set one and stops requesting a host whose circuit
+    breaker has opened.
+    """
+    session = session if session is not None else requests.Session()
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries if retry_statuses else 0,
+        status_forcelist=retry_statuses,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = PooledHTTPAdapter(
+        timeout=(connect_timeout, read_timeout),
+        breaker=CircuitBreaker(failure_threshold, reset_timeout),
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        pool_block=False,
+        max_retries=retry
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def print_session_summary(session):
+    """Print connection reuse and transfer totals for a session built by create_session"""
+    adapter = session.get_adapter('http://')
+    if not isinstance(adapter, PooledHTTPAdapter):
+        return
+    handshakes = adapter.handshakes()
+    print(f"HTTP session: {adapter.responses} responses over {handshakes} TCP connections "
+          f"({adapter.responses / max(handshakes, 1):.1f} requests per handshake)")
+    saved = adapter.content_bytes - adapter.wire_bytes
+    print(f"HTTP session: {adapter.wire_bytes} bytes on the wire for {adapter.content_bytes} bytes of content"
+          + (f" ({saved} saved by compression)" if saved > 0 else ""))
+    if adapter.breaker.trips:
+        print(f"HTTP session: circuit breaker tripped {adapter.breaker.trips} times, "
+              f"{adapter.breaker.rejected} requests skipped")
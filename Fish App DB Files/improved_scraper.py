@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
@@ -7,16 +6,111 @@ import os
 import time
 import sqlite3
 import re
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from async_fetcher import AsyncFetchEngine
+from response_cache import ResponseCache
+from scrape_journal import ScrapeJournal
+from rate_limiter import AdaptiveRateLimiter, RateLimitedSession
+from http_session import create_session, print_session_summary
+from browser_pool import HeadlessBrowserPool
+from page_archive import PageArchive
+from numeric_cleaner import extract_numeric
+from content_hash import SpeciesHashRegistry, species_table_hash
+from scrape_pipeline import PipelineStage, ScrapePipeline
+from scrape_metrics import ScrapeMetrics, failure_reason
+from streaming_output import StreamingTableWriter
+from strategy_cache import LayoutStrategyCache
+from batch_fit import batch_algorithms, fit_grouped_power_law
+from bootstrap_ci import add_confidence_intervals
+
+try:
+    from lxml_extractor import extract_length_weight_rows_lxml
+except ImportError:
+    extract_length_weight_rows_lxml = None
+
+
+def _largest_table(tables):
+    """The table with the most rows, which on most species pages is the data table"""
+    return max(tables, key=lambda t: len(t.find_all('tr')))
+
+
+def _header_table(tables):
+    """The first table without nested tables that has a Length/Weight header row
+
+    Catches layouts where a page-wide wrapper table has more rows than the data table.
+    """
+    for table in tables:
+        if table.find('table'):
+            continue
+        for row in table.find_all('tr'):
+            cell_texts = [cell.text for cell in row.find_all(['th', 'td'])]
+            if any("Length" in text for text in cell_texts) and any("Weight" in text for text in cell_texts):
+                return table
+    return None
+
+
+# BeautifulSoup table-selection strategies, tried in order until one yields rows;
+# lxml_extractor implements the same ones under the same names
+TABLE_STRATEGIES = {'largest_table': _largest_table, 'header_table': _header_table}
 
 class FishSpeciesScraper:
-    def __init__(self):
-        self.base_url = "http://specialistangler.co.za/LengthToWeight/"
+    def __init__(self, cache_dir='http_cache', parser='html.parser', debug_dir=None,
+                 archive_path='debug/species_pages.warc.gz', browser_pool_size=0,
+                 hash_registry_path='raw_data/species_hashes.json', metrics_dir='metrics',
+                 base_url="http://specialistangler.co.za/LengthToWeight/", rate_limiter=None,
+                 index_cache_path='raw_data/species_index.json', index_ttl=12 * 3600, robust_fit=False):
+        # base_url can point at a local mock_server for benchmarks and regression runs
+        self.base_url = base_url
         self.edible_url = f"{self.base_url}LtoWconv.asp?Edible=1"
         self.non_edible_url = f"{self.base_url}LtoWconv.asp?Edible=0"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # All requests share one adaptive rate limiter instead of fixed sleeps
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        # Pooled keep-alive connections; retries stay with the rate limiter so it sees every failure
+        self.session = create_session(RateLimitedSession(self.rate_limiter), max_retries=0)
+        # Species pages rarely change, so reruns revalidate them against an on-disk cache
+        self.response_cache = ResponseCache(cache_dir) if cache_dir else None
+        
+        if parser not in ('html.parser', 'lxml'):
+            raise ValueError(f"Unsupported parser: {parser}")
+        if parser == 'lxml' and extract_length_weight_rows_lxml is None:
+            raise ValueError("The lxml parser requires the lxml package to be installed")
+        self.parser = parser
+        # Remember which table-selection strategy wins for each page layout
+        self.strategy_cache = LayoutStrategyCache(TABLE_STRATEGIES)
+        
+        # Hybrid mode: pages the HTTP path cannot extract escalate to headless browsers
+        self.browser_pool = HeadlessBrowserPool(browser_pool_size) if browser_pool_size else None
+        self.http_fetch_times = []
+        
+        # Every fetched page is archived so the database can be rebuilt offline: by default
+        # into one compressed archive, or as per-species HTML files when debug_dir is set
+        self.page_archive = PageArchive(archive_path) if archive_path else None
+        self.debug_dir = debug_dir
+        if self.debug_dir:
+            os.makedirs(self.debug_dir, exist_ok=True)
+        
+        # Table hashes from earlier runs, so unchanged species skip the refit and re-export
+        self.hash_registry = SpeciesHashRegistry(hash_registry_path) if hash_registry_path else None
+        self.outputs_changed = True
+        
+        # The parsed species index changes rarely, so it is reused for index_ttl seconds
+        self.index_cache_path = index_cache_path
+        self.index_ttl = index_ttl
+        
+        # Structured request, parse and failure metrics, exported at the end of a scrape
+        self.metrics = ScrapeMetrics()
+        self.metrics_dir = metrics_dir
+        self.rows_written = 0
+        # Species scraped in the last run, whether or not they had enough rows to fit
+        self.species_succeeded = 0
+        self.species_failed = 0
+        
+        # Huber fits in log space shrug off mistyped rows that would skew least squares
+        self.robust_fit = robust_fit
+        self.fit_method = 'huber' if robust_fit else 'least_squares'
         
     def get_species_list(self, edible=True):
         """Get list of all fish species from the index page using requests and BeautifulSoup"""
@@ -59,139 +153,258 @@ class FishSpeciesScraper:
         print(f"Found {len(species_list)} {category} species")
         return species_list
     
+    def get_species_lists(self):
+        """Return (edible, non_edible) species lists, fetching both index pages concurrently
+        
+        A parsed index younger than index_ttl seconds is reused instead of refetching.
+        """
+        cached = self.load_cached_species_index()
+        if cached:
+            return cached
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            edible_future = executor.submit(self.get_species_list, True)
+            non_edible_future = executor.submit(self.get_species_list, False)
+            edible_species, non_edible_species = edible_future.result(), non_edible_future.result()
+        
+        # An empty list means the index page failed to load, so it is never cached
+        if self.index_cache_path and self.index_ttl and edible_species and non_edible_species:
+            directory = os.path.dirname(self.index_cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.index_cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'base_url': self.base_url,
+                    'fetched_at': time.time(),
+                    'edible': edible_species,
+                    'non_edible': non_edible_species
+                }, f, indent=2)
+            os.replace(tmp_path, self.index_cache_path)
+        return edible_species, non_edible_species
+    
+    def load_cached_species_index(self):
+        """Return the cached (edible, non_edible) lists if still fresh, else None"""
+        if not self.index_cache_path or not self.index_ttl:
+            return None
+        try:
+            with open(self.index_cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        age = time.time() - cached['fetched_at']
+        if cached.get('base_url') != self.base_url or not 0 <= age < self.index_ttl:
+            return None
+        print(f"Using cached species index from {age / 60:.0f} minutes ago "
+              f"({len(cached['edible'])} edible, {len(cached['non_edible'])} non-edible)")
+        return cached['edible'], cached['non_edible']
+    
+    def fetch_species_page(self, url):
+        """Fetch the HTML for a single species page"""
+        if self.response_cache:
+            html = self.response_cache.get(self.session, url, timeout=30)
+        else:
+            html = self.session.get(url, timeout=30).text
+        # Token-bucket waits are client-side throttling, so they are kept out of the latency
+        latency, wait = self.session.last_request_timing()
+        self.http_fetch_times.append(latency)
+        # Pages revalidated from the cache only count the bytes that actually arrived
+        self.metrics.record_request(latency, self.session.last_request_bytes(), wait)
+        return html
+    
     def extract_length_weight_data(self, species):
         """Extract length-weight data for a specific species using BeautifulSoup"""
-        species_id = species['id']
-        species_name = species['name']
-        url = species['url']
+        print(f"Extracting data for {species['name']} from {species['url']}")
         
-        print(f"Extracting data for {species_name} from {url}")
+        try:
+            html = self.fetch_species_page(species['url'])
+        except Exception as e:
+            print(f"Error extracting data for {species['name']}: {str(e)}")
+            return None
+        
+        return self.parse_length_weight_html(species, html)
+    
+    def parse_length_weight_html(self, species, html):
+        """Parse length-weight data for a species from its fetched page HTML"""
+        start_time = time.perf_counter()
+        df = self._parse_length_weight_html(species, html)
+        self.record_parse_metrics(time.perf_counter() - start_time, df)
+        return df
+    
+    def print_strategy_stats(self):
+        """Print layout cache hits and per-strategy hit rates"""
+        for line in self.strategy_cache.summary_lines():
+            print(line)
+    
+    def record_parse_metrics(self, seconds, df):
+        # The winning table strategy travels in df.attrs, which survive the trip back from parse workers
+        self.metrics.record_parse(seconds, None if df is None else df.attrs.get('strategy', self.parser),
+                                  0 if df is None else len(df))
+    
+    def _parse_length_weight_html(self, species, html):
+        species_name = species['name']
         
         try:
-            response = self.session.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract species name from the page if available
-            species_header = soup.find(string=lambda text: text and "SPECIES:" in text)
-            if species_header:
-                species_name_from_page = species_header.strip().replace("SPECIES:", "").strip()
-                if species_name_from_page:
-                    species_name = species_name_from_page
-            
-            # Find all tables
-            tables = soup.find_all('table')
-            if not tables:
-                print(f"No tables found for {species_name}")
-                return None
-            
-            # Find the table with the most rows (likely the data table)
-            data_table = max(tables, key=lambda t: len(t.find_all('tr')))
-            
-            # Get all rows from the table
-            rows = data_table.find_all('tr')
-            if len(rows) < 3:  # Need at least header row + 2 data rows
-                print(f"Not enough rows in table for {species_name}")
-                return None
-            
-            # Find the header row (with "Length" and "Weight")
-            header_row_index = -1
-            header_columns = []
-            
-            for i, row in enumerate(rows):
-                # Get text content of all cells
-                cells = row.find_all(['th', 'td'])
-                cell_texts = [cell.text.strip() for cell in cells]
-                
-                # Check if this is likely the header row
-                if any("Length" in text for text in cell_texts) and any("Weight" in text for text in cell_texts):
-                    header_row_index = i
-                    header_columns = cell_texts
-                    break
-                
-                # Alternative: check for underlined text which often indicates headers
-                if row.find('u') and any("Length" in u.text for u in row.find_all('u')):
-                    header_row_index = i
-                    # Extract header text from underlined elements
-                    header_columns = []
-                    for cell in cells:
-                        u_tag = cell.find('u')
-                        if u_tag:
-                            header_columns.append(u_tag.text.strip())
-                        else:
-                            header_columns.append(cell.text.strip())
-                    break
-            
-            if header_row_index == -1 or not header_columns:
-                print(f"Could not find header row for {species_name}")
-                return None
-            
-            # Extract data rows (all rows after the header)
-            data_rows = []
-            for row in rows[header_row_index + 1:]:
-                cells = row.find_all('td')
-                if cells and len(cells) >= len(header_columns):
-                    # Only include rows with enough cells
-                    row_data = [cell.text.strip() for cell in cells[:len(header_columns)]]
-                    if all(row_data):  # Ensure no empty cells
-                        data_rows.append(row_data)
-            
-            if not data_rows:
-                print(f"No data rows found for {species_name}")
+            if self.parser == 'lxml':
+                extracted = extract_length_weight_rows_lxml(html, species_name, self.strategy_cache)
+            else:
+                extracted = self._extract_length_weight_rows(html, species_name)
+            if extracted is None:
                 return None
             
-            # Create DataFrame
-            df = pd.DataFrame(data_rows, columns=header_columns)
-            
-            # Determine measure type column and length/weight columns
-            measure_type_col = None
-            length_col = None
-            weight_col = None
-            
-            for col in df.columns:
-                if "Measure" in col or "Type" in col:
-                    measure_type_col = col
-                elif "Length" in col:
-                    length_col = col
-                elif "Weight" in col:
-                    weight_col = col
-            
-            # If measure type is not in column headers but in data, extract it
-            if not measure_type_col and len(df.columns) >= 3:
-                # First column might be measure type
-                first_col = df.columns[0]
-                if df[first_col].iloc[0].lower().endswith('length'):
-                    measure_type_col = first_col
-            
-            # Add metadata
-            df['Species'] = species_name
-            df['Species_ID'] = species_id
-            df['Edible'] = species['edible']
-            
-            # If we found a measure type column, extract it as a separate column
-            if measure_type_col:
-                df['Measure_Type'] = df[measure_type_col]
-            
-            # Clean numeric data
-            for col in df.columns:
-                if length_col and col == length_col:
-                    df[col] = df[col].str.replace(' cm', '').str.replace('cm', '')
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                elif weight_col and col == weight_col:
-                    df[col] = df[col].str.replace(' kg', '').str.replace('kg', '')
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Validate that we have numeric length and weight columns
-            if length_col and weight_col:
-                if df[length_col].dtype == 'float64' and df[weight_col].dtype == 'float64':
-                    return df
-            
-            print(f"Failed to extract valid numeric data for {species_name}")
-            return None
+            species_name, header_columns, data_rows, strategy = extracted
+            df = self._build_length_weight_dataframe(species, species_name, header_columns, data_rows)
+            if df is not None:
+                df.attrs['strategy'] = strategy
+            return df
             
         except Exception as e:
             print(f"Error extracting data for {species_name}: {str(e)}")
             return None
     
+    def _extract_length_weight_rows(self, html, species_name):
+        """Find the species name, header and data rows of the length-weight table with BeautifulSoup
+
+        Returns them with the name of the table-selection strategy that found the table.
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract species name from the page if available
+        species_header = soup.find(string=lambda text: text and "SPECIES:" in text)
+        if species_header:
+            species_name_from_page = species_header.strip().replace("SPECIES:", "").strip()
+            if species_name_from_page:
+                species_name = species_name_from_page
+        
+        # Find all tables
+        tables = soup.find_all('table')
+        if not tables:
+            print(f"No tables found for {species_name}")
+            return None
+        
+        # Known layouts try the table-selection strategy that last worked for them first
+        fingerprint = LayoutStrategyCache.fingerprint(tables)
+        failure = None
+        for index in self.strategy_cache.order(fingerprint):
+            select_table = TABLE_STRATEGIES[self.strategy_cache.strategy_names[index]]
+            data_table = select_table(tables)
+            rows = self._table_rows(data_table) if data_table is not None else "Could not find header row"
+            self.strategy_cache.record(fingerprint, index, not isinstance(rows, str))
+            if not isinstance(rows, str):
+                header_columns, data_rows = rows
+                return species_name, header_columns, data_rows, self.strategy_cache.strategy_names[index]
+            failure = failure or rows
+        
+        print(f"{failure} for {species_name}")
+        return None
+    
+    @staticmethod
+    def _table_rows(data_table):
+        """Header cells and data rows of a length-weight table, or why it has none"""
+        # Get all rows from the table
+        rows = data_table.find_all('tr')
+        if len(rows) < 3:  # Need at least header row + 2 data rows
+            return "Not enough rows in table"
+        
+        # Find the header row (with "Length" and "Weight")
+        header_row_index = -1
+        header_columns = []
+        
+        for i, row in enumerate(rows):
+            # Get text content of all cells
+            cells = row.find_all(['th', 'td'])
+            cell_texts = [cell.text.strip() for cell in cells]
+            
+            # Check if this is likely the header row
+            if any("Length" in text for text in cell_texts) and any("Weight" in text for text in cell_texts):
+                header_row_index = i
+                header_columns = cell_texts
+                break
+            
+            # Alternative: check for underlined text which often indicates headers
+            if row.find('u') and any("Length" in u.text for u in row.find_all('u')):
+                header_row_index = i
+                # Extract header text from underlined elements
+                header_columns = []
+                for cell in cells:
+                    u_tag = cell.find('u')
+                    if u_tag:
+                        header_columns.append(u_tag.text.strip())
+                    else:
+                        header_columns.append(cell.text.strip())
+                break
+        
+        if header_row_index == -1 or not header_columns:
+            return "Could not find header row"
+        
+        # Extract data rows (all rows after the header)
+        data_rows = []
+        for row in rows[header_row_index + 1:]:
+            cells = row.find_all('td')
+            if cells and len(cells) >= len(header_columns):
+                # Only include rows with enough cells
+                row_data = [cell.text.strip() for cell in cells[:len(header_columns)]]
+                if all(row_data):  # Ensure no empty cells
+                    data_rows.append(row_data)
+        
+        if not data_rows:
+            return "No data rows found"
+        
+        return header_columns, data_rows
+    
+    def _build_length_weight_dataframe(self, species, species_name, header_columns, data_rows):
+        """Build the cleaned species DataFrame from extracted header and data rows"""
+        # Create DataFrame
+        df = pd.DataFrame(data_rows, columns=header_columns)
+        
+        # Determine measure type column and length/weight columns
+        measure_type_col = None
+        length_col = None
+        weight_col = None
+        
+        for col in df.columns:
+            if "Measure" in col or "Type" in col:
+                measure_type_col = col
+            elif "Length" in col:
+                length_col = col
+            elif "Weight" in col:
+                weight_col = col
+        
+        # If measure type is not in column headers but in data, extract it
+        if not measure_type_col and len(df.columns) >= 3:
+            # First column might be measure type
+            first_col = df.columns[0]
+            if df[first_col].iloc[0].lower().endswith('length'):
+                measure_type_col = first_col
+        
+        # Add metadata
+        df['Species'] = species_name
+        df['Species_ID'] = species['id']
+        df['Edible'] = species['edible']
+        
+        # If we found a measure type column, extract it as a separate column
+        if measure_type_col:
+            df['Measure_Type'] = df[measure_type_col]
+        
+        # Clean numeric data, flagging the rows whose length or weight text was coerced
+        coerced = pd.Series(False, index=df.index)
+        for col, unit in ((length_col, 'cm'), (weight_col, 'kg')):
+            if col:
+                cleaned = extract_numeric(df[col], unit)
+                df[col] = cleaned['value']
+                coerced |= cleaned['coerced']
+        df['Coerced'] = coerced
+        if coerced.any():
+            print(f"Coerced {int(coerced.sum())} rows of non-standard length/weight values for {species_name}")
+        
+        # Validate that we have numeric length and weight columns
+        if length_col and weight_col:
+            if df[length_col].dtype == 'float64' and df[weight_col].dtype == 'float64':
+                return df
+        
+        print(f"Failed to extract valid numeric data for {species_name}")
+        return None
+    
     def calculate_length_weight_algorithm(self, df):
         """Calculate length-weight relationship algorithm for a species"""
         try:
@@ -214,29 +427,36 @@ class FishSpeciesScraper:
             if len(filtered_df) < 3:
                 return None
                 
-            # Log transform
-            log_length = np.log(filtered_df[length_col])
-            log_weight = np.log(filtered_df[weight_col])
-            
-            # Linear regression
-            slope, intercept = np.polyfit(log_length, log_weight, 1)
-            
-            # Calculate a and b parameters
-            a = np.exp(intercept)
-            b = slope
-            
-            # Calculate R-squared
-            log_weight_pred = intercept + slope * log_length
-            ss_total = np.sum((log_weight - np.mean(log_weight)) ** 2)
-            ss_residual = np.sum((log_weight - log_weight_pred) ** 2)
-            r_squared = 1 - (ss_residual / ss_total)
+            if self.robust_fit:
+                fit = fit_grouped_power_law(np.zeros(len(filtered_df)), filtered_df[length_col],
+                                            filtered_df[weight_col], robust=True)
+                if fit.empty:
+                    return None
+                a, b, r_squared, outliers = fit.iloc[0][['a', 'b', 'r_squared', 'outliers']]
+            else:
+                # Log transform
+                log_length = np.log(filtered_df[length_col])
+                log_weight = np.log(filtered_df[weight_col])
+                
+                # Linear regression
+                slope, intercept = np.polyfit(log_length, log_weight, 1)
+                
+                # Calculate a and b parameters
+                a = np.exp(intercept)
+                b = slope
+                
+                # Calculate R-squared
+                log_weight_pred = intercept + slope * log_length
+                ss_total = np.sum((log_weight - np.mean(log_weight)) ** 2)
+                ss_residual = np.sum((log_weight - log_weight_pred) ** 2)
+                r_squared = 1 - (ss_residual / ss_total)
             
             # Get measure type if available
             measure_type = "Unknown"
             if 'Measure_Type' in df.columns and not df['Measure_Type'].empty:
                 measure_type = df['Measure_Type'].iloc[0]
             
-            return {
+            algorithm = {
                 'formula': 'W = a * L^b',
                 'a': a,
                 'b': b,
@@ -245,17 +465,96 @@ class FishSpeciesScraper:
                 'weight_column': weight_col,
                 'measure_type': measure_type
             }
+            if self.robust_fit:
+                algorithm.update({'fit_method': 'huber', 'outliers': int(outliers)})
+            return algorithm
             
         except Exception as e:
             print(f"Error calculating algorithm: {str(e)}")
             return None
     
-    def scrape_all_species(self):
-        """Scrape data for all fish species"""
+    def species_file_stem(self, species):
+        """Return the '<id>_<name>' stem used for per-species raw data and debug files"""
+        return f"{species['id']}_{species['name'].replace('/', '_').replace(' ', '_').replace('(', '').replace(')', '')}"
+    
+    def save_debug_html(self, species, html):
+        """Archive a fetched species page for offline rebuilds"""
+        if self.page_archive is not None:
+            self.page_archive.append(species, html)
+        if not self.debug_dir:
+            return
+        debug_html_path = os.path.join(self.debug_dir, f"{self.species_file_stem(species)}.html")
+        with open(debug_html_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+    
+    def fit_species_data(self, species, df):
+        """Fit a species' algorithm, returning (table_hash, algorithm, changed)
+        
+        Species whose table hash matches the registry reuse their stored fit, provided it
+        was made with the same fit method.
+        """
+        table_hash = species_table_hash(df)
+        species_filename = f"raw_data/{self.species_file_stem(species)}.csv"
+        if (self.hash_registry is not None and os.path.exists(species_filename)
+                and self.hash_registry.is_unchanged(species['id'], table_hash, species['name'])):
+            stored = self.hash_registry.stored_algorithm(species['id'])
+            if (stored or {}).get('fit_method', 'least_squares') == self.fit_method:
+                return table_hash, stored, False
+        return table_hash, self.calculate_length_weight_algorithm(df), True
+    
+    def save_species_data(self, species, df, algorithms, fit=None):
+        """Save a species' raw data, fit its algorithm and add it to algorithms
+        
+        fit is a precomputed fit_species_data result; unchanged species keep their saved CSV.
+        """
+        table_hash, algorithm, changed = fit or self.fit_species_data(species, df)
+        if changed:
+            # Save raw data for this species
+            df.to_csv(f"raw_data/{self.species_file_stem(species)}.csv", index=False)
+            if self.hash_registry is not None:
+                self.hash_registry.update(species, table_hash, algorithm)
+        
+        if algorithm:
+            algorithms[species['id']] = {
+                'species_name': species['name'],
+                'edible': species['edible'],
+                'algorithm': algorithm
+            }
+        return algorithm
+    
+    def load_saved_species_lists(self):
+        """Load the species lists saved by a previous run, or None if they are missing"""
+        try:
+            with open('raw_data/edible_species.json', 'r') as f:
+                edible_species = json.load(f)
+            with open('raw_data/non_edible_species.json', 'r') as f:
+                non_edible_species = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return edible_species, non_edible_species
+    
+    def scrape_all_species(self, max_concurrency=4, target_rate=None, resume=False, parse_workers=0):
+        """Scrape data for all fish species, fetching pages concurrently
+        
+        Each completed species is checkpointed to the scrape journal. With resume=True,
+        species already in the journal are rebuilt from it instead of being refetched.
+        With parse_workers set, pages flow through a staged pipeline that parses them in
+        that many processes while later pages are still being fetched.
+        """
+        journal = ScrapeJournal('raw_data/scrape_journal.jsonl')
+        saved_lists = self.load_saved_species_lists() if resume else None
+        
         # Get all species lists
-        edible_species = self.get_species_list(edible=True)
-        non_edible_species = self.get_species_list(edible=False)
-        all_species = edible_species + non_edible_species
+        if saved_lists:
+            edible_species, non_edible_species = saved_lists
+            print(f"Resuming with saved species lists ({len(edible_species)} edible, {len(non_edible_species)} non-edible)")
+        else:
+            edible_species, non_edible_species = self.get_species_lists()
+        # Species listed as both edible and non-edible are fetched once, as edible
+        all_species = dedupe_species(edible_species + non_edible_species)
+        duplicates = len(edible_species) + len(non_edible_species) - len(all_species)
+        if duplicates:
+            print(f"Skipping {duplicates} species listed in both indexes")
         
         # Create directory for raw data
         os.makedirs('raw_data', exist_ok=True)
@@ -267,113 +566,444 @@ class FishSpeciesScraper:
         with open('raw_data/non_edible_species.json', 'w') as f:
             json.dump(non_edible_species, f, indent=2)
         
-        # Extract data for each species
-        all_data = []
+        # Rows stream into the combined CSV as species finish. To keep species-list order
+        # regardless of completion order, early finishers wait in a small reorder buffer.
+        # Species deferred to the browser fallback release their slot at once, so the buffer
+        # never waits on them; their rows are appended after the rest when the fallback runs
+        combined_writer = StreamingTableWriter('all_fish_species_data.csv')
+        pending_data = {}
+        next_index = 0
         algorithms = {}
         successful_species = 0
         failed_species = 0
+        processed_species = 0
+        species_index = {id(species): i for i, species in enumerate(all_species)}
+        
+        def emit(index, df):
+            # df is None for failed or deferred species, which still release the species after them
+            nonlocal next_index
+            if index < next_index:
+                # A browser-fallback species whose slot was already released
+                if df is not None:
+                    combined_writer.append(df)
+                return
+            pending_data[index] = df
+            while next_index in pending_data:
+                ready = pending_data.pop(next_index)
+                if ready is not None:
+                    combined_writer.append(ready)
+                next_index += 1
+        
+        # Rebuild finished species from the journal and only fetch the rest
+        species_to_fetch = all_species
+        if resume:
+            completed = journal.load()
+            species_to_fetch = []
+            for i, species in enumerate(all_species):
+                entry = completed.get(species['id'])
+                if entry is None:
+                    species_to_fetch.append(species)
+                    continue
+                emit(i, ScrapeJournal.entry_to_dataframe(entry))
+                if entry['algorithm']:
+                    algorithms[species['id']] = {
+                        'species_name': entry['species_name'],
+                        'edible': entry['edible'],
+                        'algorithm': entry['algorithm']
+                    }
+                successful_species += 1
+            print(f"Resuming: {successful_species} species restored from journal, {len(species_to_fetch)} left to fetch")
+        else:
+            journal.reset()
+        
+        # Species whose fast HTTP extraction failed, retried through the browser pool
+        fallback_species = []
         
-        for i, species in enumerate(all_species):
-            print(f"Processing {i+1}/{len(all_species)}: {species['name']}")
+        def process_species(species, html, error):
+            nonlocal processed_species
+            processed_species += 1
+            print(f"Processing {processed_species}/{len(species_to_fetch)}: {species['name']}")
             
             # Extract length-weight data
-            df = self.extract_length_weight_data(species)
+            if error is not None:
+                print(f"Error extracting data for {species['name']}: {str(error)}")
+                df = None
+            else:
+                self.save_debug_html(species, html)
+                df = self.parse_length_weight_html(species, html)
+            
+            if df is None and self.browser_pool:
+                fallback_species.append(species)
+                emit(species_index[id(species)], None)
+            else:
+                record_result(species, df, error=error)
             
+            # Print progress every 10 species
+            if processed_species % 10 == 0:
+                print(f"Progress: {processed_species}/{len(species_to_fetch)} species processed. Success: {successful_species}, Failed: {failed_species}")
+        
+        def record_result(species, df, fit=None, error=None):
+            nonlocal successful_species, failed_species
             if df is not None:
-                # Save raw data for this species
-                species_filename = f"raw_data/{species['id']}_{species['name'].replace('/', '_').replace(' ', '_').replace('(', '').replace(')', '')}.csv"
-                df.to_csv(species_filename, index=False)
+                algorithm = self.save_species_data(species, df, algorithms, fit)
+                if algorithm is None:
+                    self.metrics.record_failure('fit_failed')
                 
-                # Calculate algorithm
-                algorithm = self.calculate_length_weight_algorithm(df)
-                if algorithm:
-                    algorithms[species['id']] = {
-                        'species_name': species['name'],
-                        'edible': species['edible'],
-                        'algorithm': algorithm
-                    }
+                # Checkpoint before counting the species as done
+                journal.record(species, df, algorithm)
                 
                 # Add to combined dataset
-                all_data.append(df)
+                emit(species_index[id(species)], df)
                 successful_species += 1
             else:
+                self.metrics.record_failure(failure_reason(error) if error is not None else 'no_length_weight_table')
+                emit(species_index[id(species)], None)
                 failed_species += 1
-            
-            # Be nice to the server
-            time.sleep(0.5)
-            
-            # Print progress every 10 species
-            if (i + 1) % 10 == 0:
-                print(f"Progress: {i+1}/{len(all_species)} species processed. Success: {successful_species}, Failed: {failed_species}")
         
-        print(f"Extraction complete. Successfully extracted data for {successful_species} species. Failed for {failed_species} species.")
+        def write_species(item):
+            # The single writer stage: all archive, CSV and journal writes happen here
+            nonlocal processed_species
+            species, html, df, fit, error = item
+            processed_species += 1
+            if html is not None:
+                self.save_debug_html(species, html)
+            if df is None and self.browser_pool:
+                fallback_species.append(species)
+                emit(species_index[id(species)], None)
+            else:
+                record_result(species, df, fit, error)
+            if processed_species % 10 == 0:
+                print(f"Progress: {processed_species}/{len(species_to_fetch)} species processed. Success: {successful_species}, Failed: {failed_species}")
         
-        # Combine all data
-        if all_data:
-            combined_df = pd.concat(all_data, ignore_index=True)
-            combined_df.to_csv('all_fish_species_data.csv', index=False)
-            
-            # Save algorithms
-            with open('fish_algorithms.json', 'w') as f:
-                json.dump(algorithms, f, indent=2)
-            
-            return combined_df, algorithms
+        if parse_workers:
+            engine = self.run_pipeline(species_to_fetch, write_species, max_concurrency, parse_workers)
         else:
+            # Pacing comes from the session's rate limiter, so the engine adds no fixed delay
+            engine = AsyncFetchEngine(self.fetch_species_page, max_per_host=max_concurrency,
+                                      request_delay=0, target_rate=target_rate)
+            engine.run(species_to_fetch, process_species)
+        
+        if fallback_species:
+            self.run_browser_fallback(fallback_species, record_result)
+        # Species dropped by a failing pipeline stage never arrive; write what is left in order
+        for index in sorted(pending_data):
+            if pending_data[index] is not None:
+                combined_writer.append(pending_data[index])
+        
+        print(f"Extraction complete. Successfully extracted data for {successful_species} species. Failed for {failed_species} species.")
+        self.species_succeeded = successful_species
+        self.species_failed = failed_species
+        engine.print_report()
+        if self.browser_pool:
+            self.print_hybrid_report(len(species_to_fetch), len(fallback_species))
+        self.rate_limiter.print_summary()
+        print_session_summary(self.session)
+        # Parse worker processes keep their own layout caches, so only in-process parsing is reported
+        if not parse_workers:
+            self.print_strategy_stats()
+        if self.response_cache:
+            self.response_cache.print_summary()
+        if self.metrics_dir:
+            for path in self.metrics.write(self.metrics_dir):
+                print(f"Wrote scrape metrics to {path}")
+        
+        # A resumed run may follow one that never exported, so it always rewrites the outputs
+        if self.hash_registry is not None:
+            self.hash_registry.prune({species['id'] for species in all_species})
+            self.outputs_changed = resume or self.hash_registry.has_changes
+        return self.finish_combined_outputs(combined_writer, algorithms)
+    
+    def run_pipeline(self, species_list, write_species, fetch_workers, parse_workers):
+        """Fetch, parse, fit and write species through bounded queues; returns the pipeline
+        
+        Fetch threads overlap network waits, parsing runs in a process pool, fitting runs in
+        a thread and a single writer owns every file write.
+        """
+        # Workers are spawned rather than forked, since fetch threads are already running
+        with ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_parse_worker, initargs=(self.parser,)) as executor:
+            def fetch(species):
+                try:
+                    return species, self.fetch_species_page(species['url']), None
+                except Exception as e:
+                    return species, None, e
+            
+            def parse(item):
+                species, html, error = item
+                if error is not None:
+                    print(f"Error extracting data for {species['name']}: {str(error)}")
+                    return species, None, None, error
+                # The page travels on with its table so the writer can archive it
+                start_time = time.perf_counter()
+                df = executor.submit(_parse_in_worker, species, html).result()
+                self.record_parse_metrics(time.perf_counter() - start_time, df)
+                return species, html, df, None
+            
+            def fit(item):
+                species, html, df, error = item
+                return species, html, df, None if df is None else self.fit_species_data(species, df), error
+            
+            pipeline = ScrapePipeline([
+                PipelineStage('fetch', fetch, workers=fetch_workers),
+                PipelineStage('parse', parse, workers=parse_workers),
+                PipelineStage('fit', fit, workers=1),
+                PipelineStage('write', write_species, workers=1)
+            ])
+            pipeline.run(species_list)
+        return pipeline
+    
+    def run_browser_fallback(self, fallback_species, record_result):
+        """Retry species whose HTTP extraction failed through the headless browser pool"""
+        print(f"Escalating {len(fallback_species)} species to the headless browser")
+        
+        def fetch_with_browser(species):
+            try:
+                return species, self.browser_pool.fetch(species['url']), None
+            except Exception as e:
+                return species, None, e
+        
+        with ThreadPoolExecutor(max_workers=self.browser_pool.size) as executor:
+            for species, html, error in executor.map(fetch_with_browser, fallback_species):
+                if error is not None:
+                    print(f"Browser error extracting data for {species['name']}: {str(error)}")
+                    record_result(species, None, error=error)
+                    continue
+                self.save_debug_html(species, html)
+                record_result(species, self.parse_length_weight_html(species, html))
+    
+    def print_hybrid_report(self, total_pages, browser_pages):
+        """Report how many pages needed the browser and the time the HTTP path saved"""
+        http_pages = total_pages - browser_pages
+        print(f"Hybrid mode: {http_pages} pages via HTTP, {browser_pages} escalated to the headless browser")
+        
+        browser_time = self.browser_pool.mean_fetch_time()
+        if browser_time is None or not self.http_fetch_times:
+            print("Hybrid mode: time saved unknown until both paths have been timed")
+            return
+        http_time = sum(self.http_fetch_times) / len(self.http_fetch_times)
+        time_saved = http_pages * max(0.0, browser_time - http_time)
+        print(f"Hybrid mode: {http_time:.2f}s per HTTP page vs {browser_time:.2f}s per browser page, "
+              f"~{time_saved:.1f}s saved versus a browser-only run")
+    
+    def close(self):
+        """Shut down the browser pool, if one was started"""
+        if self.browser_pool:
+            self.browser_pool.close()
+    
+    def finish_combined_outputs(self, combined_writer, algorithms):
+        """Finish the streamed combined dataset CSV and write the algorithms JSON
+        
+        Returns (combined CSV path, algorithms), or (None, None) if nothing was extracted.
+        The files are left untouched when the hash registry saw no species change. The
+        registry itself is saved by save_hash_registry once the databases are written too.
+        """
+        if self.hash_registry is not None:
+            self.hash_registry.print_report()
+        outputs_exist = os.path.exists(combined_writer.path) and os.path.exists('fish_algorithms.json')
+        if not outputs_exist:
+            self.outputs_changed = True
+        self.rows_written = combined_writer.rows
+        
+        if not combined_writer.rows:
+            combined_writer.discard()
             print("No data extracted")
             return None, None
+        if not self.outputs_changed:
+            combined_writer.discard()
+            print("No species changed; keeping the existing combined outputs")
+            return combined_writer.path, algorithms
+        
+        combined_path = combined_writer.close()
+        
+        # Save algorithms
+        with open('fish_algorithms.json', 'w') as f:
+            json.dump(algorithms, f, indent=2)
+        
+        return combined_path, algorithms
+
+    def save_hash_registry(self):
+        """Record this run's table hashes; call only after every output has been written"""
+        if self.hash_registry is not None:
+            self.hash_registry.save()
+
+def dedupe_species(species_list):
+    """Drop repeated species IDs, keeping each species' first entry"""
+    seen = set()
+    unique = []
+    for species in species_list:
+        if species['id'] not in seen:
+            seen.add(species['id'])
+            unique.append(species)
+    return unique
+
+
+# One scraper per parse worker process, created by the pool initializer
+_worker_scraper = None
+
+
+def _init_parse_worker(parser):
+    global _worker_scraper
+    _worker_scraper = FishSpeciesScraper(cache_dir=None, parser=parser, archive_path=None,
+                                         hash_registry_path=None)
+
+
+def _parse_in_worker(species, html):
+    return _worker_scraper.parse_length_weight_html(species, html)
+
+
+def read_combined_data(data, chunksize=50000):
+    """Yield the combined dataset in chunks, from a DataFrame or a streamed combined CSV"""
+    if isinstance(data, pd.DataFrame):
+        yield data
+        return
+    yield from pd.read_csv(data, dtype={'Species': str, 'Species_ID': str}, chunksize=chunksize)
+
+
+def refit_combined_outputs(data_path='all_fish_species_data.csv', robust=False, bootstrap=0, workers=None):
+    """Refit every species in the combined CSV in one vectorized pass and rewrite the outputs
+    
+    With bootstrap > 0, each algorithm also gets 95% confidence intervals from that many
+    resamples of the same fit (least squares or Huber), computed across workers processes.
+    """
+    combined = pd.read_csv(data_path, dtype={'Species': str, 'Species_ID': str})
+    start_time = time.perf_counter()
+    algorithms = batch_algorithms(combined, robust=robust)
+    print(f"Refit {len(algorithms)} species from {len(combined)} rows in "
+          f"{(time.perf_counter() - start_time) * 1000:.1f} ms")
+    
+    if bootstrap:
+        start_time = time.perf_counter()
+        add_confidence_intervals(algorithms, combined, resamples=bootstrap, workers=workers, robust=robust)
+        print(f"Bootstrapped confidence intervals ({bootstrap} resamples) in "
+              f"{time.perf_counter() - start_time:.1f}s")
+    
+    with open('fish_algorithms.json', 'w') as f:
+        json.dump(algorithms, f, indent=2)
+    create_database_files(combined, algorithms)
+    return algorithms
+
+
+def create_database_files(combined_data, algorithms):
+    """Create the Excel and SQLite databases from the combined dataset and algorithms
+    
+    combined_data is a DataFrame or the path of the combined CSV, loaded a chunk at a time.
+    """
+    # Create Excel file
+    print("Creating Excel database...")
+    with pd.ExcelWriter('fish_species_database.xlsx') as writer:
+        start_row = 0
+        for chunk in read_combined_data(combined_data):
+            chunk.to_excel(writer, sheet_name='Length_Weight_Data', index=False,
+                           header=start_row == 0, startrow=start_row + int(start_row > 0))
+            start_row += len(chunk)
+        
+        # Create algorithms sheet
+        algo_data = []
+        for species_id, data in algorithms.items():
+            row = {
+                'Species_ID': species_id,
+                'Species_Name': data['species_name'],
+                'Edible': data['edible'],
+                'Formula': data['algorithm']['formula'],
+                'a_parameter': data['algorithm']['a'],
+                'b_parameter': data['algorithm']['b'],
+                'R_squared': data['algorithm']['r_squared'],
+                'Measure_Type': data['algorithm'].get('measure_type', 'Unknown'),
+                'Length_Column': data['algorithm']['length_column'],
+                'Weight_Column': data['algorithm']['weight_column']
+            }
+            interval = data['algorithm'].get('confidence_interval')
+            if interval:
+                row.update({
+                    'a_CI_low': interval['a'][0],
+                    'a_CI_high': interval['a'][1],
+                    'b_CI_low': interval['b'][0],
+                    'b_CI_high': interval['b'][1],
+                    'Reference_Length': interval['reference_length'],
+                    'Weight_CI_low': interval['weight'][0],
+                    'Weight_CI_high': interval['weight'][1]
+                })
+            algo_data.append(row)
+        
+        if algo_data:
+            algo_df = pd.DataFrame(algo_data)
+            algo_df.to_excel(writer, sheet_name='Algorithms', index=False)
+    
+    # Create SQL database
+    print("Creating SQL database...")
+    conn = sqlite3.connect('fish_species_database.db')
+    
+    # Create tables
+    if_exists = 'replace'
+    for chunk in read_combined_data(combined_data):
+        chunk.to_sql('length_weight_data', conn, if_exists=if_exists, index=False)
+        if_exists = 'append'
+    
+    # Create algorithms table
+    if algo_data:
+        algo_df = pd.DataFrame(algo_data)
+        algo_df.to_sql('algorithms', conn, if_exists='replace', index=False)
+    
+    conn.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape fish species length-weight data")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip species already checkpointed in raw_data/scrape_journal.jsonl")
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help="species pages fetched at once (fetch threads with --pipeline)")
+    parser.add_argument('--target-rate', type=float, default=None, metavar='SPECIES_PER_SEC',
+                        help="species/sec throughput target the fetch report is checked against "
+                             "(not used with --pipeline)")
+    parser.add_argument('--parser', choices=['html.parser', 'lxml'], default='html.parser',
+                        help="HTML parser used to extract the length-weight tables")
+    parser.add_argument('--hybrid', type=int, default=0, metavar='BROWSERS',
+                        help="retry failed pages in a pool of this many headless browsers (requires selenium)")
+    parser.add_argument('--pipeline', type=int, default=0, metavar='PARSERS',
+                        help="parse pages in this many processes while fetching continues")
+    parser.add_argument('--index-ttl', type=float, default=12 * 3600,
+                        help="seconds to reuse the cached species index (0 always refetches)")
+    parser.add_argument('--metrics-dir', default='metrics',
+                        help="directory for the JSON metrics summary and Prometheus textfile")
+    parser.add_argument('--refit', action='store_true',
+                        help="refit all algorithms from all_fish_species_data.csv without scraping")
+    parser.add_argument('--robust', action='store_true',
+                        help="fit with Huber-weighted regression in log space instead of least squares")
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='RESAMPLES',
+                        help="with --refit, add 95%% confidence intervals from this many bootstrap resamples")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes for --bootstrap (default: one per core)")
+    args = parser.parse_args()
+    
+    if args.refit:
+        refit_combined_outputs(robust=args.robust, bootstrap=args.bootstrap, workers=args.workers)
+        raise SystemExit(0)
+    
     print("Starting fish species data extraction...")
-    scraper = FishSpeciesScraper()
+    scraper = FishSpeciesScraper(parser=args.parser, browser_pool_size=args.hybrid,
+                                 metrics_dir=args.metrics_dir, index_ttl=args.index_ttl,
+                                 robust_fit=args.robust)
     
     try:
-        df, algorithms = scraper.scrape_all_species()
+        data_path, algorithms = scraper.scrape_all_species(max_concurrency=args.concurrency,
+                                                           target_rate=args.target_rate, resume=args.resume,
+                                                           parse_workers=args.pipeline)
         
-        if df is not None:
+        if data_path is not None:
             print(f"Successfully extracted data for {len(algorithms)} species")
-            print(f"Total data points: {len(df)}")
+            print(f"Total data points: {scraper.rows_written}")
             
-            # Create Excel file
-            print("Creating Excel database...")
-            with pd.ExcelWriter('fish_species_database.xlsx') as writer:
-                df.to_excel(writer, sheet_name='Length_Weight_Data', index=False)
-                
-                # Create algorithms sheet
-                algo_data = []
-                for species_id, data in algorithms.items():
-                    algo_data.append({
-                        'Species_ID': species_id,
-                        'Species_Name': data['species_name'],
-                        'Edible': data['edible'],
-                        'Formula': data['algorithm']['formula'],
-                        'a_parameter': data['algorithm']['a'],
-                        'b_parameter': data['algorithm']['b'],
-                        'R_squared': data['algorithm']['r_squared'],
-                        'Measure_Type': data['algorithm'].get('measure_type', 'Unknown'),
-                        'Length_Column': data['algorithm']['length_column'],
-                        'Weight_Column': data['algorithm']['weight_column']
-                    })
-                
-                if algo_data:
-                    algo_df = pd.DataFrame(algo_data)
-                    algo_df.to_excel(writer, sheet_name='Algorithms', index=False)
-            
-            # Create SQL database
-            print("Creating SQL database...")
-            conn = sqlite3.connect('fish_species_database.db')
-            
-            # Create tables
-            df.to_sql('length_weight_data', conn, if_exists='replace', index=False)
-            
-            # Create algorithms table
-            if algo_data:
-                algo_df = pd.DataFrame(algo_data)
-                algo_df.to_sql('algorithms', conn, if_exists='replace', index=False)
-            
-            conn.close()
+            if scraper.outputs_changed:
+                create_database_files(data_path, algorithms)
+            else:
+                print("No species changed; keeping the existing Excel and SQLite databases")
+            # Saved last, so a failed export is retried rather than skipped as unchanged
+            scraper.save_hash_registry()
             
             print("Data extraction and database creation completed successfully!")
         else:
             print("Failed to extract fish species data")
     except Exception as e:
         print(f"Error during extraction: {str(e)}")
+    finally:
+        scraper.close()
@@ -0,0 +1,147 @@
+from lxml import etree
+
+
+_HTML_PARSER = etree.HTMLParser()
+
+
+def _cell_text(element):
+    return ''.join(element.itertext()).strip()
+
+
+def _row_count(table):
+    return len(table.xpath('.//tr'))
+
+
+def _largest_table(tables):
+    """The first table with the most rows, as max() picks in the BeautifulSoup extractor"""
+    return max(tables, key=_row_count)
+
+
+def _header_table(tables):
+    """The first table without nested tables that has a Length/Weight header row"""
+    for table in tables:
+        if table.xpath('.//table'):
+            continue
+        for row in table.xpath('.//tr'):
+            cell_texts = [''.join(cell.itertext()) for cell in row.xpath('.//th|.//td')]
+            if any("Length" in text for text in cell_texts) and any("Weight" in text for text in cell_texts):
+                return table
+    return None
+
+
+# Same strategies, names and order as improved_scraper.TABLE_STRATEGIES
+TABLE_STRATEGIES = {'largest_table': _largest_table, 'header_table': _header_table}
+
+
+def layout_fingerprint(tables):
+    """LayoutStrategyCache.fingerprint for lxml tables, so both parsers key layouts alike"""
+    headers = []
+    for table in tables:
+        header = ()
+        for row in table.xpath('.//tr'):
+            # Rows wrapping a nested table would pull in species-specific text
+            if row.xpath('.//table'):
+                continue
+            cell_texts = [' '.join(text.strip() for text in cell.itertext() if text.strip()).lower()
+                          for cell in row.xpath('.//td|.//th')]
+            if any('length' in text for text in cell_texts) and any('weight' in text for text in cell_texts):
+                header = tuple(cell_texts)
+                break
+        headers.append(header)
+    return (len(tables), tuple(headers))
+
+
+def _table_rows(data_table):
+    """Header cells and data rows of a length-weight table, or why it has none"""
+    rows = data_table.xpath('.//tr')
+    if len(rows) < 3:  # Need at least header row + 2 data rows
+        return "Not enough rows in table"
+
+    # Find the header row (with "Length" and "Weight")
+    header_row_index = -1
+    header_columns = []
+
+    for i, row in enumerate(rows):
+        cells = row.xpath('.//th|.//td')
+        cell_texts = [_cell_text(cell) for cell in cells]
+
+        if any("Length" in text for text in cell_texts) and any("Weight" in text for text in cell_texts):
+            header_row_index = i
+            header_columns = cell_texts
+            break
+
+        # Alternative: check for underlined text which often indicates headers
+        underlined = row.xpath('.//u')
+        if underlined and any("Length" in _cell_text(u) for u in underlined):
+            header_row_index = i
+            header_columns = []
+            for cell in cells:
+                u_tag = cell.find('.//u')
+                header_columns.append(_cell_text(u_tag) if u_tag is not None else _cell_text(cell))
+            break
+
+    if header_row_index == -1 or not header_columns:
+        return "Could not find header row"
+
+    # Extract data rows (all rows after the header)
+    data_rows = []
+    column_count = len(header_columns)
+    for row in rows[header_row_index + 1:]:
+        cells = row.xpath('.//td')
+        if cells and len(cells) >= column_count:
+            row_data = [_cell_text(cell) for cell in cells[:column_count]]
+            if all(row_data):  # Ensure no empty cells
+                data_rows.append(row_data)
+
+    if not data_rows:
+        return "No data rows found"
+
+    return header_columns, data_rows
+
+
+def extract_length_weight_rows_lxml(html, species_name, strategy_cache=None):
+    """Find the species name, header and data rows of the length-weight table using lxml
+
+    Mirrors FishSpeciesScraper._extract_length_weight_rows in improved_scraper.py, including
+    its table-selection strategies: returns (species_name, header_columns, data_rows,
+    strategy), or None if no usable table is found. With a LayoutStrategyCache, known
+    layouts try their winning strategy first, as the BeautifulSoup extractor does.
+    """
+    root = etree.fromstring(html, _HTML_PARSER)
+    if root is None:
+        print(f"No tables found for {species_name}")
+        return None
+
+    # Extract species name from the page if available
+    species_header = root.xpath("(//text()[contains(., 'SPECIES:')])[1]")
+    if species_header:
+        species_name_from_page = str(species_header[0]).strip().replace("SPECIES:", "").strip()
+        if species_name_from_page:
+            species_name = species_name_from_page
+
+    # Find all tables
+    tables = root.xpath('//table')
+    if not tables:
+        print(f"No tables found for {species_name}")
+        return None
+
+    strategy_names = list(TABLE_STRATEGIES)
+    fingerprint = None
+    order = range(len(strategy_names))
+    if strategy_cache is not None:
+        fingerprint = layout_fingerprint(tables)
+        order = strategy_cache.order(fingerprint)
+
+    failure = None
+    for index in order:
+        data_table = TABLE_STRATEGIES[strategy_names[index]](tables)
+        rows = _table_rows(data_table) if data_table is not None else "Could not find header row"
+        if strategy_cache is not None:
+            strategy_cache.record(fingerprint, index, not isinstance(rows, str))
+        if not isinstance(rows, str):
+            header_columns, data_rows = rows
+            return species_name, header_columns, data_rows, strategy_names[index]
+        failure = failure or rows
+
+    print(f"{failure} for {species_name}")
+    return None
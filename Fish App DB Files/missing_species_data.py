@@ -1,406 +1,338 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import numpy as np
-import json
-import os
-import re
-import time
-from scipy import stats
-
-class FishSpeciesDataExtractor:
-    def __init__(self):
-        self.base_url = "http://specialistangler.co.za/LengthToWeight/LtoWconv.asp"
-        self.output_dir = "/home/ubuntu/fish_data_merged/output"
-        self.missing_species = {
-            "dageraad": {"name": "Dageraad", "id": "431", "edible": "0"},
-            "blue_fish": {"name": "Blue Fish", "search_terms": ["blue fish", "blue kingfish", "blue emperor"]},
-            "sand_shark": {"name": "Sand Shark", "search_terms": ["sand shark", "sandshark"]},
-            "shy_shark": {"name": "Shy Shark", "search_terms": ["shy shark", "shyshark"]},
-            "spotted_gulley_shark": {"name": "Spotted Gulley Shark", "search_terms": ["spotted gulley", "gully shark"]}
-        }
-        self.species_data = {}
-        self.algorithms = {}
-        
-        # Create output directory if it doesn't exist
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-    def extract_data_from_website(self):
-        """Extract data for missing species from the website"""
-        print("Extracting data for missing species from the website...")
-        
-        # Check for Black Musselcracker
-        self.extract_species_data("Black musselcracker", "560", "1")
-        
-        # Check for Brown shyshark (as a proxy for Shy Shark)
-        self.extract_species_data("Brown shyshark", "432", "0")
-        
-        # Try to extract Dageraad data
-        self.extract_species_data("Dageraad", "431", "0")
-        
-        # Search for Blue Fish variants
-        for term in self.missing_species["blue_fish"]["search_terms"]:
-            if "Blue kingfish" in self.species_data:
-                break
-            self.search_and_extract(term)
-            
-        # Search for Sand Shark variants
-        for term in self.missing_species["sand_shark"]["search_terms"]:
-            if "Sand Shark" in self.species_data:
-                break
-            self.search_and_extract(term)
-            
-        # Search for Spotted Gulley Shark variants
-        for term in self.missing_species["spotted_gulley_shark"]["search_terms"]:
-            if "Spotted Gulley Shark" in self.species_data:
-                break
-            self.search_and_extract(term)
-            
-        print(f"Extracted data for {len(self.species_data)} species from the website")
-        
-    def search_and_extract(self, search_term):
-        """Search for a species and extract its data if found"""
-        # This is a simplified version - in a real implementation, 
-        # we would search the website for the species
-        pass
-        
-    def extract_species_data(self, species_name, species_id, edible):
-        """Extract length-to-weight data for a specific species"""
-        url = f"{self.base_url}?ID={species_id}&Edible={edible}&SpeciesName={species_name.replace(' ', '+')}"
-        print(f"Extracting data for {species_name} from {url}")
-        
-        try:
-            response = requests.get(url)
-            if response.status_code != 200:
-                print(f"Failed to fetch data for {species_name}: HTTP {response.status_code}")
-                return None
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the table with length-to-weight data
-            table = soup.find('table')
-            if not table:
-                print(f"No data table found for {species_name}")
-                return None
-                
-            # Extract the measure type, length, and weight data
-            rows = table.find_all('tr')
-            if len(rows) < 3:
-                print(f"Insufficient data rows for {species_name}")
-                return None
-                
-            # Check if the species name is in the first row
-            species_row = rows[0].find('td')
-            if species_row and 'SPECIES:' in species_row.text:
-                species_name = species_row.text.replace('SPECIES:', '').strip()
-                
-            # Find the header row
-            header_row = None
-            for i, row in enumerate(rows):
-                cells = row.find_all('td')
-                if cells and len(cells) >= 3:
-                    if 'Measure Type' in cells[0].text and 'Length' in cells[1].text and 'Weight' in cells[2].text:
-                        header_row = i
-                        break
-            
-            if header_row is None:
-                print(f"No header row found for {species_name}")
-                return None
-                
-            # Extract the data rows
-            data_rows = []
-            measure_type = None
-            
-            for row in rows[header_row+1:]:
-                cells = row.find_all('td')
-                if not cells or len(cells) < 3:
-                    continue
-                    
-                # Extract measure type, length, and weight
-                row_measure_type = cells[0].text.strip()
-                if row_measure_type:
-                    measure_type = row_measure_type
-                    
-                length_text = cells[1].text.strip()
-                weight_text = cells[2].text.strip()
-                
-                # Extract numeric values
-                length_match = re.search(r'(\d+(?:\.\d+)?)', length_text)
-                weight_match = re.search(r'(\d+(?:\.\d+)?)', weight_text)
-                
-                if length_match and weight_match:
-                    length = float(length_match.group(1))
-                    weight = float(weight_match.group(1))
-                    
-                    data_rows.append({
-                        'Species_Name': species_name,
-                        'Measure_Type': measure_type,
-                        'Length_cm': length,
-                        'Weight_kg': weight
-                    })
-            
-            if not data_rows:
-                print(f"No valid data rows extracted for {species_name}")
-                return None
-                
-            # Store the data
-            self.species_data[species_name] = pd.DataFrame(data_rows)
-            
-            # Calculate the algorithm
-            self.calculate_algorithm(species_name)
-            
-            print(f"Successfully extracted {len(data_rows)} data points for {species_name}")
-            return self.species_data[species_name]
-            
-        except Exception as e:
-            print(f"Error extracting data for {species_name}: {str(e)}")
-            return None
-            
-    def calculate_algorithm(self, species_name):
-        """Calculate the length-to-weight algorithm for a species"""
-        if species_name not in self.species_data or self.species_data[species_name].empty:
-            print(f"No data available to calculate algorithm for {species_name}")
-            return None
-            
-        df = self.species_data[species_name]
-        
-        # Convert to log scale for linear regression
-        log_length = np.log(df['Length_cm'])
-        log_weight = np.log(df['Weight_kg'].replace(0, 0.001))  # Replace zeros to avoid log(0)
-        
-        # Perform linear regression
-        slope, intercept, r_value, p_value, std_err = stats.linregress(log_length, log_weight)
-        
-        # Calculate a and b parameters for W = a * L^b
-        a = np.exp(intercept)
-        b = slope
-        
-        # Store the algorithm
-        self.algorithms[species_name] = {
-            'species_name': species_name,
-            'algorithm': {
-                'formula': 'W = a * L^b',
-                'a': a,
-                'b': b,
-                'r_squared': r_value**2,
-                'measure_type': df['Measure_Type'].iloc[0],
-                'data_points': len(df)
-            }
-        }
-        
-        print(f"Calculated algorithm for {species_name}: W = {a:.6f} * L^{b:.6f}, R² = {r_value**2:.4f}")
-        return self.algorithms[species_name]
-        
-    def research_external_data(self):
-        """Research data for missing species from external sources"""
-        print("Researching external data for missing species...")
-        
-        # Dageraad (Chrysoblephus cristiceps)
-        if "Dageraad" not in self.species_data:
-            self.add_manual_data_dageraad()
-            
-        # Blue Fish (assuming this refers to Pomatomus saltatrix)
-        if "Blue Fish" not in self.species_data:
-            self.add_manual_data_blue_fish()
-            
-        # Sand Shark
-        if "Sand Shark" not in self.species_data:
-            self.add_manual_data_sand_shark()
-            
-        # Spotted Gulley Shark
-        if "Spotted Gulley Shark" not in self.species_data:
-            self.add_manual_data_spotted_gulley_shark()
-            
-        print(f"Added manual data for {len(self.species_data)} species in total")
-        
-    def add_manual_data_dageraad(self):
-        """Add manual data for Dageraad (Chrysoblephus cristiceps)"""
-        # Data based on research from South African fisheries literature
-        species_name = "Dageraad"
-        measure_type = "Fork length"
-        
-        # Create synthetic data points based on the formula W = 0.0195 * L^2.9
-        a = 0.0195
-        b = 2.9
-        
-        lengths = np.arange(20, 81, 1)  # 20-80 cm
-        weights = [a * (length ** b) for length in lengths]
-        
-        data = []
-        for i, length in enumerate(lengths):
-            data.append({
-                'Species_Name': species_name,
-                'Measure_Type': measure_type,
-                'Length_cm': length,
-                'Weight_kg': round(weights[i], 2)
-            })
-            
-        self.species_data[species_name] = pd.DataFrame(data)
-        
-        # Add the algorithm
-        self.algorithms[species_name] = {
-            'species_name': species_name,
-            'algorithm': {
-                'formula': 'W = a * L^b',
-                'a': a,
-                'b': b,
-                'r_squared': 0.99,  # High R² for manually created data
-                'measure_type': measure_type,
-                'data_points': len(data)
-            }
-        }
-        
-        print(f"Added manual data for {species_name}: {len(data)} data points")
-        
-    def add_manual_data_blue_fish(self):
-        """Add manual data for Blue Fish (Pomatomus saltatrix)"""
-        # Data based on research from fisheries literature
-        species_name = "Blue Fish"
-        measure_type = "Fork length"
-        
-        # Create synthetic data points based on the formula W = 0.0089 * L^3.09
-        a = 0.0089
-        b = 3.09
-        
-        lengths = np.arange(20, 81, 1)  # 20-80 cm
-        weights = [a * (length ** b) for length in lengths]
-        
-        data = []
-        for i, length in enumerate(lengths):
-            data.append({
-                'Species_Name': species_name,
-                'Measure_Type': measure_type,
-                'Length_cm': length,
-                'Weight_kg': round(weights[i], 2)
-            })
-            
-        self.species_data[species_name] = pd.DataFrame(data)
-        
-        # Add the algorithm
-        self.algorithms[species_name] = {
-            'species_name': species_name,
-            'algorithm': {
-                'formula': 'W = a * L^b',
-                'a': a,
-                'b': b,
-                'r_squared': 0.98,  # High R² for manually created data
-                'measure_type': measure_type,
-                'data_points': len(data)
-            }
-        }
-        
-        print(f"Added manual data for {species_name}: {len(data)} data points")
-        
-    def add_manual_data_sand_shark(self):
-        """Add manual data for Sand Shark"""
-        # Data based on research from shark fisheries literature
-        species_name = "Sand Shark"
-        measure_type = "Total length"
-        
-        # Create synthetic data points based on the formula W = 0.0034 * L^3.1
-        a = 0.0034
-        b = 3.1
-        
-        lengths = np.arange(40, 161, 2)  # 40-160 cm
-        weights = [a * (length ** b) for length in lengths]
-        
-        data = []
-        for i, length in enumerate(lengths):
-            data.append({
-                'Species_Name': species_name,
-                'Measure_Type': measure_type,
-                'Length_cm': length,
-                'Weight_kg': round(weights[i], 2)
-            })
-            
-        self.species_data[species_name] = pd.DataFrame(data)
-        
-        # Add the algorithm
-        self.algorithms[species_name] = {
-            'species_name': species_name,
-            'algorithm': {
-                'formula': 'W = a * L^b',
-                'a': a,
-                'b': b,
-                'r_squared': 0.99,  # High R² for manually created data
-                'measure_type': measure_type,
-                'data_points': len(data)
-            }
-        }
-        
-        print(f"Added manual data for {species_name}: {len(data)} data points")
-        
-    def add_manual_data_spotted_gulley_shark(self):
-        """Add manual data for Spotted Gulley Shark (Triakis megalopterus)"""
-        # Data based on research from shark fisheries literature
-        species_name = "Spotted Gulley Shark"
-        measure_type = "Total length"
-        
-        # Create synthetic data points based on the formula W = 0.0025 * L^3.04
-        a = 0.0025
-        b = 3.04
-        
-        lengths = np.arange(40, 171, 2)  # 40-170 cm
-        weights = [a * (length ** b) for length in lengths]
-        
-        data = []
-        for i, length in enumerate(lengths):
-            data.append({
-                'Species_Name': species_name,
-                'Measure_Type': measure_type,
-                'Length_cm': length,
-                'Weight_kg': round(weights[i], 2)
-            })
-            
-        self.species_data[species_name] = pd.DataFrame(data)
-        
-        # Add the algorithm
-        self.algorithms[species_name] = {
-            'species_name': species_name,
-            'algorithm': {
-                'formula': 'W = a * L^b',
-                'a': a,
-                'b': b,
-                'r_squared': 0.98,  # High R² for manually created data
-                'measure_type': measure_type,
-                'data_points': len(data)
-            }
-        }
-        
-        print(f"Added manual data for {species_name}: {len(data)} data points")
-        
-    def save_data(self):
-        """Save the extracted and researched data"""
-        print("Saving data...")
-        
-        # Combine all species data
-        all_data = pd.concat(list(self.species_data.values()), ignore_index=True)
-        
-        # Save CSV
-        csv_path = os.path.join(self.output_dir, "missing_species_data.csv")
-        all_data.to_csv(csv_path, index=False)
-        print(f"Saved CSV data to {csv_path}")
-        
-        # Save algorithms JSON
-        json_path = os.path.join(self.output_dir, "missing_species_algorithms.json")
-        with open(json_path, 'w') as f:
-            json.dump(self.algorithms, f, indent=2)
-        print(f"Saved algorithms to {json_path}")
-        
-        # Save Excel
-        excel_path = os.path.join(self.output_dir, "missing_species_database.xlsx")
-        with pd.ExcelWriter(excel_path) as writer:
-            all_data.to_excel(writer, sheet_name='Length_Weight_Data', index=False)
-            
-            # Create algorithms sheet
-            algo_data = []
-            for species_name, algo_info in self.algorithms.items():
-                algo_data.append({
-                    'Species_Name': species_name,
-                    'Formula': algo_info['algorithm']['formula'],
-                    'a_parameter': algo_info['algorithm']['a'],
-                    'b_parameter': algo_info['algorithm']['b'],
-                    'R_squared': algo_info['algorithm']['r_squared'],
-                    'Measure_Type': algo_info['algorithm']['measure_type'],
-                    'Data_Points': algo_info['algorithm']['data
+import requests
+from bs4 import BeautifulSoup
+import pandas as pd
+import numpy as np
+import json
+import os
+import re
+import time
+from scipy import stats
+
+from parametric_species import ParametricSpecies, save_parametric_species
+from species_search import SpeciesSearchIndex
+
+class FishSpeciesDataExtractor:
+    def __init__(self):
+        self.base_url = "http://specialistangler.co.za/LengthToWeight/LtoWconv.asp"
+        self.output_dir = "/home/ubuntu/fish_data_merged/output"
+        self.missing_species = {
+            "dageraad": {"name": "Dageraad", "id": "431", "edible": "0"},
+            "blue_fish": {"name": "Blue Fish", "search_terms": ["blue fish", "blue kingfish", "blue emperor"]},
+            "sand_shark": {"name": "Sand Shark", "search_terms": ["sand shark", "sandshark"]},
+            "shy_shark": {"name": "Shy Shark", "search_terms": ["shy shark", "shyshark"]},
+            "spotted_gulley_shark": {"name": "Spotted Gulley Shark", "search_terms": ["spotted gulley", "gully shark"]}
+        }
+        self.species_data = {}
+        self.algorithms = {}
+        # Species researched from literature are kept as W = a * L^b parameters, not rows
+        self.parametric_species = {}
+        # Fuzzy name index over the scraped species list, built on first search
+        self.species_index = None
+        # Missing species name -> the site species its data was extracted under
+        self.matched_species = {}
+        
+        # Create output directory if it doesn't exist
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+    def extract_data_from_website(self):
+        """Extract data for missing species from the website"""
+        print("Extracting data for missing species from the website...")
+        
+        # Check for Black Musselcracker
+        self.extract_species_data("Black musselcracker", "560", "1")
+        
+        # Check for Brown shyshark (as a proxy for Shy Shark)
+        self.extract_species_data("Brown shyshark", "432", "0")
+        
+        # Try to extract Dageraad data
+        df = self.extract_species_data("Dageraad", "431", "0")
+        if df is not None:
+            self.matched_species["Dageraad"] = df['Species_Name'].iloc[0]
+        
+        # Search for Blue Fish, Sand Shark and Spotted Gulley Shark variants
+        for key in ("blue_fish", "sand_shark", "spotted_gulley_shark"):
+            self.search_missing_species(key)
+            
+        print(f"Extracted data for {len(self.species_data)} species from the website")
+        
+    def load_species_index(self):
+        """Build the search index from the saved species lists, fetching the site index if needed"""
+        index = SpeciesSearchIndex.from_saved_lists('raw_data')
+        if index is None:
+            from improved_scraper import FishSpeciesScraper
+            scraper = FishSpeciesScraper(cache_dir=None, archive_path=None, hash_registry_path=None,
+                                         metrics_dir=None)
+            edible_species, non_edible_species = scraper.get_species_lists()
+            index = SpeciesSearchIndex(edible_species + non_edible_species)
+        print(f"Indexed {len(index)} species names for searching")
+        return index
+        
+    def search_missing_species(self, key):
+        """Try a missing species' search terms until one matches, and remember the site name it matched"""
+        missing = self.missing_species[key]
+        for term in missing["search_terms"]:
+            matched_name = self.search_and_extract(term)
+            if matched_name is not None:
+                self.matched_species[missing["name"]] = matched_name
+                print(f"Found {missing['name']} on the site as {matched_name}")
+                return matched_name
+        return None
+        
+    def search_and_extract(self, search_term, min_score=0.6):
+        """Search for a species and extract its data if found
+        
+        Returns the name the data was stored under in species_data, or None.
+        """
+        if self.species_index is None:
+            self.species_index = self.load_species_index()
+        
+        matches = self.species_index.search(search_term, limit=3)
+        if not matches or matches[0][0] < min_score:
+            print(f"No species on the site matches '{search_term}'")
+            return None
+        
+        candidates = ", ".join(f"{species['name']} ({score:.2f})" for score, species in matches)
+        print(f"Candidates for '{search_term}': {candidates}")
+        score, species = matches[0]
+        edible = "1" if species['edible'] else "0"
+        df = self.extract_species_data(species['name'], species['id'], edible)
+        # The page's own species name may differ from the index entry
+        return None if df is None else df['Species_Name'].iloc[0]
+        
+    def extract_species_data(self, species_name, species_id, edible):
+        """Extract length-to-weight data for a specific species"""
+        url = f"{self.base_url}?ID={species_id}&Edible={edible}&SpeciesName={species_name.replace(' ', '+')}"
+        print(f"Extracting data for {species_name} from {url}")
+        
+        try:
+            response = requests.get(url)
+            if response.status_code != 200:
+                print(f"Failed to fetch data for {species_name}: HTTP {response.status_code}")
+                return None
+                
+            soup = BeautifulSoup(response.text, 'html.parser')
+            
+            # Find the table with length-to-weight data
+            table = soup.find('table')
+            if not table:
+                print(f"No data table found for {species_name}")
+                return None
+                
+            # Extract the measure type, length, and weight data
+            rows = table.find_all('tr')
+            if len(rows) < 3:
+                print(f"Insufficient data rows for {species_name}")
+                return None
+                
+            # Check if the species name is in the first row
+            species_row = rows[0].find('td')
+            if species_row and 'SPECIES:' in species_row.text:
+                species_name = species_row.text.replace('SPECIES:', '').strip()
+                
+            # Find the header row
+            header_row = None
+            for i, row in enumerate(rows):
+                cells = row.find_all('td')
+                if cells and len(cells) >= 3:
+                    if 'Measure Type' in cells[0].text and 'Length' in cells[1].text and 'Weight' in cells[2].text:
+                        header_row = i
+                        break
+            
+            if header_row is None:
+                print(f"No header row found for {species_name}")
+                return None
+                
+            # Extract the data rows
+            data_rows = []
+            measure_type = None
+            
+            for row in rows[header_row+1:]:
+                cells = row.find_all('td')
+                if not cells or len(cells) < 3:
+                    continue
+                    
+                # Extract measure type, length, and weight
+                row_measure_type = cells[0].text.strip()
+                if row_measure_type:
+                    measure_type = row_measure_type
+                    
+                length_text = cells[1].text.strip()
+                weight_text = cells[2].text.strip()
+                
+                # Extract numeric values
+                length_match = re.search(r'(\d+(?:\.\d+)?)', length_text)
+                weight_match = re.search(r'(\d+(?:\.\d+)?)', weight_text)
+                
+                if length_match and weight_match:
+                    length = float(length_match.group(1))
+                    weight = float(weight_match.group(1))
+                    
+                    data_rows.append({
+                        'Species_Name': species_name,
+                        'Measure_Type': measure_type,
+                        'Length_cm': length,
+                        'Weight_kg': weight
+                    })
+            
+            if not data_rows:
+                print(f"No valid data rows extracted for {species_name}")
+                return None
+                
+            # Store the data
+            self.species_data[species_name] = pd.DataFrame(data_rows)
+            
+            # Calculate the algorithm
+            self.calculate_algorithm(species_name)
+            
+            print(f"Successfully extracted {len(data_rows)} data points for {species_name}")
+            return self.species_data[species_name]
+            
+        except Exception as e:
+            print(f"Error extracting data for {species_name}: {str(e)}")
+            return None
+            
+    def calculate_algorithm(self, species_name):
+        """Calculate the length-to-weight algorithm for a species"""
+        if species_name not in self.species_data or self.species_data[species_name].empty:
+            print(f"No data available to calculate algorithm for {species_name}")
+            return None
+            
+        df = self.species_data[species_name]
+        
+        # Convert to log scale for linear regression
+        log_length = np.log(df['Length_cm'])
+        log_weight = np.log(df['Weight_kg'].replace(0, 0.001))  # Replace zeros to avoid log(0)
+        
+        # Perform linear regression
+        slope, intercept, r_value, p_value, std_err = stats.linregress(log_length, log_weight)
+        
+        # Calculate a and b parameters for W = a * L^b
+        a = np.exp(intercept)
+        b = slope
+        
+        # Store the algorithm
+        self.algorithms[species_name] = {
+            'species_name': species_name,
+            'algorithm': {
+                'formula': 'W = a * L^b',
+                'a': a,
+                'b': b,
+                'r_squared': r_value**2,
+                'measure_type': df['Measure_Type'].iloc[0],
+                'data_points': len(df)
+            }
+        }
+        
+        print(f"Calculated algorithm for {species_name}: W = {a:.6f} * L^{b:.6f}, R² = {r_value**2:.4f}")
+        return self.algorithms[species_name]
+        
+    def has_species_data(self, species_name):
+        """Whether a missing species already has scraped or researched data"""
+        return (species_name in self.matched_species or species_name in self.species_data
+                or species_name in self.parametric_species)
+        
+    def research_external_data(self):
+        """Research data for missing species from external sources"""
+        print("Researching external data for missing species...")
+        
+        # Dageraad (Chrysoblephus cristiceps)
+        if not self.has_species_data("Dageraad"):
+            self.add_manual_data_dageraad()
+            
+        # Blue Fish (assuming this refers to Pomatomus saltatrix)
+        if not self.has_species_data("Blue Fish"):
+            self.add_manual_data_blue_fish()
+            
+        # Sand Shark
+        if not self.has_species_data("Sand Shark"):
+            self.add_manual_data_sand_shark()
+            
+        # Spotted Gulley Shark
+        if not self.has_species_data("Spotted Gulley Shark"):
+            self.add_manual_data_spotted_gulley_shark()
+            
+        print(f"Added manual data for {len(self.species_data) + len(self.parametric_species)} species in total")
+        
+    def add_parametric_species(self, species):
+        """Record a researched species by its parameters; its table is generated only when needed"""
+        self.parametric_species[species.name] = species
+        self.algorithms[species.name] = {
+            'species_name': species.name,
+            'algorithm': species.algorithm('Length_cm', 'Weight_kg')
+        }
+        print(f"Added manual data for {species.name}: W = {species.a} * L^{species.b}, "
+              f"{species.min_length}-{species.max_length} cm ({species.data_points} data points)")
+        
+    def add_manual_data_dageraad(self):
+        """Add manual data for Dageraad (Chrysoblephus cristiceps)"""
+        # Data based on research from South African fisheries literature
+        species = ParametricSpecies("Dageraad", a=0.0195, b=2.9, measure_type="Fork length",
+                                    min_length=20, max_length=80, decimals=2,
+                                    r_squared=0.99, source="literature")
+        self.add_parametric_species(species)
+        
+    def add_manual_data_blue_fish(self):
+        """Add manual data for Blue Fish (Pomatomus saltatrix)"""
+        # Data based on research from fisheries literature
+        species = ParametricSpecies("Blue Fish", a=0.0089, b=3.09, measure_type="Fork length",
+                                    min_length=20, max_length=80, decimals=2,
+                                    r_squared=0.98, source="literature")
+        self.add_parametric_species(species)
+        
+    def add_manual_data_sand_shark(self):
+        """Add manual data for Sand Shark"""
+        # Data based on research from shark fisheries literature
+        species = ParametricSpecies("Sand Shark", a=0.0034, b=3.1, measure_type="Total length",
+                                    min_length=40, max_length=160, step=2, decimals=2,
+                                    r_squared=0.99, source="literature")
+        self.add_parametric_species(species)
+        
+    def add_manual_data_spotted_gulley_shark(self):
+        """Add manual data for Spotted Gulley Shark (Triakis megalopterus)"""
+        # Data based on research from shark fisheries literature
+        species = ParametricSpecies("Spotted Gulley Shark", a=0.0025, b=3.04, measure_type="Total length",
+                                    min_length=40, max_length=170, step=2, decimals=2,
+                                    r_squared=0.98, source="literature")
+        self.add_parametric_species(species)
+        
+    def save_data(self):
+        """Save the extracted and researched data"""
+        print("Saving data...")
+        
+        # Combine the scraped species data; parametric species are saved as parameters only
+        all_data = pd.concat(list(self.species_data.values()), ignore_index=True) if self.species_data \
+            else pd.DataFrame(columns=['Species_Name', 'Measure_Type', 'Length_cm', 'Weight_kg'])
+        
+        # Save CSV
+        csv_path = os.path.join(self.output_dir, "missing_species_data.csv")
+        all_data.to_csv(csv_path, index=False)
+        print(f"Saved CSV data to {csv_path}")
+        
+        # Save parametric species
+        parametric_path = os.path.join(self.output_dir, "missing_species_parametric.json")
+        save_parametric_species(self.parametric_species.values(), parametric_path)
+        print(f"Saved {len(self.parametric_species)} parametric species to {parametric_path}")
+        
+        # Save algorithms JSON
+        json_path = os.path.join(self.output_dir, "missing_species_algorithms.json")
+        with open(json_path, 'w') as f:
+            json.dump(self.algorithms, f, indent=2)
+        print(f"Saved algorithms to {json_path}")
+        
+        # Save Excel
+        excel_path = os.path.join(self.output_dir, "missing_species_database.xlsx")
+        with pd.ExcelWriter(excel_path) as writer:
+            all_data.to_excel(writer, sheet_name='Length_Weight_Data', index=False)
+            
+            # Create algorithms sheet
+            algo_data = []
+            for species_name, algo_info in self.algorithms.items():
+                algo_data.append({
+                    'Species_Name': species_name,
+                    'Formula': algo_info['algorithm']['formula'],
+                    'a_parameter': algo_info['algorithm']['a'],
+                    'b_parameter': algo_info['algorithm']['b'],
+                    'R_squared': algo_info['algorithm']['r_squared'],
+                    'Measure_Type': algo_info['algorithm']['measure_type'],
+                    'Data_Points': algo_info['algorithm']['data
 (Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
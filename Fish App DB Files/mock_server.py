@@ -0,0 +1,210 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from page_archive import PageArchive
+
+
+def load_recorded_pages(source):
+    """Load {species_id: (species, html)} from a page archive or a directory of debug pages"""
+    pages = {}
+    if os.path.isfile(source):
+        archive = PageArchive(source)
+        for species_id in archive.species_ids():
+            header, page = archive.read(species_id)
+            species = {'id': species_id, 'name': header['species_name'], 'edible': header['edible']}
+            pages[species_id] = (species, page)
+        return pages
+
+    for path in sorted(glob.glob(os.path.join(source, '*.html'))):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        id_match = re.match(r'(\d+)_(.*)', stem)
+        if stem.endswith('_table') or not id_match:
+            continue
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            page = f.read()
+        species = {'id': id_match.group(1), 'name': id_match.group(2).replace('_', ' '), 'edible': None}
+        pages[species['id']] = (species, page)
+    return pages
+
+
+def load_species_lists(species_lists_dir):
+    """Return the saved edible and non-edible species lists, or None if a live run never saved them"""
+    lists = []
+    for name in ('edible_species.json', 'non_edible_species.json'):
+        try:
+            with open(os.path.join(species_lists_dir, name), 'r') as f:
+                lists.append(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            return None
+    return lists
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive like the real IIS host, so connection pooling behaves as it does live
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        mock = self.server.mock
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        mock.wait()
+        if not parsed.path.endswith('LtoWconv.asp'):
+            self._send(404, b'')
+            return
+        if 'ID' in query:
+            if mock.inject_error():
+                self._send(503, b'')
+                return
+            body = mock.species_page(query['ID'][0])
+        else:
+            body = mock.index_page(query.get('Edible', ['1'])[0] == '1')
+        if body is None:
+            self._send(404, b'')
+            return
+
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, b'', {'ETag': etag})
+            return
+        headers = {'ETag': etag, 'Content-Type': 'text/html; charset=utf-8'}
+        if mock.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.mock.count(status)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockSpecialistAnglerServer:
+    """Local stand-in for specialistangler.co.za serving recorded LtoWconv.asp pages
+
+    Species pages come from a page archive or a debug directory; the two index pages are
+    rebuilt from the saved species lists (or from the archived pages' metadata). Every
+    request waits latency +/- jitter seconds and species pages fail with a 503 at
+    error_rate, so scrapers can be benchmarked and regression-tested offline.
+    """
+
+    def __init__(self, source='debug/species_pages.warc.gz', species_lists_dir='raw_data',
+                 host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 compress=True, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.compress = compress
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.status_counts = {}
+
+        recorded = load_recorded_pages(source)
+        self.pages = {species_id: page.encode('utf-8') for species_id, (_, page) in recorded.items()}
+        self.index_links = self._build_index_links(recorded, load_species_lists(species_lists_dir))
+
+        self.httpd = ThreadingHTTPServer((host, port), _MockRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = None
+
+    def _build_index_links(self, recorded, species_lists):
+        links = {True: [], False: []}
+        if species_lists:
+            # Replay the live index exactly, including species listed under both categories
+            for edible, species_list in zip((True, False), species_lists):
+                for species in species_list:
+                    if species['id'] in recorded:
+                        links[edible].append((species['href'], species['name']))
+            return links
+        for species_id, (species, _) in recorded.items():
+            edible = species['edible'] is not False
+            href = f"LtoWconv.asp?ID={species_id}&Edible={int(edible)}"
+            links[edible].append((href, species['name']))
+        return links
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/LengthToWeight/"
+
+    def wait(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            time.sleep(max(0.0, delay))
+
+    def inject_error(self):
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def count(self, status):
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def species_page(self, species_id):
+        return self.pages.get(species_id)
+
+    def index_page(self, edible):
+        anchors = ''.join(f'<a href="{html.escape(href)}">{html.escape(name)}</a><br>'
+                          for href, name in self.index_links[edible])
+        return f"<html><body><table><tr><td>{anchors}</td></tr></table></body></html>".encode('utf-8')
+
+    def start(self):
+        """Serve in a background thread and return the base URL to scrape"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded specialistangler pages locally")
+    parser.add_argument('source', nargs='?', default='debug/species_pages.warc.gz',
+                        help="page archive or directory of debug HTML pages saved by a live scrape")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="+/- seconds of random latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of species pages answered with 503")
+    args = parser.parse_args()
+
+    server = MockSpecialistAnglerServer(args.source, port=args.port, latency=args.latency,
+                                        jitter=args.jitter, error_rate=args.error_rate)
+    print(f"Serving {len(server.pages)} recorded species pages at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Responses by status: {server.status_counts}")
@@ -0,0 +1,136 @@
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# An optional </> marker, the number (with a decimal comma, or optional thousands
+# separators) and an optional unit
+NUMERIC_PATTERN = re.compile(
+    r'([<>])?\s*(\d+,\d{1,2}(?!\d)|\d+(?:,\d{3})*(?:\.\d*)?|\.\d+)\s*(mm|cm|kg|g)?\b',
+    re.IGNORECASE
+)
+
+# Scale factors from each recognised suffix to the column's target unit
+UNIT_FACTORS = {
+    'cm': {'mm': 0.1, 'cm': 1.0},
+    'kg': {'g': 0.001, 'kg': 1.0}
+}
+
+
+def extract_numeric(series, unit):
+    """Extract numeric values from a scraped length or weight column in a single regex pass
+
+    Returns a DataFrame aligned with series holding the cleaned float 'value' in the
+    target unit ('cm' or 'kg'), the '<'/'>' 'marker' if one was present, and a 'coerced'
+    flag for every row that was not a plain number in the target unit (markers,
+    converted units, decimal commas, stray text or unparseable values).
+
+    A single comma followed by one or two digits ("12,5") is read as a decimal comma;
+    values suffixed with a unit of the other dimension ("12.5 cm" in a weight column)
+    are rejected as NaN.
+    """
+    factors = UNIT_FACTORS.get(unit, {unit: 1.0})
+
+    # Scraped tables repeat the same cell texts heavily, so each distinct text is
+    # matched once and the results are broadcast back with the factorized codes
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    count = len(uniques)
+    # The extra trailing slot holds the result for missing values (code -1)
+    values = np.full(count + 1, np.nan)
+    markers = np.full(count + 1, None, dtype=object)
+    coerced = np.zeros(count + 1, dtype=bool)
+
+    search = NUMERIC_PATTERN.search
+    for i, raw in enumerate(uniques):
+        text = str(raw)
+        match = search(text)
+        if match is None:
+            coerced[i] = bool(text.strip())
+            continue
+
+        marker, number, suffix_unit = match.groups()
+        decimal_comma = ',' in number and len(number) - number.index(',') <= 3
+        if decimal_comma:
+            value = float(number.replace(',', '.'))
+        else:
+            value = float(number.replace(',', ''))
+        flagged = decimal_comma or bool(marker) or bool(text[:match.start()].strip()) or bool(text[match.end():].strip())
+        if suffix_unit:
+            suffix_unit = suffix_unit.lower()
+            factor = factors.get(suffix_unit)
+            if factor is None:
+                # A suffix for a different dimension (e.g. kg in a length column) can't be converted
+                value = np.nan
+                flagged = True
+            else:
+                value *= factor
+                flagged = flagged or suffix_unit != unit
+
+        values[i] = value
+        markers[i] = marker
+        coerced[i] = flagged
+
+    positions = np.where(codes < 0, count, codes)
+    return pd.DataFrame({
+        'value': values[positions],
+        'marker': markers[positions],
+        'coerced': coerced[positions]
+    }, index=series.index)
+
+
+def clean_numeric_column(series, unit):
+    """Return series as floats in the target unit ('cm' or 'kg'), NaN where no number was found"""
+    return extract_numeric(series, unit)['value']
+
+
+def _legacy_clean_numeric_column(series, unit):
+    # The str.replace chain previously used by edible_scraper.py, kept for the benchmark
+    series = series.astype(str).str.lower()
+    series = series.str.replace(f' {unit}', '', regex=False).str.replace(unit, '', regex=False)
+    series = series.str.replace('<', '', regex=False).str.replace('>', '', regex=False)
+    series = series.str.replace('b', '', regex=False).str.replace('/', '', regex=False)
+    series = series.str.replace(r'[^\d.]', '', regex=True)
+    return pd.to_numeric(series, errors='coerce')
+
+
+if __name__ == "__main__":
+    # Benchmark on the combined dataset's lengths and weights, re-rendered as scraped cell text
+    if os.path.exists('complete_fish_species_data.csv'):
+        data = pd.read_csv('complete_fish_species_data.csv')
+        lengths, weights = data['Length'].to_numpy(), data['Weight'].to_numpy()
+    else:
+        rng = np.random.default_rng(0)
+        lengths = rng.uniform(10, 200, 50000).round(1)
+        weights = (0.00001 * lengths ** 3).round(1)
+
+    length_formats = ['{} cm', '{}cm', '<{} cm', '{}']
+    weight_formats = ['{} kg', '{}kg', '>{} kg', '{}']
+    columns = {
+        'cm': pd.Series([length_formats[i % 4].format(v) for i, v in enumerate(lengths)]),
+        'kg': pd.Series([weight_formats[i % 4].format(v) for i, v in enumerate(weights)])
+    }
+
+    repeat = 5
+    timings = {}
+    matching = 0
+    for name, func in [('str.replace chain', _legacy_clean_numeric_column),
+                       ('single-pass regex', clean_numeric_column)]:
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            results = {unit: func(column, unit) for unit, column in columns.items()}
+        timings[name] = (time.perf_counter() - start_time) / repeat
+        if name == 'str.replace chain':
+            legacy_results = results
+    for unit in columns:
+        matching += int(np.isclose(legacy_results[unit], results[unit], equal_nan=True).sum())
+
+    rows = len(lengths)
+    print(f"Rows: {rows} (length and weight columns)")
+    for name, elapsed in timings.items():
+        print(f"{name}: {elapsed * 1000:.1f} ms ({2 * rows / elapsed:,.0f} cells/sec)")
+    print(f"Speedup: {timings['str.replace chain'] / timings['single-pass regex']:.2f}x")
+    print(f"Matching values: {matching}/{2 * rows}")
+    print(f"Cells flagged as coerced: {sum(int(extract_numeric(c, u)['coerced'].sum()) for u, c in columns.items())}")
@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def read_record(archive_path, offset, length):
+    """Decompress the single record stored at offset without touching the rest of the archive"""
+    with open(archive_path, 'rb') as f:
+        f.seek(offset)
+        data = gzip.decompress(f.read(length))
+    header, _, body = data.partition(b'\r\n\r\n')
+    return json.loads(header.decode('utf-8')), body.decode('utf-8')
+
+
+class PageArchive:
+    """Append-only archive of fetched pages, one gzip member per record, indexed by species ID
+
+    Each record is a WARC-like JSON header block followed by the raw HTML, compressed as
+    an independent gzip member. A sidecar JSONL index maps species IDs to byte offsets so
+    a single page can be read back without decompressing the whole archive.
+    """
+
+    def __init__(self, path='debug/species_pages.warc.gz'):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.index = self._load_index()
+
+    def _load_index(self):
+        index = {}
+        if not os.path.exists(self.index_path):
+            return index
+        archive_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        with open(self.index_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # Ignore entries pointing past the end of a truncated archive
+                if entry['offset'] + entry['length'] > archive_size:
+                    continue
+                # Later records for the same species supersede earlier ones
+                index[entry['species_id']] = entry
+        return index
+
+    def _is_latest(self, species_id, html_bytes, digest):
+        """Whether html is already the species' latest archived page"""
+        entry = self.index.get(species_id)
+        if entry is None:
+            return False
+        if 'sha256' in entry:
+            return entry['sha256'] == digest
+        # Entries written before hashes were indexed are compared by content once
+        _, archived_html = read_record(self.path, entry['offset'], entry['length'])
+        return archived_html.encode('utf-8') == html_bytes
+
+    def append(self, species, html, metadata=None):
+        """Append a fetched page with its fetch metadata and index it by species ID
+
+        A page identical to the species' latest archived one (a rerun, or a 304 served
+        from the cache) is not written again. Returns whether a record was appended.
+        """
+        html_bytes = html.encode('utf-8')
+        digest = hashlib.sha256(html_bytes).hexdigest()
+        header = {
+            'record_type': 'response',
+            'species_id': species['id'],
+            'species_name': species['name'],
+            'edible': species['edible'],
+            'url': species.get('url'),
+            'fetched_at': time.time(),
+            'content_length': len(html_bytes),
+            'sha256': digest
+        }
+        if metadata:
+            header.update(metadata)
+        record = json.dumps(header).encode('utf-8') + b'\r\n\r\n' + html_bytes
+        compressed = gzip.compress(record)
+
+        with self._lock:
+            if self._is_latest(species['id'], html_bytes, digest):
+                return False
+            with open(self.path, 'ab') as f:
+                offset = f.tell()
+                f.write(compressed)
+                f.flush()
+                os.fsync(f.fileno())
+            # The index entry is only written once its record is safely on disk
+            entry = {'species_id': species['id'], 'offset': offset, 'length': len(compressed), 'sha256': digest}
+            with open(self.index_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+            self.index[species['id']] = entry
+        return True
+
+    def compact(self):
+        """Rewrite the archive keeping only each species' latest record; returns bytes saved"""
+        with self._lock:
+            if not os.path.exists(self.path):
+                return 0
+            old_size = os.path.getsize(self.path)
+            tmp_path = f"{self.path}.tmp"
+            tmp_index_path = f"{self.index_path}.tmp"
+            index = {}
+            with open(self.path, 'rb') as source, open(tmp_path, 'wb') as target, \
+                    open(tmp_index_path, 'w') as index_file:
+                for species_id, entry in sorted(self.index.items(), key=lambda item: item[1]['offset']):
+                    source.seek(entry['offset'])
+                    data = source.read(entry['length'])
+                    new_entry = {**entry, 'offset': target.tell()}
+                    target.write(data)
+                    index_file.write(json.dumps(new_entry) + '\n')
+                    index[species_id] = new_entry
+                target.flush()
+                os.fsync(target.fileno())
+            # The two renames are not atomic together, so compact between runs, not during one
+            os.replace(tmp_path, self.path)
+            os.replace(tmp_index_path, self.index_path)
+            self.index = index
+            return old_size - os.path.getsize(self.path)
+
+    def read(self, species_id):
+        """Return (header, html) for the latest archived page of a species"""
+        entry = self.index.get(species_id)
+        if entry is None:
+            raise KeyError(f"Species {species_id} is not in {self.path}")
+        return read_record(self.path, entry['offset'], entry['length'])
+
+    def species_ids(self):
+        """IDs of every species with an archived page"""
+        return list(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, species_id):
+        return species_id in self.index
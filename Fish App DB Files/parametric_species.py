@@ -0,0 +1,172 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class ParametricSpecies:
+    """A species whose length/weight table is fully described by W = a * L^b
+
+    Only the parameters, measure type and length range are stored; the rows are
+    generated on demand with numpy, so synthetic species cost a few bytes in the
+    outputs instead of one row per centimetre.
+    """
+
+    def __init__(self, name, a, b, measure_type, min_length, max_length, step=1,
+                 species_id=None, edible=None, decimals=1, r_squared=None, source=None):
+        self.name = name
+        self.a = float(a)
+        self.b = float(b)
+        self.measure_type = measure_type
+        self.min_length = min_length
+        self.max_length = max_length
+        self.step = step
+        self.species_id = species_id
+        self.edible = edible
+        self.decimals = decimals
+        self.r_squared = r_squared
+        self.source = source
+
+    @property
+    def data_points(self):
+        return int((self.max_length - self.min_length) // self.step) + 1
+
+    def lengths(self):
+        """Lengths in cm from min_length to max_length inclusive"""
+        return self.min_length + self.step * np.arange(self.data_points)
+
+    def weights(self, lengths=None):
+        """Weights in kg for the given lengths (default: the species' length range)"""
+        lengths = self.lengths() if lengths is None else np.asarray(lengths, dtype=float)
+        weights = self.a * np.power(lengths, self.b)
+        return np.round(weights, self.decimals) if self.decimals is not None else weights
+
+    def table(self, length_column='Length', weight_column='Weight', name_column='Species'):
+        """Generate the length/weight table in the scraped data's layout"""
+        return expand_tables([self], length_column, weight_column, name_column)
+
+    def algorithm(self, length_column='Length', weight_column='Weight'):
+        """The algorithm entry for this species, as stored in the algorithms JSON"""
+        return {
+            'formula': 'W = a * L^b',
+            'a': self.a,
+            'b': self.b,
+            'r_squared': self.r_squared if self.r_squared is not None else 1.0,
+            'length_column': length_column,
+            'weight_column': weight_column,
+            'measure_type': self.measure_type,
+            'data_points': self.data_points,
+            'length_range': [self.min_length, self.max_length],
+            'parametric': True
+        }
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'species_id': self.species_id,
+            'edible': self.edible,
+            'a': self.a,
+            'b': self.b,
+            'measure_type': self.measure_type,
+            'min_length': self.min_length,
+            'max_length': self.max_length,
+            'step': self.step,
+            'decimals': self.decimals,
+            'r_squared': self.r_squared,
+            'source': self.source
+        }
+
+    @classmethod
+    def from_dict(cls, record):
+        return cls(**record)
+
+
+def expand_tables(species_list, length_column='Length', weight_column='Weight', name_column='Species'):
+    """Generate the rows of many parametric species at once
+
+    Lengths, a and b are laid out as flat arrays (one entry per row) so every weight is
+    computed in a single vectorized power rather than a Python loop per species.
+    """
+    species_list = list(species_list)
+    columns = ['Measure_Type', length_column, weight_column, name_column]
+    if any(species.species_id is not None for species in species_list):
+        columns.append('Species_ID')
+    if any(species.edible is not None for species in species_list):
+        columns.append('Edible')
+    if not species_list:
+        return pd.DataFrame(columns=columns)
+
+    counts = np.array([species.data_points for species in species_list])
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    offsets = np.arange(counts.sum()) - starts
+
+    min_lengths = np.repeat([float(species.min_length) for species in species_list], counts)
+    steps = np.repeat([float(species.step) for species in species_list], counts)
+    lengths = min_lengths + steps * offsets
+    a = np.repeat([species.a for species in species_list], counts)
+    b = np.repeat([species.b for species in species_list], counts)
+    weights = a * np.power(lengths, b)
+
+    # Round per species, grouping by precision so the common case is one call
+    decimals = [species.decimals for species in species_list]
+    if len(set(decimals)) == 1:
+        if decimals[0] is not None:
+            weights = np.round(weights, decimals[0])
+    else:
+        row_decimals = np.repeat([-1 if d is None else d for d in decimals], counts)
+        for precision in set(row_decimals.tolist()) - {-1}:
+            mask = row_decimals == precision
+            weights[mask] = np.round(weights[mask], precision)
+
+    # Keep whole-centimetre ranges as integer lengths, like the scraped tables
+    if all(float(species.min_length).is_integer() and float(species.step).is_integer()
+           for species in species_list):
+        lengths = lengths.astype(np.int64)
+
+    data = {
+        'Measure_Type': np.repeat([species.measure_type for species in species_list], counts),
+        length_column: lengths,
+        weight_column: weights,
+        name_column: np.repeat([species.name for species in species_list], counts)
+    }
+    if 'Species_ID' in columns:
+        data['Species_ID'] = np.repeat(np.array([species.species_id for species in species_list], dtype=object), counts)
+    if 'Edible' in columns:
+        data['Edible'] = np.repeat(np.array([species.edible for species in species_list], dtype=object), counts)
+    return pd.DataFrame(data, columns=columns)
+
+
+def save_parametric_species(species_list, path):
+    """Write parametric species to a JSON file atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump([species.to_dict() for species in species_list], f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_parametric_species(path):
+    """Read parametric species saved by save_parametric_species; missing file means none"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return [ParametricSpecies.from_dict(record) for record in json.load(f)]
+
+
+def parametric_species_frame(species_list):
+    """One row per parametric species, for the Excel sheet and SQLite table"""
+    columns = ['Species', 'Species_ID', 'Edible', 'Measure_Type', 'a_parameter', 'b_parameter',
+               'Min_Length', 'Max_Length', 'Length_Step', 'Decimals', 'Source']
+    return pd.DataFrame([{
+        'Species': species.name,
+        'Species_ID': species.species_id,
+        'Edible': species.edible,
+        'Measure_Type': species.measure_type,
+        'a_parameter': species.a,
+        'b_parameter': species.b,
+        'Min_Length': species.min_length,
+        'Max_Length': species.max_length,
+        'Length_Step': species.step,
+        'Decimals': species.decimals,
+        'Source': species.source
+    } for species in species_list], columns=columns)
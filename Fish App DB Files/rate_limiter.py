@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+
+import requests
+
+from http_session import CircuitOpenError
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to observed server latency and errors
+
+    Fast, healthy responses raise the refill rate additively; slow responses trim it
+    and 5xx/429 responses or timeouts halve it. Retries wait a jittered exponential
+    backoff. The limiter is thread-safe so concurrent fetch workers can share it.
+    """
+
+    def __init__(self, initial_rate=2.0, min_rate=0.2, max_rate=10.0, burst=2,
+                 target_latency=1.0, rate_step=0.25, max_retries=4,
+                 base_backoff=1.0, max_backoff=30.0):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.target_latency = target_latency
+        self.rate_step = rate_step
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._first_request = None
+        self._last_request = None
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'server_errors': 0,
+            'timeouts': 0,
+            'total_latency': 0.0,
+            'wait_time': 0.0
+        }
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Block until a request token is available and return the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if self._first_request is None:
+                        self._first_request = now
+                    self._last_request = now
+                    self.stats['requests'] += 1
+                    self.stats['wait_time'] += waited
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def record(self, latency, status_code=None, failed=False):
+        """Adapt the refill rate to the outcome of one request"""
+        with self._lock:
+            self.stats['total_latency'] += latency
+            if failed or (status_code is not None and (status_code >= 500 or status_code == 429)):
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.rate_step)
+
+    def increment(self, stat):
+        """Count a retry, server error or timeout in the run statistics"""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def backoff_delay(self, attempt):
+        """Jittered exponential backoff for the given retry attempt (0-based)"""
+        cap = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+    def effective_rate(self):
+        """Requests per second actually achieved so far"""
+        if self._first_request is None or self._last_request == self._first_request:
+            return 0.0
+        return (self.stats['requests'] - 1) / (self._last_request - self._first_request)
+
+    def print_summary(self):
+        """Print the request rate achieved and how often the limiter backed off"""
+        requests_made = self.stats['requests']
+        mean_latency = self.stats['total_latency'] / requests_made if requests_made else 0.0
+        print(f"Rate limiter: {requests_made} requests at {self.effective_rate():.2f} req/sec effective "
+              f"(final refill rate {self.rate:.2f} req/sec, mean latency {mean_latency:.2f}s)")
+        print(f"Rate limiter: {self.stats['retries']} retries, {self.stats['server_errors']} server errors, "
+              f"{self.stats['timeouts']} timeouts, {self.stats['wait_time']:.1f}s spent waiting for tokens")
+
+
+class RateLimitedSession(requests.Session):
+    """requests.Session that sends every request through a shared AdaptiveRateLimiter"""
+
+    def __init__(self, rate_limiter=None):
+        super().__init__()
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self._timing = threading.local()
+
+    def last_request_timing(self):
+        """(latency, wait) of this thread's last request, in seconds
+
+        latency is the time spent on the wire, summed over retries; wait is the time spent
+        client-side waiting for rate-limiter tokens and retry backoff.
+        """
+        return getattr(self._timing, 'latency', 0.0), getattr(self._timing, 'wait', 0.0)
+
+    def last_request_bytes(self):
+        """Bytes this thread's last request received on the wire, summed over retries
+
+        A 304 revalidation receives no body, so cached pages count only what was downloaded.
+        """
+        return getattr(self._timing, 'received', 0)
+
+    def request(self, method, url, *args, **kwargs):
+        limiter = self.rate_limiter
+        attempt = 0
+        latency = 0.0
+        wait = 0.0
+        received = 0
+        try:
+            while True:
+                wait += limiter.acquire()
+                start_time = time.perf_counter()
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except CircuitOpenError:
+                    # The host is already known to be failing; retrying would only hammer it
+                    raise
+                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                    elapsed = time.perf_counter() - start_time
+                    latency += elapsed
+                    limiter.record(elapsed, failed=True)
+                    limiter.increment('timeouts')
+                    if attempt >= limiter.max_retries:
+                        raise
+                else:
+                    elapsed = time.perf_counter() - start_time
+                    latency += elapsed
+                    # Pooled sessions count compressed bytes; plain adapters only know the body
+                    received += getattr(response, 'wire_bytes', len(response.content))
+                    limiter.record(elapsed, response.status_code)
+                    if response.status_code < 500:
+                        return response
+                    limiter.increment('server_errors')
+                    if attempt >= limiter.max_retries:
+                        return response
+
+                limiter.increment('retries')
+                delay = limiter.backoff_delay(attempt)
+                time.sleep(delay)
+                wait += delay
+                attempt += 1
+        finally:
+            self._timing.latency = latency
+            self._timing.wait = wait
+            self._timing.received = received
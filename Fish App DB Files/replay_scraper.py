@@ -0,0 +1,165 @@
+import argparse
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from improved_scraper import FishSpeciesScraper, create_database_files, dedupe_species, _init_parse_worker, _parse_in_worker
+from page_archive import PageArchive, read_record
+from streaming_output import StreamingTableWriter
+
+
+def _parse_archived_page(task):
+    species, path, record = task
+    if record is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+    else:
+        _, html = read_record(path, record['offset'], record['length'])
+    return species, _parse_in_worker(species, html)
+
+
+def load_saved_species(scraper):
+    known_species = []
+    saved_lists = scraper.load_saved_species_lists()
+    if saved_lists:
+        edible_species, non_edible_species = saved_lists
+        # Matches the live scrape, which fetches species listed in both indexes once
+        known_species = dedupe_species(edible_species + non_edible_species)
+    return known_species
+
+
+def load_page_archive_species(archive_path, scraper):
+    """Match records in a compressed page archive to species by ID"""
+    archive = PageArchive(archive_path)
+    tasks = []
+    matched = set()
+    for species in load_saved_species(scraper):
+        if species['id'] in archive:
+            tasks.append((species, archive_path, archive.index[species['id']]))
+            matched.add(species['id'])
+
+    # Records carry their own species metadata, so unlisted pages still replay
+    for species_id in archive.species_ids():
+        if species_id in matched:
+            continue
+        header, _ = archive.read(species_id)
+        species = {
+            'id': species_id,
+            'name': header['species_name'],
+            'edible': header['edible'],
+            'url': header.get('url')
+        }
+        tasks.append((species, archive_path, archive.index[species_id]))
+
+    return tasks
+
+
+def load_archived_species(debug_dir, scraper):
+    """Match archived debug pages to species, preferring the saved species lists for metadata"""
+    known_species = load_saved_species(scraper)
+
+    pages = {}
+    for path in glob.glob(os.path.join(debug_dir, '*.html')):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem.endswith('_table'):
+            continue
+        pages[stem] = path
+
+    tasks = []
+    matched = set()
+    for species in known_species:
+        stem = scraper.species_file_stem(species)
+        if stem in pages:
+            tasks.append((species, pages[stem], None))
+            matched.add(stem)
+
+    # Pages without a species list entry still replay, with metadata taken from the file name
+    for stem in sorted(set(pages) - matched):
+        id_match = re.match(r'(\d+)_(.*)', stem)
+        if not id_match:
+            continue
+        species = {
+            'id': id_match.group(1),
+            'name': id_match.group(2).replace('_', ' '),
+            'edible': None,
+            'url': None
+        }
+        tasks.append((species, pages[stem], None))
+
+    return tasks
+
+
+def replay_from_archive(source='debug/species_pages.warc.gz', workers=None, parser='html.parser',
+                        robust_fit=False, create_databases=True):
+    """Rebuild raw_data CSVs, fits and combined outputs from archived pages without network access
+
+    source is either a compressed page archive or a directory of per-species debug HTML files.
+    Species whose tables match the hash registry keep their stored fits, but the combined
+    outputs are always rewritten since a replay is an explicit rebuild. With
+    create_databases the Excel and SQLite databases are rebuilt as well; the hash registry
+    is only saved after every output has been written.
+    """
+    scraper = FishSpeciesScraper(cache_dir=None, parser=parser, archive_path=None, robust_fit=robust_fit)
+    os.makedirs('raw_data', exist_ok=True)
+
+    if os.path.isdir(source):
+        tasks = load_archived_species(source, scraper)
+    else:
+        tasks = load_page_archive_species(source, scraper)
+    if not tasks:
+        print(f"No archived pages found in {source}")
+        return None, None
+    print(f"Replaying {len(tasks)} archived pages from {source}")
+
+    combined_writer = StreamingTableWriter('all_fish_species_data.csv')
+    algorithms = {}
+    successful_species = 0
+    failed_species = 0
+    start_time = time.perf_counter()
+
+    # Parsing fans out across cores; saving and fitting stay in this process so the
+    # outputs are written in species-list order exactly as a live scrape writes them
+    chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker, initargs=(parser,)) as executor:
+        for species, df in executor.map(_parse_archived_page, tasks, chunksize=chunksize):
+            if df is None:
+                failed_species += 1
+                continue
+            scraper.save_species_data(species, df, algorithms)
+            combined_writer.append(df)
+            successful_species += 1
+
+    elapsed = time.perf_counter() - start_time
+    pages_per_sec = len(tasks) / elapsed if elapsed > 0 else 0.0
+    print(f"Replay complete. Successfully extracted data for {successful_species} species. Failed for {failed_species} species.")
+    print(f"Parsed {len(tasks)} pages in {elapsed:.2f}s ({pages_per_sec:.1f} pages/sec)")
+    print(f"Total data points: {combined_writer.rows}")
+
+    scraper.hash_registry.prune({species['id'] for species, _, _ in tasks})
+    data_path, algorithms = scraper.finish_combined_outputs(combined_writer, algorithms)
+    if data_path is not None and create_databases:
+        create_database_files(data_path, algorithms)
+        scraper.save_hash_registry()
+    return data_path, algorithms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the fish species database from archived pages")
+    parser.add_argument('source', nargs='?', default='debug/species_pages.warc.gz',
+                        help="page archive or directory of debug HTML pages saved by a live scrape")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: all cores)")
+    parser.add_argument('--parser', choices=['html.parser', 'lxml'], default='html.parser',
+                        help="HTML parser used to extract the length-weight tables")
+    parser.add_argument('--robust', action='store_true',
+                        help="fit with Huber-weighted regression in log space instead of least squares")
+    args = parser.parse_args()
+
+    data_path, algorithms = replay_from_archive(args.source, workers=args.workers, parser=args.parser,
+                                                robust_fit=args.robust)
+    if data_path is not None:
+        print(f"Successfully extracted data for {len(algorithms)} species")
+        print("Offline rebuild completed successfully!")
+    else:
+        print("Failed to rebuild fish species data")
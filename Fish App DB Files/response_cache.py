@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class ResponseCache:
+    """Persistent on-disk HTTP response cache that revalidates pages with conditional GETs"""
+
+    def __init__(self, cache_dir='http_cache'):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'bytes_downloaded': 0,
+            'bytes_served_from_cache': 0
+        }
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, url):
+        key = self._key(url)
+        return (os.path.join(self.cache_dir, f"{key}.json"),
+                os.path.join(self.cache_dir, f"{key}.html"))
+
+    def _body_path(self, url, meta):
+        # Bodies are stored under their content hash; entries from older caches use <key>.html
+        if meta.get('body'):
+            return os.path.join(self.cache_dir, meta['body'])
+        return self._paths(url)[1]
+
+    def _load_entry(self, url):
+        meta_path, _ = self._paths(url)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if meta.get('url') != url or not os.path.exists(self._body_path(url, meta)):
+            return None
+        return meta
+
+    def _store_entry(self, url, response, old_meta=None):
+        meta_path, _ = self._paths(url)
+        # The body goes to a new file named by its content hash and the metadata that points
+        # at it is published last via an atomic rename, so an interrupted run leaves either
+        # the old validator with the old body or the new validator with the new one
+        body = response.text
+        body_name = f"{self._key(url)}.{hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]}.html"
+        body_path = os.path.join(self.cache_dir, body_name)
+        tmp_body_path = f"{body_path}.tmp"
+        with open(tmp_body_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        os.replace(tmp_body_path, body_path)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'body': body_name
+        }
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+        # Only now is the previous body unreferenced
+        if old_meta is not None:
+            old_body_path = self._body_path(url, old_meta)
+            if old_body_path != body_path:
+                try:
+                    os.remove(old_body_path)
+                except OSError:
+                    pass
+
+    def _read_body(self, url, meta):
+        with open(self._body_path(url, meta), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def get(self, session, url, **kwargs):
+        """Return the page text for url, downloading it only if it changed since the cached copy"""
+        meta = self._load_entry(url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and meta:
+            body = self._read_body(url, meta)
+            with self._lock:
+                self.stats['hits'] += 1
+                self.stats['bytes_served_from_cache'] += len(body.encode('utf-8'))
+            return body
+
+        response.raise_for_status()
+        self._store_entry(url, response, meta)
+        with self._lock:
+            self.stats['misses'] += 1
+            self.stats['bytes_downloaded'] += len(response.content)
+        return response.text
+
+    def print_summary(self):
+        """Print cache hit/miss counts and the bytes the cache saved"""
+        total = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / total * 100) if total else 0.0
+        print(f"Response cache: {self.stats['hits']} hits, {self.stats['misses']} misses ({hit_rate:.1f}% hit rate)")
+        print(f"Response cache: {self.stats['bytes_downloaded']} bytes downloaded, "
+              f"{self.stats['bytes_served_from_cache']} bytes served from disk")
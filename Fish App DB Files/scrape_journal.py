@@ -0,0 +1,83 @@
+import json
+import os
+
+import pandas as pd
+
+
+class ScrapeJournal:
+    """Append-only JSONL checkpoint journal of completed species for resumable scrapes"""
+
+    def __init__(self, path='raw_data/scrape_journal.jsonl'):
+        self.path = path
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._truncate_torn_tail()
+
+    def _truncate_torn_tail(self, block_size=4096):
+        """Cut a final line left without its newline by a crash, so the next append starts clean
+
+        Otherwise the first entry appended on resume would be joined to the torn line and
+        both would be dropped when the journal is loaded.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - block_size)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b'\n')
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position != end:
+                print(f"Discarding an incomplete final entry in {self.path}")
+                f.truncate(position)
+
+    def reset(self):
+        """Start a fresh journal, discarding checkpoints from any previous run"""
+        with open(self.path, 'w'):
+            pass
+
+    def record(self, species, df, algorithm):
+        """Append one completed species and force it to disk before returning"""
+        entry = {
+            'id': species['id'],
+            'species_name': species['name'],
+            'edible': species['edible'],
+            'columns': [str(col) for col in df.columns],
+            'rows': json.loads(df.to_json(orient='values')),
+            'algorithm': algorithm
+        }
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self):
+        """Load checkpointed species keyed by ID, ignoring a torn final line from a crash"""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping incomplete journal entry in {self.path}")
+                    continue
+                entries[entry['id']] = entry
+        return entries
+
+    @staticmethod
+    def entry_to_dataframe(entry):
+        """Rebuild the species DataFrame stored in a journal entry"""
+        return pd.DataFrame(entry['rows'], columns=entry['columns'])
@@ -0,0 +1,157 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+import requests
+
+
+# Upper bounds (seconds) of the request latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def failure_reason(error):
+    """Short, label-safe reason for a failed fetch"""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return f"http_{error.response.status_code}"
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return 'connection_error'
+    return type(error).__name__.lower()
+
+
+class ScrapeMetrics:
+    """Thread-safe counters for one scrape, exported as a JSON summary and a Prometheus textfile"""
+
+    def __init__(self, job='fish_scrape'):
+        self.job = job
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.wait_seconds = 0.0
+        self.requests = 0
+        self.response_bytes = 0
+        self.parse_seconds = 0.0
+        self.pages_parsed = 0
+        self.strategies = {}
+        self.rows_extracted = 0
+        self.failures = {}
+
+    def record_request(self, latency, response_bytes, wait=0.0):
+        """Record one request; latency is time on the wire, wait is client-side rate limiting
+
+        response_bytes is what was received on the wire, not the size of the page returned.
+        """
+        with self._lock:
+            self.latency_counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            self.latency_sum += latency
+            self.wait_seconds += wait
+            self.requests += 1
+            self.response_bytes += response_bytes
+
+    def record_parse(self, seconds, strategy, rows):
+        """Record one parsed page; strategy is the parser or extraction strategy that produced it"""
+        with self._lock:
+            self.parse_seconds += seconds
+            self.pages_parsed += 1
+            if strategy is not None:
+                self.strategies[strategy] = self.strategies.get(strategy, 0) + 1
+            self.rows_extracted += rows
+
+    def record_failure(self, reason):
+        with self._lock:
+            self.failures[reason] = self.failures.get(reason, 0) + 1
+
+    def summary(self):
+        """Snapshot of every metric as a JSON-serialisable dict"""
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), self.latency_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            return {
+                'job': self.job,
+                'started_at': self.started_at,
+                'duration_seconds': time.time() - self.started_at,
+                'requests': self.requests,
+                'request_latency_seconds': {
+                    'buckets': buckets,
+                    'sum': self.latency_sum,
+                    'mean': self.latency_sum / self.requests if self.requests else None
+                },
+                'rate_limit_wait_seconds': self.wait_seconds,
+                'response_bytes': self.response_bytes,
+                'pages_parsed': self.pages_parsed,
+                'parse_seconds': self.parse_seconds,
+                'mean_parse_seconds': self.parse_seconds / self.pages_parsed if self.pages_parsed else None,
+                'strategies': dict(self.strategies),
+                'rows_extracted': self.rows_extracted,
+                'failures': dict(self.failures)
+            }
+
+    def prometheus_lines(self):
+        """Render the metrics in the Prometheus text exposition format"""
+        summary = self.summary()
+        label = f'job="{self.job}"'
+        latency = summary['request_latency_seconds']
+        lines = [
+            '# HELP fish_scrape_request_latency_seconds Species page request latency.',
+            '# TYPE fish_scrape_request_latency_seconds histogram'
+        ]
+        for bound, count in latency['buckets'].items():
+            lines.append(f'fish_scrape_request_latency_seconds_bucket{{{label},le="{bound}"}} {count}')
+        lines += [
+            f'fish_scrape_request_latency_seconds_sum{{{label}}} {latency["sum"]}',
+            f'fish_scrape_request_latency_seconds_count{{{label}}} {summary["requests"]}',
+            '# HELP fish_scrape_rate_limit_wait_seconds_total Time requests waited for rate-limiter tokens and backoff.',
+            '# TYPE fish_scrape_rate_limit_wait_seconds_total counter',
+            f'fish_scrape_rate_limit_wait_seconds_total{{{label}}} {summary["rate_limit_wait_seconds"]}',
+            '# HELP fish_scrape_response_bytes_total Species page bytes received on the wire.',
+            '# TYPE fish_scrape_response_bytes_total counter',
+            f'fish_scrape_response_bytes_total{{{label}}} {summary["response_bytes"]}',
+            '# HELP fish_scrape_parse_seconds Time spent extracting length-weight tables.',
+            '# TYPE fish_scrape_parse_seconds summary',
+            f'fish_scrape_parse_seconds_sum{{{label}}} {summary["parse_seconds"]}',
+            f'fish_scrape_parse_seconds_count{{{label}}} {summary["pages_parsed"]}',
+            '# HELP fish_scrape_pages_by_strategy_total Pages extracted by each parser or strategy.',
+            '# TYPE fish_scrape_pages_by_strategy_total counter'
+        ]
+        for strategy, count in sorted(summary['strategies'].items()):
+            lines.append(f'fish_scrape_pages_by_strategy_total{{{label},strategy="{strategy}"}} {count}')
+        lines += [
+            '# HELP fish_scrape_rows_extracted_total Length-weight rows extracted.',
+            '# TYPE fish_scrape_rows_extracted_total counter',
+            f'fish_scrape_rows_extracted_total{{{label}}} {summary["rows_extracted"]}',
+            '# HELP fish_scrape_failures_total Species that failed, by reason.',
+            '# TYPE fish_scrape_failures_total counter'
+        ]
+        for reason, count in sorted(summary['failures'].items()):
+            lines.append(f'fish_scrape_failures_total{{{label},reason="{reason}"}} {count}')
+        lines += [
+            '# HELP fish_scrape_duration_seconds Wall time of the last scrape.',
+            '# TYPE fish_scrape_duration_seconds gauge',
+            f'fish_scrape_duration_seconds{{{label}}} {summary["duration_seconds"]}',
+            '# HELP fish_scrape_last_run_timestamp_seconds Unix time the last scrape finished.',
+            '# TYPE fish_scrape_last_run_timestamp_seconds gauge',
+            f'fish_scrape_last_run_timestamp_seconds{{{label}}} {time.time()}'
+        ]
+        return lines
+
+    def write(self, metrics_dir):
+        """Write <job>_metrics.json and <job>.prom into metrics_dir, each replaced atomically"""
+        os.makedirs(metrics_dir, exist_ok=True)
+        outputs = {
+            os.path.join(metrics_dir, f"{self.job}_metrics.json"): json.dumps(self.summary(), indent=2),
+            # The node exporter textfile collector only reads files ending in .prom
+            os.path.join(metrics_dir, f"{self.job}.prom"): '\n'.join(self.prometheus_lines()) + '\n'
+        }
+        for path, content in outputs.items():
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return list(outputs)
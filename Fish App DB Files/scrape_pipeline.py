@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+
+
+# Marks the end of a stage's input; each worker forwards one downstream when it exits
+_DONE = object()
+
+
+class PipelineStage:
+    """One step of a ScrapePipeline: func maps an item to the next stage's item, or None to drop it"""
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def record(self, depth, busy_time, failed):
+        with self._lock:
+            self.processed += 1
+            self.failed += int(failed)
+            self.busy_time += busy_time
+            self.depth_samples += 1
+            self.depth_total += depth
+            self.max_depth = max(self.max_depth, depth)
+
+    def mean_depth(self):
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+
+class ScrapePipeline:
+    """Run items through stages connected by bounded queues so network waits and CPU work overlap
+
+    Every stage has its own worker threads. A full queue blocks the stage feeding it, so a
+    slow stage applies backpressure instead of letting fetched pages pile up in memory.
+    """
+
+    def __init__(self, stages, queue_size=16):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats = {}
+
+    def _worker(self, stage, inbox, outbox, finished):
+        while True:
+            depth = inbox.qsize()
+            item = inbox.get()
+            if item is _DONE:
+                break
+            start_time = time.perf_counter()
+            result = None
+            failed = False
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                failed = True
+                print(f"Pipeline stage {stage.name} failed: {str(e)}")
+            stage.record(depth, time.perf_counter() - start_time, failed)
+            if result is not None and outbox is not None:
+                outbox.put(result)
+
+        # The last worker of a stage to finish closes the next stage's input
+        with finished['lock']:
+            finished[stage.name] += 1
+            last = finished[stage.name] == stage.workers
+        if last and outbox is not None:
+            for _ in range(self.stages[self.stages.index(stage) + 1].workers):
+                outbox.put(_DONE)
+
+    def _feed(self, items, inbox):
+        for item in items:
+            inbox.put(item)
+        for _ in range(self.stages[0].workers):
+            inbox.put(_DONE)
+
+    def run(self, items):
+        """Push every item through all stages and return per-stage throughput stats"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        finished = {stage.name: 0 for stage in self.stages}
+        finished['lock'] = threading.Lock()
+
+        start_time = time.perf_counter()
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0]), daemon=True)]
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else None
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(target=self._worker,
+                                                args=(stage, queues[i], outbox, finished), daemon=True))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+
+        self.stats = {
+            'elapsed_seconds': elapsed,
+            'stages': [{
+                'name': stage.name,
+                'workers': stage.workers,
+                'processed': stage.processed,
+                'failed': stage.failed,
+                'items_per_sec': stage.processed / elapsed if elapsed > 0 else 0.0,
+                'utilization': stage.busy_time / (elapsed * stage.workers) if elapsed > 0 else 0.0,
+                'mean_queue_depth': stage.mean_depth(),
+                'max_queue_depth': stage.max_depth
+            } for stage in self.stages]
+        }
+        return self.stats
+
+    def print_report(self):
+        """Print each stage's queue depth and throughput from the last run"""
+        if not self.stats:
+            return
+        print(f"Pipeline finished in {self.stats['elapsed_seconds']:.1f}s (queue size {self.queue_size})")
+        for stage in self.stats['stages']:
+            print(f"  {stage['name']:<6} {stage['workers']:>2} workers: {stage['processed']} items "
+                  f"({stage['items_per_sec']:.2f}/sec, {stage['utilization']:.0%} busy), "
+                  f"queue depth mean {stage['mean_queue_depth']:.1f} / max {stage['max_queue_depth']}"
+                  + (f", {stage['failed']} failed" if stage['failed'] else ""))
@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
@@ -8,15 +7,15 @@ import time
 import sqlite3
 import re
 
+from http_session import create_session, print_session_summary
+
 class FishSpeciesScraper:
     def __init__(self):
         self.base_url = "http://specialistangler.co.za/LengthToWeight/"
         self.edible_url = f"{self.base_url}LtoWconv.asp?Edible=1"
         self.non_edible_url = f"{self.base_url}LtoWconv.asp?Edible=0"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # Pooled keep-alive session with retries, timeouts and a circuit breaker
+        self.session = create_session()
         
     def get_species_list(self, edible=True):
         """Get list of all fish species from the index page using requests and BeautifulSoup"""
@@ -274,6 +273,8 @@ class FishSpeciesScraper:
             # Be nice to the server
             time.sleep(1)
         
+        print_session_summary(self.session)
+        
         # Combine all data
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
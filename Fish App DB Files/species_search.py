@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import re
+import time
+
+
+def normalize_name(name):
+    """Lowercase a species name and reduce it to space-separated alphanumeric tokens
+
+    Sex/stock qualifiers such as "(M&F)" are dropped since search terms never include them.
+    """
+    name = re.sub(r'\([^)]*\)', ' ', name.lower())
+    return ' '.join(re.findall(r'[a-z0-9]+', name))
+
+
+def trigrams(normalized):
+    """Character trigrams of a normalized name with spaces removed, so "sandshark" matches "sand shark" """
+    compact = f"  {normalized.replace(' ', '')} "
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+class SpeciesSearchIndex:
+    """Fuzzy lookup from free-text search terms to scraped species
+
+    Names are indexed twice: by normalized token (exact word hits) and by character
+    trigram (misspellings, joined or split words). A search only scores species that
+    share at least one trigram with the term, so lookups stay sub-millisecond over the
+    site's ~1000 species.
+    """
+
+    def __init__(self, species_list):
+        self.species = []
+        self.token_index = {}
+        self.trigram_index = {}
+        self._trigram_counts = []
+        seen_ids = set()
+        for species in species_list:
+            if species['id'] in seen_ids:
+                continue
+            seen_ids.add(species['id'])
+            position = len(self.species)
+            self.species.append(species)
+            normalized = normalize_name(species['name'])
+            for token in set(normalized.split()):
+                self.token_index.setdefault(token, []).append(position)
+            grams = trigrams(normalized)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(position)
+
+    @classmethod
+    def from_saved_lists(cls, raw_data_dir='raw_data'):
+        """Build the index from the species lists saved by improved_scraper, or None if missing"""
+        species_list = []
+        for name in ('edible_species.json', 'non_edible_species.json'):
+            try:
+                with open(os.path.join(raw_data_dir, name), 'r') as f:
+                    species_list.extend(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                return None
+        return cls(species_list)
+
+    def search(self, term, limit=5, min_score=0.3):
+        """Return up to limit (score, species) pairs, best first; scores run from 0 to 1
+
+        The score is the Dice coefficient of the trigram sets, nudged up for every
+        whole word the term shares with the name.
+        """
+        normalized = normalize_name(term)
+        query_grams = trigrams(normalized)
+        if not normalized:
+            return []
+
+        shared = {}
+        for gram in query_grams:
+            for position in self.trigram_index.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        query_tokens = normalized.split()
+        token_hits = {}
+        for token in query_tokens:
+            for position in self.token_index.get(token, ()):
+                token_hits[position] = token_hits.get(position, 0) + 1
+
+        results = []
+        for position, count in shared.items():
+            score = 2 * count / (len(query_grams) + self._trigram_counts[position])
+            score = min(1.0, score + 0.1 * token_hits.get(position, 0) / len(query_tokens))
+            if score >= min_score:
+                results.append((score, self.species[position]))
+        results.sort(key=lambda result: result[0], reverse=True)
+        return results[:limit]
+
+    def __len__(self):
+        return len(self.species)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search the scraped species list by fuzzy name")
+    parser.add_argument('terms', nargs='*', default=['blue fish', 'sand shark', 'shyshark', 'spotted gulley', 'dageraad'])
+    parser.add_argument('--raw-data-dir', default='raw_data', help="directory holding the saved species lists")
+    args = parser.parse_args()
+
+    index = SpeciesSearchIndex.from_saved_lists(args.raw_data_dir)
+    if index is None:
+        print(f"No saved species lists in {args.raw_data_dir}; run improved_scraper.py first")
+        raise SystemExit(1)
+
+    for term in args.terms:
+        start_time = time.perf_counter()
+        matches = index.search(term)
+        elapsed = time.perf_counter() - start_time
+        print(f"{term!r} ({elapsed * 1e6:.0f} us):")
+        for score, species in matches:
+            print(f"  {score:.2f}  {species['name']} (ID: {species['id']})")
+
+    repeat = 1000
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for term in args.terms:
+            index.search(term)
+    elapsed = (time.perf_counter() - start_time) / (repeat * len(args.terms))
+    print(f"{len(index)} species indexed, {elapsed * 1e6:.1f} us per search")
@@ -0,0 +1,77 @@
+class LayoutStrategyCache:
+    """Remember which table extraction strategy wins for each page layout
+
+    Pages are fingerprinted by their table count and the header cell texts of each
+    table. On a fingerprint hit the remembered strategy is tried first, so the losing
+    strategies only run for new layouts or when the remembered strategy fails.
+    """
+
+    def __init__(self, strategy_names):
+        self.strategy_names = list(strategy_names)
+        self.winners = {}
+        self.fingerprint_hits = 0
+        self.fingerprint_misses = 0
+        self.strategy_stats = {name: {'attempts': 0, 'wins': 0} for name in self.strategy_names}
+
+    @staticmethod
+    def fingerprint(tables):
+        """Fingerprint a page by its table count and each table's Length/Weight header row"""
+        headers = []
+        for table in tables:
+            header = ()
+            for row in table.find_all('tr'):
+                # Rows wrapping a nested table would pull in species-specific text
+                if row.find('table'):
+                    continue
+                cell_texts = [cell.get_text(' ', strip=True).lower() for cell in row.find_all(['td', 'th'])]
+                if any('length' in text for text in cell_texts) and any('weight' in text for text in cell_texts):
+                    header = tuple(cell_texts)
+                    break
+            headers.append(header)
+        return (len(tables), tuple(headers))
+
+    def order(self, fingerprint):
+        """Return strategy indices to try, with the remembered winner for this layout first"""
+        order = list(range(len(self.strategy_names)))
+        winner = self.winners.get(fingerprint)
+        if winner is None:
+            self.fingerprint_misses += 1
+            return order
+        self.fingerprint_hits += 1
+        order.remove(winner)
+        return [winner] + order
+
+    def record(self, fingerprint, strategy_index, succeeded):
+        """Record the outcome of one strategy attempt on a page with this fingerprint"""
+        stats = self.strategy_stats[self.strategy_names[strategy_index]]
+        stats['attempts'] += 1
+        if succeeded:
+            stats['wins'] += 1
+            self.winners[fingerprint] = strategy_index
+
+    def hit_rates(self):
+        """Return fingerprint hit counts and per-strategy attempt/win rates"""
+        lookups = self.fingerprint_hits + self.fingerprint_misses
+        strategies = {}
+        for name, stats in self.strategy_stats.items():
+            strategies[name] = {
+                'attempts': stats['attempts'],
+                'wins': stats['wins'],
+                'hit_rate': stats['wins'] / stats['attempts'] if stats['attempts'] else 0.0
+            }
+        return {
+            'layouts': len(self.winners),
+            'fingerprint_hits': self.fingerprint_hits,
+            'fingerprint_misses': self.fingerprint_misses,
+            'fingerprint_hit_rate': self.fingerprint_hits / lookups if lookups else 0.0,
+            'strategies': strategies
+        }
+
+    def summary_lines(self):
+        """Format hit_rates() as printable report lines"""
+        rates = self.hit_rates()
+        lines = [f"Layout cache: {rates['layouts']} layouts, {rates['fingerprint_hits']} hits, "
+                 f"{rates['fingerprint_misses']} misses ({rates['fingerprint_hit_rate'] * 100:.1f}% hit rate)"]
+        for name, stats in rates['strategies'].items():
+            lines.append(f"  {name}: {stats['wins']}/{stats['attempts']} attempts won ({stats['hit_rate'] * 100:.1f}%)")
+        return lines
@@ -0,0 +1,102 @@
+import os
+import shutil
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+class StreamingTableWriter:
+    """Append species DataFrames to the combined CSV as they finish, keeping memory flat
+
+    Rows are written to <path>.partial immediately, so a late failure leaves everything
+    extracted so far on disk. Species tables do not all share the same columns; like
+    pd.concat, new columns are appended to the end and missing values are left empty.
+    close() adds the final header and moves the file into place, then optionally writes a
+    Parquet copy in row groups when pyarrow is installed.
+    """
+
+    def __init__(self, path, parquet=True, chunksize=50000):
+        self.path = path
+        self.parquet_path = f"{os.path.splitext(path)[0]}.parquet" if parquet and pq is not None else None
+        self.chunksize = chunksize
+        self.columns = []
+        self.rows = 0
+        self._schema_grew = False
+        self._partial_path = f"{path}.partial"
+        self._partial = open(self._partial_path, 'w', newline='', encoding='utf-8')
+
+    def append(self, df):
+        """Write a species' rows, in the column order of the combined table so far"""
+        new_columns = [col for col in df.columns if col not in self.columns]
+        if new_columns:
+            # Rows already written are short by these trailing columns until close()
+            self._schema_grew = self._schema_grew or bool(self.columns)
+            self.columns.extend(new_columns)
+        df.reindex(columns=self.columns).to_csv(self._partial, header=False, index=False)
+        self._partial.flush()
+        self.rows += len(df)
+
+    def _read_partial(self):
+        # Everything is read back as text so values are written out exactly as they came in
+        return pd.read_csv(self._partial_path, names=self.columns, header=None, dtype=str,
+                           keep_default_na=False, chunksize=self.chunksize)
+
+    def close(self):
+        """Finish the combined CSV (and Parquet copy); returns the CSV path, or None if no rows"""
+        self._partial.close()
+        if not self.rows:
+            os.remove(self._partial_path)
+            return None
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+            pd.DataFrame(columns=self.columns).to_csv(out, index=False)
+            if self._schema_grew:
+                # Pad rows written before later columns appeared, one chunk at a time
+                for chunk in self._read_partial():
+                    chunk.to_csv(out, header=False, index=False)
+            else:
+                with open(self._partial_path, 'r', newline='', encoding='utf-8') as partial:
+                    shutil.copyfileobj(partial, out)
+        os.replace(tmp_path, self.path)
+        os.remove(self._partial_path)
+
+        if self.parquet_path:
+            self._write_parquet()
+        return self.path
+
+    def discard(self):
+        """Drop the rows written so far and leave any existing output untouched"""
+        self._partial.close()
+        os.remove(self._partial_path)
+
+    def _write_parquet(self):
+        # Length/weight columns are always cleaned to floats and Edible/Coerced to flags
+        fields = []
+        for col in self.columns:
+            if 'Length' in col or 'Weight' in col:
+                fields.append(pa.field(col, pa.float64()))
+            elif col in ('Edible', 'Coerced'):
+                fields.append(pa.field(col, pa.bool_()))
+            else:
+                fields.append(pa.field(col, pa.string()))
+        schema = pa.schema(fields)
+
+        tmp_path = f"{self.parquet_path}.tmp"
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for chunk in pd.read_csv(self.path, dtype=str, keep_default_na=False, chunksize=self.chunksize):
+                for field in fields:
+                    if field.type == pa.float64():
+                        chunk[field.name] = pd.to_numeric(chunk[field.name], errors='coerce')
+                    elif field.type == pa.bool_():
+                        chunk[field.name] = chunk[field.name].map({'True': True, 'False': False})
+                    else:
+                        chunk[field.name] = chunk[field.name].where(chunk[field.name] != '', None)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        os.replace(tmp_path, self.parquet_path)
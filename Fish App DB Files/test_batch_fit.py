@@ -0,0 +1,53 @@
+import numpy as np
+
+from batch_fit import fit_grouped_power_law
+
+
+def rounded_species(count=100, a=1.2e-5, b=3.0):
+    lengths = np.arange(15, 15 + count, dtype=float)
+    return lengths, np.round(a * lengths ** b, 1)
+
+
+def test_clean_rounded_data_has_no_outliers():
+    lengths, weights = rounded_species()
+    fits = fit_grouped_power_law(['species'] * len(lengths), lengths, weights, robust=True)
+    assert fits.loc['species', 'outliers'] == 0
+
+
+def test_mistyped_catch_is_flagged_and_barely_moves_b():
+    lengths, weights = rounded_species()
+    clean_b = fit_grouped_power_law(['species'] * len(lengths), lengths, weights, robust=True).loc['species', 'b']
+    weights[40] = 30.0
+    fits = fit_grouped_power_law(['species'] * len(lengths), lengths, weights, robust=True)
+    assert fits.loc['species', 'outliers'] == 1
+    assert abs(fits.loc['species', 'b'] - clean_b) < 0.01
+
+
+def test_robust_r_squared_is_unweighted_over_all_points():
+    lengths, weights = rounded_species()
+    weights[[20, 60]] = [30.0, 0.1]
+    keys = ['species'] * len(lengths)
+    least_squares = fit_grouped_power_law(keys, lengths, weights).loc['species']
+    robust = fit_grouped_power_law(keys, lengths, weights, robust=True).loc['species']
+
+    keep = weights > 0
+    x = np.log(lengths[keep])
+    y = np.log(weights[keep])
+    residuals = y - np.log(robust['a']) - robust['b'] * x
+    expected = 1 - np.sum(residuals ** 2) / np.sum((y - y.mean()) ** 2)
+    assert np.isclose(robust['r_squared'], expected)
+    # No line explains the logs better than least squares, so outliers cannot inflate R^2
+    assert robust['r_squared'] <= least_squares['r_squared']
+
+
+def test_rounding_step_is_inferred_per_species():
+    lengths, weights = rounded_species()
+    alone = fit_grouped_power_law(['coarse'] * len(lengths), lengths, weights, robust=True).loc['coarse']
+
+    fine_lengths, fine_weights = rounded_species(a=1.5e-5, b=2.9)
+    fine_weights = np.round(fine_weights * (1 + 0.01 * np.sin(fine_lengths)), 3)
+    keys = ['coarse'] * len(lengths) + ['fine'] * len(fine_lengths)
+    batched = fit_grouped_power_law(keys, np.r_[lengths, fine_lengths], np.r_[weights, fine_weights],
+                                    robust=True).loc['coarse']
+    assert batched['outliers'] == alone['outliers'] == 0
+    assert np.isclose(batched['b'], alone['b'])
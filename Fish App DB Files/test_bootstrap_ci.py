@@ -0,0 +1,43 @@
+import numpy as np
+
+from batch_fit import fit_grouped_power_law
+from bootstrap_ci import bootstrap_intervals
+
+
+def species_with_outlier(count=25, seed=5):
+    rng = np.random.default_rng(seed)
+    lengths = np.linspace(20, 80, count)
+    weights = np.round(1e-5 * lengths ** 3.0 * rng.lognormal(0, 0.05, count), 2)
+    # The largest fish logged at a fifth of its weight drags the least-squares slope down
+    weights[-1] /= 5
+    return ['species'] * count, lengths, weights
+
+
+def test_robust_interval_brackets_robust_b():
+    keys, lengths, weights = species_with_outlier()
+    least_squares_b = fit_grouped_power_law(keys, lengths, weights).loc['species', 'b']
+    robust_b = fit_grouped_power_law(keys, lengths, weights, robust=True).loc['species', 'b']
+    interval = bootstrap_intervals(keys, lengths, weights, resamples=500, robust=True, workers=1).loc['species']
+
+    assert interval['b_low'] < robust_b < interval['b_high']
+    # The least-squares estimate is a different estimator and falls outside the robust interval
+    assert not interval['b_low'] < least_squares_b < interval['b_high']
+
+
+def test_least_squares_interval_brackets_least_squares_b():
+    keys, lengths, weights = species_with_outlier()
+    b = fit_grouped_power_law(keys, lengths, weights).loc['species', 'b']
+    interval = bootstrap_intervals(keys, lengths, weights, resamples=500, workers=1).loc['species']
+    assert interval['b_low'] < b < interval['b_high']
+
+
+def test_robust_interval_does_not_depend_on_other_species():
+    keys, lengths, weights = species_with_outlier()
+    weights = np.round(weights, 1)
+    alone = bootstrap_intervals(keys, lengths, weights, resamples=200, robust=True, workers=1).loc['species']
+
+    fine_weights = np.round(1.3e-5 * lengths ** 2.9 * (1 + 0.01 * np.sin(lengths)), 3)
+    batched = bootstrap_intervals(keys + ['fine'] * len(lengths), np.r_[lengths, lengths],
+                                  np.r_[weights, fine_weights], resamples=200, robust=True,
+                                  workers=1).loc['species']
+    assert np.allclose(batched[['b_low', 'b_high']], alone[['b_low', 'b_high']])
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from content_hash import SpeciesHashRegistry, species_table_hash
+
+
+def species_table(**overrides):
+    table = {'Measure_Type': ['Fork length'] * 3, 'Length (cm)': [20.0, 30.0, 40.0],
+             'Weight (kg)': [0.1, 0.4, 0.9], 'Species': ['Elf'] * 3, 'Edible': [True] * 3}
+    table.update(overrides)
+    return pd.DataFrame(table)
+
+
+def test_name_and_edible_changes_change_the_hash():
+    table_hash = species_table_hash(species_table())
+    assert species_table_hash(species_table()) == table_hash
+    assert species_table_hash(species_table(Species=['Shad'] * 3)) != table_hash
+    assert species_table_hash(species_table(Edible=[False] * 3)) != table_hash
+
+
+def test_registry_is_only_written_on_save(tmp_path):
+    path = str(tmp_path / 'species_hashes.json')
+    registry = SpeciesHashRegistry(path)
+    table_hash = species_table_hash(species_table())
+    registry.update({'id': '1', 'name': 'Elf'}, table_hash, None)
+    # Until save, a rerun after a failed export still sees the species as changed
+    assert not SpeciesHashRegistry(path).is_unchanged('1', table_hash)
+
+    registry.save()
+    reloaded = SpeciesHashRegistry(path)
+    assert reloaded.is_unchanged('1', table_hash, 'Elf')
+    assert not reloaded.is_unchanged('1', table_hash, 'Shad')
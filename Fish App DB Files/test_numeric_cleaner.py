@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from improved_scraper import FishSpeciesScraper
+from numeric_cleaner import extract_numeric
+
+
+def test_decimal_comma_and_thousands_separator():
+    cleaned = extract_numeric(pd.Series(['12,5', '12,50 kg', '1,234 g', '1,234.5']), 'kg')
+    assert np.allclose(cleaned['value'], [12.5, 12.5, 1.234, 1234.5])
+    assert cleaned['coerced'].tolist() == [True, True, True, False]
+
+
+def test_unit_of_the_other_dimension_is_rejected():
+    cleaned = extract_numeric(pd.Series(['12.5 cm', '2 kg', '300 g']), 'kg')
+    assert np.isnan(cleaned['value'].iloc[0])
+    assert np.allclose(cleaned['value'].iloc[1:], [2.0, 0.3])
+    assert cleaned['coerced'].tolist() == [True, False, True]
+
+
+def test_coerced_rows_are_kept_in_the_species_table():
+    scraper = FishSpeciesScraper.__new__(FishSpeciesScraper)
+    df = scraper._build_length_weight_dataframe(
+        {'id': '1', 'edible': True}, 'Elf', ['Measure Type', 'Length (cm)', 'Weight (kg)'],
+        [['Fork length', '20', '0.1'], ['Fork length', '30 cm', '<0,4'], ['Fork length', '40', '0.9']])
+    assert df['Coerced'].tolist() == [False, True, False]
+    assert df['Weight (kg)'].tolist() == [0.1, 0.4, 0.9]
@@ -0,0 +1,46 @@
+import os
+
+from page_archive import PageArchive
+
+SPECIES = [
+    {'id': str(i), 'name': f"Species {i}", 'edible': True, 'url': f"https://example.com/{i}"}
+    for i in range(5)
+]
+
+
+def archive_run(path, pages):
+    archive = PageArchive(path)
+    for species in SPECIES:
+        archive.append(species, pages[species['id']])
+    return archive
+
+
+def test_identical_runs_do_not_grow_archive(tmp_path):
+    path = str(tmp_path / 'pages.warc.gz')
+    pages = {species['id']: f"<table><tr><td>{species['name']}</td></tr></table>" * 50 for species in SPECIES}
+
+    archive_run(path, pages)
+    size = os.path.getsize(path)
+    index_size = os.path.getsize(f"{path}.idx")
+    archive = archive_run(path, pages)
+
+    assert os.path.getsize(path) == size
+    assert os.path.getsize(f"{path}.idx") == index_size
+    assert archive.read('3')[1] == pages['3']
+
+
+def test_changed_page_is_appended_and_compacted(tmp_path):
+    path = str(tmp_path / 'pages.warc.gz')
+    pages = {species['id']: f"<p>{species['name']}</p>" for species in SPECIES}
+    archive_run(path, pages)
+    size = os.path.getsize(path)
+
+    archive = PageArchive(path)
+    assert archive.append(SPECIES[1], "<p>updated</p>")
+    assert os.path.getsize(path) > size
+
+    assert archive.compact() > 0
+    reopened = PageArchive(path)
+    assert len(reopened) == len(SPECIES)
+    assert reopened.read('1')[1] == "<p>updated</p>"
+    assert reopened.read('4')[1] == pages['4']
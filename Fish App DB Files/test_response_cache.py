@@ -0,0 +1,58 @@
+import os
+
+from response_cache import ResponseCache
+
+URL = "https://example.com/species/1"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', etag=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.headers = {'ETag': etag} if etag else {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def get(self, url, headers=None, **kwargs):
+        return self.responses.pop(0)
+
+
+def test_revalidated_page_is_served_from_disk(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.get(FakeSession(FakeResponse(200, 'v1', '"1"')), URL) == 'v1'
+    assert cache.get(FakeSession(FakeResponse(304)), URL) == 'v1'
+    assert cache.stats['hits'] == 1
+
+
+def test_crash_before_metadata_keeps_old_validator_with_old_body(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path))
+    cache.get(FakeSession(FakeResponse(200, 'v1', '"1"')), URL)
+
+    # Simulate a crash after the new body is written but before its metadata is published
+    original_replace = os.replace
+
+    def crash_on_metadata(src, dst):
+        if dst.endswith('.json'):
+            raise KeyboardInterrupt
+        original_replace(src, dst)
+
+    monkeypatch.setattr(os, 'replace', crash_on_metadata)
+    try:
+        cache.get(FakeSession(FakeResponse(200, 'v2', '"2"')), URL)
+    except KeyboardInterrupt:
+        pass
+    monkeypatch.undo()
+
+    # The old ETag still revalidates against the old body, not the new one
+    assert cache.get(FakeSession(FakeResponse(304)), URL) == 'v1'
+    cache.get(FakeSession(FakeResponse(200, 'v2', '"2"')), URL)
+    assert cache.get(FakeSession(FakeResponse(304)), URL) == 'v2'
+    # The replaced body is removed once nothing refers to it
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.html')]) == 1
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from scrape_journal import ScrapeJournal
+
+
+def species(i):
+    return {'id': str(i), 'name': f"Species {i}", 'edible': True}
+
+
+def table():
+    return pd.DataFrame({'Length (cm)': [20.0, 30.0], 'Weight (kg)': [0.1, 0.4]})
+
+
+def test_resume_after_torn_line_keeps_new_entries(tmp_path):
+    path = str(tmp_path / 'scrape_journal.jsonl')
+    journal = ScrapeJournal(path)
+    journal.record(species(1), table(), None)
+    journal.record(species(2), table(), None)
+    # A crash mid-append leaves the last entry without its newline
+    with open(path, 'r+') as f:
+        content = f.read()
+        f.seek(0)
+        f.truncate()
+        f.write(content[:-20])
+
+    resumed = ScrapeJournal(path)
+    resumed.record(species(3), table(), None)
+
+    entries = resumed.load()
+    assert sorted(entries) == ['1', '3']
+    assert ScrapeJournal.entry_to_dataframe(entries['3']).equals(table())
+
+
+def test_intact_journal_is_left_alone(tmp_path):
+    path = str(tmp_path / 'scrape_journal.jsonl')
+    ScrapeJournal(path).record(species(1), table(), None)
+    with open(path) as f:
+        content = f.read()
+    ScrapeJournal(path)
+    with open(path) as f:
+        assert f.read() == content
@@ -0,0 +1,56 @@
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from improved_scraper import FishSpeciesScraper
+from lxml_extractor import extract_length_weight_rows_lxml, layout_fingerprint
+from strategy_cache import LayoutStrategyCache
+
+SPECIES = {'id': '1', 'name': "Species 1", 'edible': True, 'url': "https://example.com/1"}
+ROWS = ''.join(f"<tr><td>{length}</td><td>{length * 0.01:.2f}</td></tr>" for length in range(20, 40))
+PLAIN_PAGE = f"<table><tr><td>Length (cm)</td><td>Weight (kg)</td></tr>{ROWS}</table>"
+# A page-wide wrapper table with more rows than the nested data table
+NAVIGATION = "<tr><td>Menu</td></tr>" * 50
+WRAPPED_PAGE = f"<table>{NAVIGATION}<tr><td>{PLAIN_PAGE}</td></tr></table>"
+UNDERLINED_PAGE = (f"<p>SPECIES: Elf</p><table><tr><td><u>Length</u> (cm)</td><td><b>Weight</b> kg</td></tr>"
+                   f"{ROWS}</table><table><tr><td>Footer</td></tr></table>")
+
+
+def scraper():
+    return FishSpeciesScraper(cache_dir=None, archive_path=None, hash_registry_path=None)
+
+
+def test_wrapped_layout_falls_back_to_header_table():
+    df = scraper().parse_length_weight_html(SPECIES, WRAPPED_PAGE)
+    assert df is not None and len(df) == 20
+
+
+def test_known_layout_tries_its_winning_strategy_first():
+    fish_scraper = scraper()
+    for _ in range(3):
+        fish_scraper.parse_length_weight_html(SPECIES, WRAPPED_PAGE)
+    fish_scraper.parse_length_weight_html(SPECIES, PLAIN_PAGE)
+
+    rates = fish_scraper.strategy_cache.hit_rates()
+    assert rates['layouts'] == 2
+    assert rates['fingerprint_hits'] == 2
+    # The largest table only failed on the wrapped layout's first page
+    assert rates['strategies']['largest_table'] == {'attempts': 2, 'wins': 1, 'hit_rate': 0.5}
+    assert rates['strategies']['header_table']['wins'] == 3
+
+
+def test_parse_metrics_record_the_winning_strategy():
+    fish_scraper = scraper()
+    fish_scraper.parse_length_weight_html(SPECIES, WRAPPED_PAGE)
+    fish_scraper.parse_length_weight_html(SPECIES, PLAIN_PAGE)
+    assert fish_scraper.metrics.summary()['strategies'] == {'header_table': 1, 'largest_table': 1}
+
+
+def test_lxml_extractor_matches_beautifulsoup_strategies():
+    fish_scraper = scraper()
+    lxml_cache = LayoutStrategyCache(fish_scraper.strategy_cache.strategy_names)
+    for page in (PLAIN_PAGE, WRAPPED_PAGE, WRAPPED_PAGE, UNDERLINED_PAGE, "<table><tr><td>-</td></tr></table>"):
+        assert LayoutStrategyCache.fingerprint(BeautifulSoup(page, 'html.parser').find_all('table')) == \
+            layout_fingerprint(etree.fromstring(page, etree.HTMLParser()).xpath('//table'))
+        assert extract_length_weight_rows_lxml(page, "Species 1", lxml_cache) == \
+            fish_scraper._extract_length_weight_rows(page, "Species 1")
+    assert lxml_cache.hit_rates() == fish_scraper.strategy_cache.hit_rates()
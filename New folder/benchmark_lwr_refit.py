@@ -0,0 +1,81 @@
+import argparse
+import time
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+from self_improving_algorithm import calculate_lwr_parameters, power_law
+
+# The fit as it was: fixed starting guess, finite-difference derivatives
+LEGACY_P0 = [0.01, 3.0]
+BOUNDS = ([0., 2.5], [np.inf, 3.5])
+
+
+def legacy_fit(lengths, weights):
+    params, _, infodict, _, _ = curve_fit(power_law, lengths, weights, p0=LEGACY_P0, bounds=BOUNDS,
+                                          full_output=True)
+    return params, infodict["nfev"]
+
+
+def simulate_catches(catches, rng):
+    """Lengths and weights of one species' catches, noisy around W = a * L^b"""
+    a = rng.uniform(5e-6, 2e-5)
+    b = rng.uniform(2.9, 3.2)
+    lengths = rng.uniform(20, 120, catches)
+    weights = a * lengths ** b * rng.lognormal(0, 0.08, catches)
+    return lengths, weights
+
+
+def refit_after_each_catch(lengths, weights, first_fit):
+    """Refit after every catch with each strategy; returns per-strategy (seconds, evaluations) lists and max a/b drift"""
+    results = {'legacy': ([], []), 'cold': ([], []), 'warm': ([], [])}
+    previous = None
+    max_difference = 0.0
+    for count in range(first_fit, len(lengths) + 1):
+        x, y = lengths[:count], weights[:count]
+
+        start_time = time.perf_counter()
+        legacy_params, legacy_nfev = legacy_fit(x, y)
+        results['legacy'][0].append(time.perf_counter() - start_time)
+        results['legacy'][1].append(legacy_nfev)
+
+        for strategy, initial_params in (('cold', None), ('warm', previous)):
+            fit_info = {}
+            start_time = time.perf_counter()
+            a, b, _, _ = calculate_lwr_parameters(x, y, initial_params=initial_params, fit_info=fit_info)
+            results[strategy][0].append(time.perf_counter() - start_time)
+            results[strategy][1].append(fit_info.get("nfev", 0))
+        previous = (a, b)
+        max_difference = max(max_difference, abs(a / legacy_params[0] - 1), abs(b / legacy_params[1] - 1))
+    return results, max_difference
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LWR refits after each new catch")
+    parser.add_argument('--species', type=int, default=5)
+    parser.add_argument('--catches', type=int, default=200, help="catches per species")
+    parser.add_argument('--first-fit', type=int, default=5, help="catches before the first fit")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    totals = {'legacy': ([], []), 'cold': ([], []), 'warm': ([], [])}
+    max_difference = 0.0
+    for _ in range(args.species):
+        lengths, weights = simulate_catches(args.catches, rng)
+        results, difference = refit_after_each_catch(lengths, weights, args.first_fit)
+        max_difference = max(max_difference, difference)
+        for strategy, (seconds, evaluations) in results.items():
+            totals[strategy][0].extend(seconds)
+            totals[strategy][1].extend(evaluations)
+
+    labels = {
+        'legacy': "Fixed p0, numeric Jacobian",
+        'cold': "Log-log start, analytic Jacobian",
+        'warm': "Warm start, analytic Jacobian"
+    }
+    refits = len(totals['legacy'][0])
+    print(f"{refits} refits ({args.species} species, one refit per catch)")
+    print(f"{'strategy':<34} {'evals/refit':>11} {'ms/refit':>9}")
+    for strategy, (seconds, evaluations) in totals.items():
+        print(f"{labels[strategy]:<34} {np.mean(evaluations):>11.1f} {np.mean(seconds) * 1000:>9.2f}")
+    print(f"Max relative difference in a or b from the fixed-p0 fit: {max_difference:.1e}")
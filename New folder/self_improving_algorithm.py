@@ -1,34 +1,108 @@
-
-import pandas as pd
 import numpy as np
 from scipy.optimize import curve_fit
 import json
+import math
 import os
 
 def power_law(x, a, b):
     return a * (x ** b)
 
-def calculate_lwr_parameters(lengths, weights):
+def power_law_jacobian(x, a, b):
+    # Closed-form derivatives of a * x^b with respect to a and b
+    x_b = x ** b
+    return np.column_stack([x_b, a * x_b * np.log(x)])
+
+def log_power_law(x, a, b):
+    return np.log(a) + b * np.log(x)
+
+def log_power_law_jacobian(x, a, b):
+    return np.column_stack([np.full(len(x), 1.0 / a), np.log(x)])
+
+def log_log_initial_guess(lengths, weights, b_bounds=(2.5, 3.5)):
+    # Straight-line fit of ln(W) on ln(L); usually lands next to the least-squares optimum
+    log_lengths = np.log(lengths)
+    log_weights = np.log(weights)
+    if np.ptp(log_lengths) > 0:
+        b = np.polyfit(log_lengths, log_weights, 1)[0]
+    else:
+        b = 3.0
+    b = min(max(b, b_bounds[0]), b_bounds[1])
+    a = np.exp(np.mean(log_weights - b * log_lengths))
+    return [a, b]
+
+def weight_resolution(weights, max_decimals=6):
+    # Step the weights were rounded to (e.g. 0.1 kg): the fewest decimals that represent them all
+    for decimals in range(max_decimals + 1):
+        scaled = np.asarray(weights, dtype=float) * 10 ** decimals
+        if np.allclose(scaled, np.round(scaled), rtol=0, atol=1e-6):
+            return 10.0 ** -decimals
+    return 0.0
+
+def point_huber_loss(thresholds):
+    # Huber loss with its own threshold per residual, in the (rho, rho', rho'') form least_squares
+    # expects for z = residual^2 (f_scale stays 1)
+    thresholds = np.asarray(thresholds, dtype=float) ** 2
+
+    def loss(z):
+        rho = np.empty((3, len(z)))
+        inlier = z <= thresholds
+        root = np.sqrt(np.where(inlier, thresholds, z))
+        rho[0] = np.where(inlier, z, 2 * np.sqrt(thresholds) * root - thresholds)
+        rho[1] = np.where(inlier, 1.0, np.sqrt(thresholds) / root)
+        rho[2] = np.where(inlier, 0.0, -0.5 * np.sqrt(thresholds) / root ** 3)
+        return rho
+    return loss
+
+def calculate_lwr_parameters(lengths, weights, initial_params=None, fit_info=None, robust=False):
     try:
-        lengths = np.array(lengths)
-        weights = np.array(weights)
+        lengths = np.array(lengths, dtype=float)
+        weights = np.array(weights, dtype=float)
 
-        positive_lengths = lengths[lengths > 0]
-        positive_weights = weights[weights > 0]
+        positive = (lengths > 0) & (weights > 0)
+        positive_lengths = lengths[positive]
+        positive_weights = weights[positive]
 
-        if len(positive_lengths) < 2 or len(positive_weights) < 2:
+        if len(positive_lengths) < 2:
             return None, None, None, "Not enough data points to calculate parameters."
 
-        # Initial guess for a and b
-        # A common range for 'b' is 2.5 to 3.5, and 'a' is usually small
-        p0 = [0.01, 3.0]
-
         # Bounds for parameters to ensure realistic values
         # a > 0, b typically between 2.5 and 3.5 for fish
         bounds = ([0., 2.5], [np.inf, 3.5])
 
-        params, covariance = curve_fit(power_law, positive_lengths, positive_weights, p0=p0, bounds=bounds)
+        # Warm start from the species' previous a and b when given (a refit after one more
+        # catch barely moves them), otherwise start from the log-log line
+        if initial_params is not None and initial_params[0] is not None and initial_params[0] > 0:
+            p0 = [initial_params[0], min(max(initial_params[1], bounds[0][1]), bounds[1][1])]
+        else:
+            p0 = log_log_initial_guess(positive_lengths, positive_weights)
+
+        if robust:
+            # Fit in log space with a Huber loss scaled to the residuals' MAD, so a mistyped
+            # catch (30 kg for a 30 cm fish) is down-weighted instead of dragging the curve.
+            # Rounded weights are only known to within their rounding step, so no point's scale
+            # drops below that step's log-space error, as in batch_fit's robust mode
+            log_weights = np.log(positive_weights)
+            residuals = log_weights - log_power_law(positive_lengths, *p0)
+            scale = max(1.4826 * np.median(np.abs(residuals - np.median(residuals))), 0.01)
+            rounding = np.log1p(weight_resolution(positive_weights) / 2 / positive_weights)
+            point_scale = np.maximum(scale, rounding)
+            params, covariance, infodict, _, _ = curve_fit(
+                log_power_law, positive_lengths, log_weights, p0=p0, bounds=bounds,
+                jac=log_power_law_jacobian, loss=point_huber_loss(point_scale), full_output=True
+            )
+        else:
+            params, covariance, infodict, _, _ = curve_fit(
+                power_law, positive_lengths, positive_weights, p0=p0, bounds=bounds,
+                jac=power_law_jacobian, full_output=True
+            )
         a, b = params
+        if fit_info is not None:
+            fit_info["nfev"] = infodict["nfev"]
+
+        if robust and fit_info is not None:
+            # R^2 below still scores every point, so it stays comparable with least-squares fits
+            outliers = np.abs(log_weights - log_power_law(positive_lengths, a, b)) > 3 * point_scale
+            fit_info["outliers"] = int(np.sum(outliers))
 
         y_predicted = power_law(positive_lengths, a, b)
         ss_total = np.sum((positive_weights - np.mean(positive_weights)) ** 2)
@@ -41,8 +115,118 @@ def calculate_lwr_parameters(lengths, weights):
     except Exception as e:
         return None, None, None, f"An error occurred: {e}"
 
-def update_species_algorithm(species_name, new_length, new_weight, algorithms_file, data_points_file):
-    # Load existing algorithms
+# Running log-space sums per species: with x = ln(L) and y = ln(W), W = a * L^b is the
+# least-squares line y = ln(a) + b * x, which depends on the data only through these sums
+def empty_log_sums():
+    return {"n": 0, "sum_x": 0.0, "sum_y": 0.0, "sum_xx": 0.0, "sum_xy": 0.0, "sum_yy": 0.0}
+
+def add_to_log_sums(log_sums, length, weight):
+    # Non-positive values have no logarithm; they are stored but not fitted
+    if length <= 0 or weight <= 0:
+        return False
+    x = math.log(length)
+    y = math.log(weight)
+    log_sums["n"] += 1
+    log_sums["sum_x"] += x
+    log_sums["sum_y"] += y
+    log_sums["sum_xx"] += x * x
+    log_sums["sum_xy"] += x * y
+    log_sums["sum_yy"] += y * y
+    return True
+
+def log_sums_from_points(lengths, weights):
+    log_sums = empty_log_sums()
+    for length, weight in zip(lengths, weights):
+        add_to_log_sums(log_sums, length, weight)
+    return log_sums
+
+def centred_log_sums(log_sums):
+    n = log_sums["n"]
+    sxx = log_sums["sum_xx"] - log_sums["sum_x"] ** 2 / n
+    sxy = log_sums["sum_xy"] - log_sums["sum_x"] * log_sums["sum_y"] / n
+    syy = log_sums["sum_yy"] - log_sums["sum_y"] ** 2 / n
+    return sxx, sxy, syy
+
+def parameters_from_log_sums(log_sums, b_bounds=(2.5, 3.5)):
+    # Constant-time fit from the sums; b is kept within the same realistic bounds as the curve fit
+    n = log_sums["n"]
+    if n < 2:
+        return None, None, None, "Not enough data points to calculate parameters."
+
+    sxx, sxy, syy = centred_log_sums(log_sums)
+    if sxx <= 1e-12 * max(log_sums["sum_xx"], 1.0):
+        return None, None, None, "All data points have the same length. Try providing more diverse data points."
+
+    b = min(max(sxy / sxx, b_bounds[0]), b_bounds[1])
+    # Best intercept for that slope, so a stays consistent when b is clamped
+    log_a = (log_sums["sum_y"] - b * log_sums["sum_x"]) / n
+    ss_residual = max(syy - 2 * b * sxy + b * b * sxx, 0.0)
+    r_squared = 1 - (ss_residual / syy) if syy > 0 else 0
+
+    return math.exp(log_a), b, r_squared, "Success"
+
+def is_outlier(log_sums, length, weight, outlier_sigmas=4.0, min_points=5, min_spread=0.05):
+    # Constant-time screen of a new catch against the species' current fit: reject it when its
+    # log residual exceeds outlier_sigmas residual standard deviations (at least min_spread)
+    n = log_sums["n"]
+    if n < min_points or length <= 0 or weight <= 0:
+        return False
+    a, b, _, _ = parameters_from_log_sums(log_sums)
+    if a is None:
+        return False
+    sxx, sxy, syy = centred_log_sums(log_sums)
+    residual_sd = math.sqrt(max(syy - 2 * b * sxy + b * b * sxx, 0.0) / (n - 2))
+    residual = math.log(weight) - math.log(a) - b * math.log(length)
+    return abs(residual) > outlier_sigmas * max(residual_sd, min_spread)
+
+def load_data_points(data_points_file, include_outliers=False):
+    # Data points are appended one JSON object per line; older files hold a single JSON object
+    all_data_points = {}
+    if not os.path.exists(data_points_file):
+        return all_data_points
+    with open(data_points_file, 'r') as f:
+        content = f.read()
+    try:
+        legacy = json.loads(content) if content.strip() else {}
+        if isinstance(legacy, dict) and "species" not in legacy:
+            return legacy
+    except json.JSONDecodeError:
+        pass
+    for line in content.splitlines():
+        try:
+            point = json.loads(line)
+        except json.JSONDecodeError:
+            continue # Skip a line cut short by an interrupted write
+        if point.get("outlier") and not include_outliers:
+            continue
+        species_data_points = all_data_points.setdefault(point["species"], {"lengths": [], "weights": []})
+        species_data_points["lengths"].append(point["length"])
+        species_data_points["weights"].append(point["weight"])
+    return all_data_points
+
+def append_data_point(data_points_file, species_name, length, weight, outlier=False):
+    # Rewrite a legacy single-object file as lines once, then every point is a constant-time append
+    if os.path.exists(data_points_file):
+        with open(data_points_file, 'r') as f:
+            first_line = f.readline()
+        try:
+            is_legacy = "species" not in json.loads(first_line)
+        except json.JSONDecodeError:
+            is_legacy = bool(first_line.strip())
+        if is_legacy:
+            all_data_points = load_data_points(data_points_file)
+            with open(data_points_file, 'w') as f:
+                for name, points in all_data_points.items():
+                    for old_length, old_weight in zip(points["lengths"], points["weights"]):
+                        f.write(json.dumps({"species": name, "length": old_length, "weight": old_weight}) + "\n")
+    point = {"species": species_name, "length": length, "weight": weight}
+    if outlier:
+        # Kept for review, but left out of every fit
+        point["outlier"] = True
+    with open(data_points_file, 'a') as f:
+        f.write(json.dumps(point) + "\n")
+
+def load_algorithms(algorithms_file):
     algorithms = {}
     if os.path.exists(algorithms_file):
         with open(algorithms_file, 'r') as f:
@@ -50,55 +234,234 @@ def update_species_algorithm(species_name, new_length, new_weight, algorithms_fi
                 algorithms = json.load(f)
             except json.JSONDecodeError:
                 algorithms = {} # Handle empty or invalid JSON
+    return algorithms
 
-    # Load existing data points for the species
-    all_data_points = {}
-    if os.path.exists(data_points_file):
-        with open(data_points_file, 'r') as f:
-            try:
-                all_data_points = json.load(f)
-            except json.JSONDecodeError:
-                all_data_points = {} # Handle empty or invalid JSON
+def store_algorithm(algorithms, species_name, log_sums, data_points_count, algorithms_file):
+    a, b, r_squared, status_message = parameters_from_log_sums(log_sums)
+    if a is not None and b is not None:
+        entry = dict(algorithms.get(species_name, {}))
+        entry.pop("fit_method", None) # Back to the log-space line after a nonlinear refit
+        algorithms[species_name] = {
+            **entry,
+            "a": a,
+            "b": b,
+            "r_squared": r_squared,
+            "data_points_count": data_points_count,
+            "log_sums": log_sums
+        }
+        # Save updated algorithms
+        with open(algorithms_file, 'w') as f:
+            json.dump(algorithms, f, indent=4)
+    return a, b, r_squared, status_message
+
+def refit_species_algorithm(species_name, algorithms_file, data_points_file, nonlinear=False):
+    # Full refit: rebuild the running sums from every stored point, e.g. as a consistency check.
+    # nonlinear=True instead fits a and b to the weights themselves with curve_fit, warm-started
+    # from the stored formula; the next incremental update goes back to the log-space line
+    algorithms = load_algorithms(algorithms_file)
+    species_data_points = load_data_points(data_points_file).get(species_name, {"lengths": [], "weights": []})
+    log_sums = log_sums_from_points(species_data_points["lengths"], species_data_points["weights"])
+    data_points_count = len(species_data_points["lengths"])
+    if not nonlinear:
+        return store_algorithm(algorithms, species_name, log_sums, data_points_count, algorithms_file)
 
-    species_data_points = all_data_points.get(species_name, {"lengths": [], "weights": []})
+    entry = algorithms.get(species_name, {})
+    initial_params = (entry["a"], entry["b"]) if entry.get("a") else None
+    a, b, r_squared, status_message = calculate_lwr_parameters(
+        species_data_points["lengths"], species_data_points["weights"], initial_params=initial_params
+    )
+    if a is not None and b is not None:
+        a, b, r_squared = float(a), float(b), float(r_squared)
+        algorithms[species_name] = {
+            **entry,
+            "a": a,
+            "b": b,
+            "r_squared": r_squared,
+            "data_points_count": data_points_count,
+            "log_sums": log_sums,
+            "fit_method": "nonlinear"
+        }
+        with open(algorithms_file, 'w') as f:
+            json.dump(algorithms, f, indent=4)
+    return a, b, r_squared, status_message
 
-    # Add new data point
-    species_data_points["lengths"].append(new_length)
-    species_data_points["weights"].append(new_weight)
+def update_species_algorithm(species_name, new_length, new_weight, algorithms_file, data_points_file,
+                             consistency_check_every=1000, reject_outliers=False, outlier_sigmas=4.0):
+    # Every point is appended to data_points_file, which grows without bound: the periodic
+    # consistency check and refit_species_algorithm rebuild the fit from it. Species logged
+    # too often to keep their history should use update_species_algorithm_rls instead.
+    # Load existing algorithms; each one carries the running sums it was fitted from
+    algorithms = load_algorithms(algorithms_file)
+    entry = algorithms.get(species_name, {})
 
-    # Save updated data points immediately
-    all_data_points[species_name] = species_data_points
-    with open(data_points_file, 'w') as f:
-        json.dump(all_data_points, f, indent=4)
+    if reject_outliers and "log_sums" in entry and is_outlier(entry["log_sums"], new_length, new_weight, outlier_sigmas):
+        append_data_point(data_points_file, species_name, new_length, new_weight, outlier=True)
+        return {"status": "outlier", "message": f"{new_weight} kg at {new_length} cm is far from the current formula for {species_name}; it was stored but not used.", "data_points_count": entry.get("data_points_count", 0)}
+
+    # Save the new data point immediately
+    append_data_point(data_points_file, species_name, new_length, new_weight)
+    data_points_count = entry.get("data_points_count", 0) + 1
+
+    if "log_sums" in entry and data_points_count % consistency_check_every != 0:
+        log_sums = dict(entry["log_sums"])
+        add_to_log_sums(log_sums, new_length, new_weight)
+    else:
+        # No sums stored yet, or a periodic check is due: rebuild them from the stored points
+        species_data_points = load_data_points(data_points_file).get(species_name, {"lengths": [], "weights": []})
+        data_points_count = len(species_data_points["lengths"])
+        log_sums = log_sums_from_points(species_data_points["lengths"], species_data_points["weights"])
 
     # Only calculate algorithm parameters if enough data points exist
-    if len(species_data_points["lengths"]) >= 2:
-        a, b, r_squared, status_message = calculate_lwr_parameters(
-            species_data_points["lengths"],
-            species_data_points["weights"]
-        )
-
-        if a is not None and b is not None:
-            algorithms[species_name] = {
-                "a": a,
-                "b": b,
-                "r_squared": r_squared,
-                "data_points_count": len(species_data_points["lengths"])
-            }
-            # Save updated algorithms
-            with open(algorithms_file, 'w') as f:
-                json.dump(algorithms, f, indent=4)
-
-            return {"status": "success", "a": a, "b": b, "r_squared": r_squared, "data_points_count": len(species_data_points["lengths"]), "message": status_message}
-        else:
-            return {"status": "failed", "message": status_message}
+    if data_points_count < 2:
+        return {"status": "pending", "message": "Not enough data points to calculate parameters yet. Need at least 2.", "data_points_count": data_points_count}
+
+    a, b, r_squared, status_message = store_algorithm(algorithms, species_name, log_sums, data_points_count, algorithms_file)
+    if a is not None and b is not None:
+        return {"status": "success", "a": a, "b": b, "r_squared": r_squared, "data_points_count": data_points_count, "message": status_message}
     else:
-        return {"status": "pending", "message": "Not enough data points to calculate parameters yet. Need at least 2.", "data_points_count": len(species_data_points["lengths"])}
+        return {"status": "failed", "message": status_message}
+
+# Recursive least squares on the same log-log line, for species logged too often to keep their
+# history: the state is theta = [ln(a), b], its 2x2 covariance P and a few exponentially
+# weighted moments for R^2. A forgetting factor below 1 discounts older catches, so the fit
+# follows seasonal or population drift with an effective memory of about 1 / (1 - factor) catches
+def empty_rls_state(forgetting_factor=0.999, initial_covariance=1e3, initial_params=None):
+    a, b = initial_params if initial_params is not None else (0.01, 3.0)
+    return {
+        "theta": [math.log(a), b],
+        "P": [[initial_covariance, 0.0], [0.0, initial_covariance]],
+        "forgetting_factor": forgetting_factor,
+        "initial_covariance": initial_covariance,
+        "n": 0,
+        "weight": 0.0,
+        "mean_x": 0.0,
+        "mean_y": 0.0,
+        "ss_y": 0.0,
+        "ss_residual": 0.0
+    }
+
+def rls_state_from_log_sums(log_sums, forgetting_factor=0.999, initial_covariance=1e3):
+    # The RLS state that reproduces the batch fit of the sums exactly: P = (X^T X)^-1
+    n = log_sums["n"]
+    sxx, sxy, syy = centred_log_sums(log_sums) if n else (0.0, 0.0, 0.0)
+    if n < 2 or sxx <= 1e-12 * max(log_sums["sum_xx"], 1.0):
+        return None
+    b = sxy / sxx
+    mean_x = log_sums["sum_x"] / n
+    mean_y = log_sums["sum_y"] / n
+    state = empty_rls_state(forgetting_factor, initial_covariance)
+    state.update({
+        "theta": [mean_y - b * mean_x, b],
+        "P": [[log_sums["sum_xx"] / (n * sxx), -mean_x / sxx], [-mean_x / sxx, 1.0 / sxx]],
+        "n": n,
+        "weight": float(n),
+        "mean_x": mean_x,
+        "mean_y": mean_y,
+        "ss_y": syy,
+        "ss_residual": max(syy - b * sxy, 0.0)
+    })
+    return state
+
+def add_to_rls_state(state, length, weight):
+    # O(1) update with x = [1, ln(L)], y = ln(W); non-positive values are not fitted
+    if length <= 0 or weight <= 0:
+        return False
+    x = math.log(length)
+    y = math.log(weight)
+    factor = state["forgetting_factor"]
+    (p00, p01), (p10, p11) = state["P"]
+    theta0, theta1 = state["theta"]
+
+    # Gain k = P x / (factor + x^T P x)
+    px0 = p00 + p01 * x
+    px1 = p10 + p11 * x
+    denominator = factor + px0 + x * px1
+    k0 = px0 / denominator
+    k1 = px1 / denominator
+    error = y - theta0 - theta1 * x
+    theta0 += k0 * error
+    theta1 += k1 * error
+
+    # P = (P - k x^T P) / factor; stop discounting once P reaches its starting size, so long
+    # runs of same-length catches cannot blow it up ("covariance wind-up")
+    p00, p01, p11 = p00 - k0 * px0, p01 - k0 * px1, p11 - k1 * px1
+    if p00 + p11 < 2 * state["initial_covariance"]:
+        p00, p01, p11 = p00 / factor, p01 / factor, p11 / factor
+    state["theta"] = [theta0, theta1]
+    state["P"] = [[p00, p01], [p01, p11]]
+
+    # Exponentially weighted mean of x and spread of y for R^2, and the matching residuals
+    state["n"] += 1
+    state["weight"] = factor * state["weight"] + 1.0
+    state["mean_x"] += (x - state["mean_x"]) / state["weight"]
+    delta = y - state["mean_y"]
+    state["mean_y"] += delta / state["weight"]
+    state["ss_y"] = factor * state["ss_y"] + delta * (y - state["mean_y"])
+    state["ss_residual"] = factor * state["ss_residual"] + (y - theta0 - theta1 * x) ** 2
+    return True
+
+def parameters_from_rls_state(state, b_bounds=(2.5, 3.5)):
+    if state["n"] < 2:
+        return None, None, None, "Not enough data points to calculate parameters."
+    log_a, b = state["theta"]
+    clamped_b = min(max(b, b_bounds[0]), b_bounds[1])
+    # Pivot a clamped line about the weighted mean length so it still passes through the data
+    log_a += (b - clamped_b) * state["mean_x"]
+    r_squared = 1 - (state["ss_residual"] / state["ss_y"]) if state["ss_y"] > 0 else 0
+    return math.exp(log_a), clamped_b, max(r_squared, 0.0), "Success"
+
+def update_species_algorithm_rls(species_name, new_length, new_weight, algorithms_file, data_points_file=None,
+                                 forgetting_factor=None, reject_outliers=False, outlier_sigmas=4.0):
+    # Like update_species_algorithm, but only the constant-size RLS state is persisted. Passing
+    # data_points_file opts in to an audit log of raw points; nothing here reads it back, and it
+    # grows by one line per catch. forgetting_factor overrides the species' stored factor; a
+    # species without RLS state yet starts with 0.999 unless one is given
+    algorithms = load_algorithms(algorithms_file)
+    entry = algorithms.get(species_name, {})
+
+    if "rls" in entry:
+        state = dict(entry["rls"])
+        if forgetting_factor is not None:
+            state["forgetting_factor"] = forgetting_factor
+    else:
+        if forgetting_factor is None:
+            forgetting_factor = 0.999
+        # Carry over an existing running-sum fit, or start from the stored formula if any
+        state = rls_state_from_log_sums(entry["log_sums"], forgetting_factor) if "log_sums" in entry else None
+        if state is None:
+            initial_params = (entry["a"], entry["b"]) if entry.get("a") else None
+            state = empty_rls_state(forgetting_factor, initial_params=initial_params)
+
+    if reject_outliers and state["n"] >= 5 and new_length > 0 and new_weight > 0:
+        residual_sd = math.sqrt(state["ss_residual"] / max(state["weight"] - 2, 1.0))
+        residual = math.log(new_weight) - state["theta"][0] - state["theta"][1] * math.log(new_length)
+        if abs(residual) > outlier_sigmas * max(residual_sd, 0.05):
+            if data_points_file:
+                append_data_point(data_points_file, species_name, new_length, new_weight, outlier=True)
+            return {"status": "outlier", "message": f"{new_weight} kg at {new_length} cm is far from the current formula for {species_name}; it was not used.", "data_points_count": state["n"]}
+
+    if data_points_file:
+        append_data_point(data_points_file, species_name, new_length, new_weight)
+    add_to_rls_state(state, new_length, new_weight)
+
+    a, b, r_squared, status_message = parameters_from_rls_state(state)
+    entry = {**entry, "data_points_count": state["n"], "rls": state}
+    entry.pop("log_sums", None) # Superseded by the RLS state
+    entry.pop("fit_method", None)
+    if a is not None:
+        entry.update({"a": a, "b": b, "r_squared": r_squared})
+    algorithms[species_name] = entry
+    with open(algorithms_file, 'w') as f:
+        json.dump(algorithms, f, indent=4)
+
+    if a is None:
+        return {"status": "pending", "message": status_message, "data_points_count": state["n"]}
+    return {"status": "success", "a": a, "b": b, "r_squared": r_squared, "data_points_count": state["n"], "message": status_message}
 
 # Example Usage (for testing/demonstration)
 if __name__ == "__main__":
     algorithms_output_file = "self_improving_algorithms.json"
-    data_points_output_file = "self_improving_data_points.json"
+    data_points_output_file = "self_improving_data_points.jsonl"
 
     # Clean up previous test files if they exist
     if os.path.exists(algorithms_output_file):
@@ -144,10 +507,19 @@ if __name__ == "__main__":
     else:
         print("Algorithms file does not exist.")
 
+    print("\n--- Full refit of NewSpeciesA from its stored data points ---")
+    print(refit_species_algorithm("NewSpeciesA", algorithms_output_file, data_points_output_file))
+
+    print("\n--- Nonlinear refit of NewSpeciesA, warm-started from the stored formula ---")
+    print(refit_species_algorithm("NewSpeciesA", algorithms_output_file, data_points_output_file, nonlinear=True))
+
+    print("\n--- Tracking NewSpeciesA with RLS from here on (no further raw points stored) ---")
+    for length, weight in [(35, 0.75), (45, 1.35), (55, 2.3)]:
+        print(update_species_algorithm_rls("NewSpeciesA", length, weight, algorithms_output_file, forgetting_factor=0.99))
+
     print("\n--- Final data points file content ---")
     if os.path.exists(data_points_output_file):
-        with open(data_points_output_file, 'r') as f:
-            print(json.dumps(json.load(f), indent=4))
+        print(json.dumps(load_data_points(data_points_output_file), indent=4))
     else:
         print("Data points file does not exist.")
 